@@ -1,10 +1,18 @@
 from typing import Any, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.security import decode_token
-from app.db.session import get_db
-from app.models.user import User, UserRole
+from app.db.session import (
+    get_async_db,
+    get_db,
+    get_read_db,
+    get_read_sessionmaker,
+    get_sessionmaker,
+)
+from app.models.user import UserRole
+from app.services.auth_service import Principal, get_principal, get_principal_async
 from jose import JWTError
 from jose.exceptions import ExpiredSignatureError
 
@@ -24,14 +32,7 @@ def _as_int_id(value: object) -> Optional[int]:
     return None
 
 
-def optional_current_user(
-    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer_optional),
-    db: Session = Depends(get_db),
-) -> Optional[User]:
-    """
-    Devuelve el User si viene 'Authorization: Bearer <token>' válido.
-    Si no hay header o el token es inválido, devuelve None (no rompe).
-    """
+def _optional_user_id(creds: Optional[HTTPAuthorizationCredentials]) -> Optional[int]:
     if not creds:
         return None
 
@@ -41,17 +42,10 @@ def optional_current_user(
     except JWTError:
         return None
 
-    user_id = _as_int_id(payload.get("sub"))
-    if user_id is None:
-        return None
+    return _as_int_id(payload.get("sub"))
 
-    return db.get(User, user_id)
 
-
-def get_current_user(
-    creds: HTTPAuthorizationCredentials = Depends(bearer_required),
-    db: Session = Depends(get_db),
-) -> User:
+def _required_user_id(creds: HTTPAuthorizationCredentials) -> int:
     token = creds.credentials
     try:
         payload: dict[str, Any] = decode_token(token)
@@ -77,8 +71,10 @@ def get_current_user(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Token 'sub' inválido"
         )
+    return user_id
 
-    user = db.get(User, user_id)
+
+def _active_or_401(user: Optional[Principal]) -> Principal:
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario no válido"
@@ -86,26 +82,93 @@ def get_current_user(
     return user
 
 
-def require_role(*roles: UserRole | str):
+def optional_current_user(
+    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer_optional),
+    db: Session = Depends(get_db),
+) -> Optional[Principal]:
     """
-    Uso:
-      dependencies=[Depends(require_role(UserRole.admin))]
-      dependencies=[Depends(require_role(UserRole.admin, UserRole.agency))]
+    Devuelve el Principal si viene 'Authorization: Bearer <token>' válido.
+    Si no hay header o el token es inválido, devuelve None (no rompe).
+    """
+    user_id = _optional_user_id(creds)
+    if user_id is None:
+        return None
+
+    return get_principal(db, user_id)
+
+
+def get_current_user(
+    creds: HTTPAuthorizationCredentials = Depends(bearer_required),
+    db: Session = Depends(get_db),
+) -> Principal:
     """
+    Usuario autenticado desde el JWT + cache de principals: en un hit no hay
+    ninguna consulta a la base.
+    """
+    user_id = _required_user_id(creds)
+    return _active_or_401(get_principal(db, user_id))
+
+
+# Variantes para endpoints async (AsyncSession): mismas reglas, sin pasar
+# por el threadpool.
+async def optional_current_user_async(
+    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer_optional),
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[Principal]:
+    user_id = _optional_user_id(creds)
+    if user_id is None:
+        return None
+
+    return await get_principal_async(db, user_id)
+
+
+async def get_current_user_async(
+    creds: HTTPAuthorizationCredentials = Depends(bearer_required),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    user_id = _required_user_id(creds)
+    return _active_or_401(await get_principal_async(db, user_id))
+
+
+def _allowed_roles(roles: tuple[UserRole | str, ...]) -> set[str]:
     allowed: set[str] = set()
     for r in roles:
         if isinstance(r, UserRole):
             allowed.add(r.value)
         else:
             allowed.add(str(r))
+    return allowed
 
-    def _dep(user: User = Depends(get_current_user)) -> None:
-        current = user.role.value if isinstance(user.role, UserRole) else str(user.role)
-        if current not in allowed:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions",
-            )
+
+def _check_role(user: Principal, allowed: set[str]) -> None:
+    current = user.role.value if isinstance(user.role, UserRole) else str(user.role)
+    if current not in allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions",
+        )
+
+
+def require_role(*roles: UserRole | str):
+    """
+    Uso:
+      dependencies=[Depends(require_role(UserRole.admin))]
+      dependencies=[Depends(require_role(UserRole.admin, UserRole.agency))]
+    """
+    allowed = _allowed_roles(roles)
+
+    def _dep(user: Principal = Depends(get_current_user)) -> None:
+        _check_role(user, allowed)
         # no retornamos nada; si pasa, está autorizado
 
     return _dep
+
+
+def require_role_async(*roles: UserRole | str):
+    """Como require_role, para endpoints async (get_current_user_async)."""
+    allowed = _allowed_roles(roles)
+
+    async def _dep(user: Principal = Depends(get_current_user_async)) -> None:
+        _check_role(user, allowed)
+
+    return _dep
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, require_role
+from app.core.responses import FastJSONResponse
 from app.models.user import UserRole
 from app.models.purchase import PurchaseStatus
 from app.schemas.admin_purchases import PaginatedAdminPurchasesOut
@@ -16,6 +17,7 @@ router = APIRouter()
 @router.get(
     "",
     response_model=PaginatedAdminPurchasesOut,
+    response_class=FastJSONResponse,
     dependencies=[Depends(require_role(UserRole.admin))],
 )
 def list_all_purchases(
@@ -45,12 +47,14 @@ def list_all_purchases(
     if date_to:
         dt_to = datetime.combine(date_to, datetime.max.time())
 
-    return admin_purchases_service.list_purchases_for_admin(
-        db=db,
-        page=page,
-        page_size=page_size,
-        q=q,
-        status=status,
-        date_from=dt_from,
-        date_to=dt_to,
+    return FastJSONResponse(
+        admin_purchases_service.list_purchases_for_admin(
+            db=db,
+            page=page,
+            page_size=page_size,
+            q=q,
+            status=status,
+            date_from=dt_from,
+            date_to=dt_to,
+        )
     )
@@ -2,11 +2,18 @@ from datetime import date
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.api.deps import get_db, get_current_user, require_role
-from app.models.user import User, UserRole
+from app.api.deps import (
+    Principal,
+    get_current_user,
+    get_read_db,
+    get_read_sessionmaker,
+    require_role,
+)
+from app.models.user import UserRole
 from app.schemas.reports import (
+    AdminDashboardOut,
     TopAgencyOut,
     TopBuyerOut,
     TopFavoriteCarOut,
@@ -36,8 +43,8 @@ def get_top_sold_cars(
         le=50,
         description="Cantidad máxima de autos a devolver (Top N)",
     ),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     # El require_role ya valida que sea admin, pero dejamos esto por claridad si querés
     if current_user.role != UserRole.admin:
@@ -60,8 +67,8 @@ def get_top_sold_cars(
     dependencies=[Depends(require_role(UserRole.admin))],
 )
 def get_top_buyers_report(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     date_from: Optional[str] = Query(
         None, description="Fecha desde (YYYY-MM-DD) sobre Purchase.created_at"
     ),
@@ -92,8 +99,8 @@ def get_top_buyers_report(
     dependencies=[Depends(require_role(UserRole.admin))],
 )
 def get_top_favorites_report(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     date_from: Optional[str] = Query(
         None, description="Fecha desde (YYYY-MM-DD) sobre Favorite.created_at"
     ),
@@ -123,8 +130,8 @@ def get_top_favorites_report(
     dependencies=[Depends(require_role(UserRole.admin))],
 )
 def get_top_agencies_report(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     date_from: Optional[str] = Query(None, description="Fecha desde (YYYY-MM-DD)"),
     date_to: Optional[str] = Query(None, description="Fecha hasta (YYYY-MM-DD)"),
     limit: int = Query(5, ge=1, le=100, description="Cantidad máxima de filas"),
@@ -138,3 +145,25 @@ def get_top_agencies_report(
         date_to=dt_to,
         limit=limit,
     )
+
+
+@router.get(
+    "/dashboard",
+    response_model=AdminDashboardOut,
+    dependencies=[Depends(require_role(UserRole.admin))],
+)
+def get_admin_dashboard(
+    session_factory: sessionmaker = Depends(get_read_sessionmaker),
+    date_from: Optional[date] = Query(None, description="Fecha desde (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Fecha hasta (YYYY-MM-DD)"),
+    limit: int = Query(5, ge=1, le=50, description="Top N de cada reporte"),
+):
+    """
+    Los cuatro reportes de admin en una sola llamada (consultas en paralelo).
+    """
+    return reports_service.get_admin_dashboard(
+        session_factory=session_factory,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+    )
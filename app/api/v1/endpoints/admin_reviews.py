@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, require_role
+from app.core.responses import FastJSONResponse
 from app.models.user import UserRole
 from app.schemas.admin_reviews import PaginatedAdminReviewsOut
 from app.services import admin_reviews as admin_reviews_service
@@ -16,6 +17,7 @@ router = APIRouter()
 @router.get(
     "",
     response_model=PaginatedAdminReviewsOut,
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(require_role(UserRole.admin))],
 )
@@ -33,13 +35,15 @@ def list_admin_reviews(
     db: Session = Depends(get_db),
 ):
 
-    return admin_reviews_service.list_reviews(
-        db=db,
-        page=page,
-        page_size=page_size,
-        q=q,
-        min_rating=min_rating,
-        max_rating=max_rating,
-        date_from=date_from,
-        date_to=date_to,
+    return FastJSONResponse(
+        admin_reviews_service.list_reviews(
+            db=db,
+            page=page,
+            page_size=page_size,
+            q=q,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            date_from=date_from,
+            date_to=date_to,
+        )
     )
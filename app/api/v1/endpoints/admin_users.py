@@ -2,6 +2,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, get_current_user, require_role
+from app.core.responses import FastJSONResponse
 from app.models.user import User, UserRole
 from app.schemas.user import PaginatedUsersOut
 from app.services import admin_users as admin_users_service
@@ -12,6 +13,7 @@ router = APIRouter()
 @router.get(
     "",
     response_model=PaginatedUsersOut,
+    response_class=FastJSONResponse,
     dependencies=[Depends(require_role(UserRole.admin))],
 )
 def list_registered_users(
@@ -25,10 +27,12 @@ def list_registered_users(
     Lista usuarios registrados (solo admin),
     con paginado y filtros básicos.
     """
-    return admin_users_service.list_users(
-        db=db,
-        page=page,
-        page_size=page_size,
-        q=q,
-        role=role,
+    return FastJSONResponse(
+        admin_users_service.list_users(
+            db=db,
+            page=page,
+            page_size=page_size,
+            q=q,
+            role=role,
+        )
     )
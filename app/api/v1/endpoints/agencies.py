@@ -1,14 +1,22 @@
 from datetime import date
-from typing import Literal, Optional
+from typing import Literal, Optional, Union
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.api.deps import get_current_user
-from app.api.deps import require_role
-from app.core.security import hash_password
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from app.api.deps import get_current_user, Principal
+from app.api.deps import get_read_sessionmaker, require_role
+from app.core.config import settings
+from app.core.responses import ExportFormat, FastJSONResponse, stream_export
+from app.core.security import hash_password_async
 from app.db.session import get_db
 from app.models.user import User, UserRole, AgencyUser
 from app.models.agency import Agency
-from app.schemas.purchase import AgencyCustomerOut, AgencySaleOut
+from app.schemas.purchase import (
+    AgencyCustomerOut,
+    AgencySaleOut,
+    CursorAgencyCustomersOut,
+    CursorAgencySalesOut,
+)
 from app.schemas.user import CreateAgencyUser, UserOut
 from app.schemas.listing import ListingOut, PaginatedListingsOut
 from app.services import listings as listings_service
@@ -30,7 +38,16 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(require_role(UserRole.admin))],
 )
-def create_agency_user(payload: CreateAgencyUser, db: Session = Depends(get_db)):
+async def create_agency_user(payload: CreateAgencyUser, db: Session = Depends(get_db)):
+    # bcrypt primero, en su pool (ver app/api/v1/endpoints/auth.py); la
+    # parte de base va al threadpool
+    password_hash = await hash_password_async(payload.password)
+    return await run_in_threadpool(_create_agency_user, db, payload, password_hash)
+
+
+def _create_agency_user(
+    db: Session, payload: CreateAgencyUser, password_hash: str
+) -> User:
     if db.query(User).filter(User.email == payload.email).first():
         raise HTTPException(status_code=400, detail="Email ya registrado")
 
@@ -42,7 +59,7 @@ def create_agency_user(payload: CreateAgencyUser, db: Session = Depends(get_db))
 
     user = AgencyUser(
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
         role=UserRole.agency,
         agency_id=agency.id,
     )
@@ -55,6 +72,7 @@ def create_agency_user(payload: CreateAgencyUser, db: Session = Depends(get_db))
 @router.get(
     "/my-listings",
     response_model=PaginatedListingsOut,
+    response_class=FastJSONResponse,
     dependencies=[Depends(require_role(UserRole.agency))],
 )
 def my_listings(
@@ -67,7 +85,7 @@ def my_listings(
     max_price: Optional[float] = Query(None),
     sort: Optional[Literal["price_asc", "price_desc", "newest"]] = "newest",
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Devuelve los listings de la agencia logueada, paginados.
@@ -80,17 +98,19 @@ def my_listings(
             detail="El usuario de agencia no tiene una agencia asociada",
         )
 
-    return listings_service.list_my_agency_listings(
-        db=db,
-        agency_id=agency_id,
-        page=page,
-        page_size=page_size,
-        brand=brand,
-        model=model,
-        is_active=is_active,
-        min_price=min_price,
-        max_price=max_price,
-        sort=sort,
+    return FastJSONResponse(
+        listings_service.list_my_agency_listings(
+            db=db,
+            agency_id=agency_id,
+            page=page,
+            page_size=page_size,
+            brand=brand,
+            model=model,
+            is_active=is_active,
+            min_price=min_price,
+            max_price=max_price,
+            sort=sort,
+        )
     )
 
 
@@ -102,7 +122,7 @@ def my_listings(
 def get_my_listing(
     listing_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return listings_service.get_listing_owned_by_agency(
         db, listing_id, current_user.agency_id
@@ -111,20 +131,31 @@ def get_my_listing(
 
 @router.get(
     "/my-sales",
-    response_model=list[AgencySaleOut],
+    response_model=Union[list[AgencySaleOut], CursorAgencySalesOut],
+    response_class=FastJSONResponse,
     dependencies=[Depends(require_role(UserRole.agency))],
 )
 def my_sales(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     brand: Optional[str] = Query(None),
     model: Optional[str] = Query(None),
     customer: Optional[str] = Query(None, description="Nombre o email del cliente"),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor de la página anterior"
+    ),
+    page_size: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.HISTORY_MAX_PAGE_SIZE,
+        description="Con cursor o page_size devuelve {items, next_cursor}",
+    ),
 ):
     """
     Devuelve las ventas de la agencia logueada, con filtros opcionales.
+    Con cursor o page_size, de a una página: {items, next_cursor}.
     """
     if current_user.agency_id is None:
         raise HTTPException(
@@ -132,31 +163,55 @@ def my_sales(
             detail="El usuario de agencia no tiene una agencia asociada",
         )
 
-    return purchases_service.list_sales_for_agency(
-        db=db,
-        agency_id=current_user.agency_id,
+    filters = dict(
         brand=brand,
         model=model,
         customer=customer,
         date_from=date_from,
         date_to=date_to,
     )
+    if cursor is None and page_size is None:
+        return FastJSONResponse(
+            purchases_service.list_sales_for_agency(
+                db=db, agency_id=current_user.agency_id, **filters
+            )
+        )
+    return FastJSONResponse(
+        purchases_service.page_sales_for_agency(
+            db,
+            current_user.agency_id,
+            cursor=cursor,
+            page_size=page_size or settings.HISTORY_PAGE_SIZE,
+            **filters,
+        )
+    )
 
 
 @router.get(
     "/my-customers",
-    response_model=list[AgencyCustomerOut],
+    response_model=Union[list[AgencyCustomerOut], CursorAgencyCustomersOut],
+    response_class=FastJSONResponse,
     dependencies=[Depends(require_role(UserRole.agency))],
 )
 def my_customers(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     q: Optional[str] = Query(None, description="Nombre o email del cliente"),
     min_purchases: Optional[int] = Query(None, ge=1),
     min_spent: Optional[float] = Query(None, ge=0.0),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor de la página anterior"
+    ),
+    page_size: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.HISTORY_MAX_PAGE_SIZE,
+        description="Con cursor o page_size devuelve {items, next_cursor}",
+    ),
 ):
     """
-    Devuelve el resumen de clientes con filtros opcionales.
+    Devuelve el resumen de clientes con filtros opcionales. Con cursor o
+    page_size, de a una página: {items, next_cursor}.
     """
     if current_user.agency_id is None:
         raise HTTPException(
@@ -164,13 +219,93 @@ def my_customers(
             detail="El usuario de agencia no tiene una agencia asociada",
         )
 
-    return purchases_service.list_customers_for_agency(
-        db=db,
-        agency_id=current_user.agency_id,
+    filters = dict(q=q, min_purchases=min_purchases, min_spent=min_spent)
+    if cursor is None and page_size is None:
+        return FastJSONResponse(
+            purchases_service.list_customers_for_agency(
+                db=db, agency_id=current_user.agency_id, **filters
+            )
+        )
+    return FastJSONResponse(
+        purchases_service.page_customers_for_agency(
+            db,
+            current_user.agency_id,
+            cursor=cursor,
+            page_size=page_size or settings.HISTORY_PAGE_SIZE,
+            **filters,
+        )
+    )
+
+
+def _require_agency_id(user: Principal) -> int:
+    if user.agency_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El usuario de agencia no tiene una agencia asociada",
+        )
+    return user.agency_id
+
+
+def _stream_rows(session_factory: sessionmaker, iter_rows, **params):
+    # la sesión vive lo que dura el stream (no lo que dura el endpoint)
+    with session_factory() as db:
+        yield from iter_rows(db, **params)
+
+
+@router.get(
+    "/my-sales/export",
+    dependencies=[Depends(require_role(UserRole.agency))],
+)
+def export_my_sales(
+    format: ExportFormat = Query("csv", description="csv o ndjson"),
+    session_factory: sessionmaker = Depends(get_read_sessionmaker),
+    current_user: Principal = Depends(get_current_user),
+    brand: Optional[str] = Query(None),
+    model: Optional[str] = Query(None),
+    customer: Optional[str] = Query(None, description="Nombre o email del cliente"),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+):
+    """
+    Descarga todas las ventas de la agencia (mismos filtros que /my-sales)
+    como CSV o NDJSON, en streaming: memoria constante sin importar el
+    tamaño del historial.
+    """
+    rows = _stream_rows(
+        session_factory,
+        purchases_service.iter_sales_for_agency,
+        agency_id=_require_agency_id(current_user),
+        brand=brand,
+        model=model,
+        customer=customer,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    return stream_export(rows, AgencySaleOut, format, "ventas")
+
+
+@router.get(
+    "/my-customers/export",
+    dependencies=[Depends(require_role(UserRole.agency))],
+)
+def export_my_customers(
+    format: ExportFormat = Query("csv", description="csv o ndjson"),
+    session_factory: sessionmaker = Depends(get_read_sessionmaker),
+    current_user: Principal = Depends(get_current_user),
+    q: Optional[str] = Query(None, description="Nombre o email del cliente"),
+    min_purchases: Optional[int] = Query(None, ge=1),
+    min_spent: Optional[float] = Query(None, ge=0.0),
+):
+    """Como /my-customers, descargado como CSV o NDJSON en streaming."""
+    rows = _stream_rows(
+        session_factory,
+        purchases_service.iter_customers_for_agency,
+        agency_id=_require_agency_id(current_user),
         q=q,
         min_purchases=min_purchases,
         min_spent=min_spent,
     )
+    return stream_export(rows, AgencyCustomerOut, format, "clientes")
 
 
 @router.get(
@@ -185,7 +320,7 @@ def my_inventory(
     model: Optional[str] = Query(None),
     is_used: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.agency_id is None:
         raise HTTPException(
@@ -232,7 +367,7 @@ def my_inventory(
 def create_inventory(
     payload: InventoryItemCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.agency_id is None:
         raise HTTPException(
@@ -268,7 +403,7 @@ def update_inventory(
     inventory_id: int,
     payload: InventoryItemUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.agency_id is None:
         raise HTTPException(
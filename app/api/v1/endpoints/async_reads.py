@@ -0,0 +1,172 @@
+"""
+Versiones async de los GET más calientes, sobre AsyncSession.
+
+Se montan delante de las rutas sync (mismo path) sólo con
+ASYNC_READS_ENABLED=1; ver app/api/v1/router.py. Con eso el browse y el
+detalle no dependen del threadpool de Starlette (40 hilos) sino del pool de
+conexiones del engine async.
+"""
+
+from typing import List, Literal, Optional, Union
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import (
+    Principal,
+    get_current_user_async,
+    optional_current_user_async,
+    require_role_async,
+)
+from app.core.config import settings
+from app.core.http_cache import http_cache, not_modified
+from app.core.responses import FastJSONResponse
+from app.db.query_stats import query_budget
+from app.db.session import get_async_db
+from app.models.user import UserRole
+from app.schemas.favorite import CursorFavoritesOut, FavoriteWithListingOut
+from app.schemas.listing import CursorListingsOut, ListingOut
+from app.schemas.review import ReviewOut
+from app.services import favorites as favorites_service
+from app.services import listings as listings_service
+from app.services import reviews as reviews_service
+
+router = APIRouter()
+
+
+@router.get(
+    "/listings",
+    response_model=Union[list[ListingOut], CursorListingsOut],
+    response_class=FastJSONResponse,
+    dependencies=[
+        Depends(query_budget(3)),
+        Depends(http_cache(max_age=settings.HTTP_CACHE_MAX_AGE_SECONDS)),
+    ],
+)
+async def list_listings_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    q: Optional[str] = Query(None, description="Búsqueda por marca o modelo"),
+    brand: Optional[str] = None,
+    model: Optional[str] = None,
+    agency_id: Optional[str] = Query(None),
+    min_price: Optional[str] = Query(None),
+    max_price: Optional[str] = Query(None),
+    sort: Optional[
+        Literal["price_asc", "price_desc", "newest", "relevance"]
+    ] = "newest",
+    page: int = 1,
+    page_size: int = 20,
+    pagination: Literal["offset", "cursor"] = Query(
+        "offset",
+        description="'cursor' devuelve {items, next_cursor} en lugar de una lista",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Token next_cursor de la página anterior (modo cursor)"
+    ),
+    current_user: Optional[Principal] = Depends(optional_current_user_async),
+):
+    result, etag = await listings_service.browse_listings_with_etag_async(
+        db,
+        viewer=current_user,
+        q=q,
+        brand=brand,
+        model=model,
+        agency_id=agency_id,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort,
+        page=page,
+        page_size=page_size,
+        pagination=pagination,
+        cursor=cursor,
+    )
+    return not_modified(request, etag) or FastJSONResponse(result)
+
+
+@router.get(
+    "/listings/{listing_id}",
+    response_model=ListingOut,
+    dependencies=[
+        Depends(require_role_async(UserRole.buyer)),
+        Depends(query_budget(2)),
+        Depends(http_cache()),
+    ],
+)
+async def get_listing_async(
+    listing_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    return await listings_service.get_listing_for_buyer_async(
+        db=db,
+        buyer=current_user,
+        listing_id=listing_id,
+    )
+
+
+@router.get(
+    "/favorites/my",
+    response_model=Union[List[FavoriteWithListingOut], CursorFavoritesOut],
+    response_class=FastJSONResponse,
+    dependencies=[
+        Depends(require_role_async(UserRole.buyer)),
+        Depends(query_budget(2)),
+        Depends(http_cache()),
+    ],
+)
+async def list_my_favorites_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
+    brand: Optional[str] = Query(None),
+    model: Optional[str] = Query(None),
+    agency_id: Optional[int] = Query(None, ge=1),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor de la página anterior"
+    ),
+    page_size: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.HISTORY_MAX_PAGE_SIZE,
+        description="Con cursor o page_size devuelve {items, next_cursor}",
+    ),
+):
+    filters = dict(
+        brand=brand,
+        model=model,
+        agency_id=agency_id,
+        min_price=min_price,
+        max_price=max_price,
+    )
+    if cursor is None and page_size is None:
+        return FastJSONResponse(
+            await favorites_service.list_favorites_for_buyer_async(
+                db, current_user, **filters
+            )
+        )
+    return FastJSONResponse(
+        await favorites_service.page_favorites_for_buyer_async(
+            db,
+            current_user,
+            cursor=cursor,
+            page_size=page_size or settings.HISTORY_PAGE_SIZE,
+            **filters,
+        )
+    )
+
+
+@router.get(
+    "/reviews/by-listing/{listing_id}",
+    response_model=list[ReviewOut],
+    dependencies=[
+        Depends(query_budget(2)),
+        Depends(http_cache(max_age=settings.HTTP_CACHE_MAX_AGE_SECONDS)),
+    ],
+)
+async def list_reviews_by_listing_async(
+    listing_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await reviews_service.list_reviews_for_listing_id_async(db, listing_id)
@@ -1,34 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.db.session import get_db
 from app.models.user import User, UserRole, Customer
 from app.schemas.user import RegisterBuyer, LoginInput, TokenOut, UserOut
-from app.core.security import hash_password, verify_password, create_access_token
-from app.api.deps import get_current_user
-from app.services.auth_service import authenticate
+from app.core.security import hash_password_async, create_access_token
+from app.api.deps import get_current_user, Principal
+from app.services.auth_service import authenticate_async
 
 router = APIRouter()
 
 
+def _email_taken(db: Session, email: str) -> bool:
+    return db.query(User).filter(User.email == email).first() is not None
+
+
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+# register/login son async: bcrypt corre en su propio pool (await) y el
+# acceso a la base va al threadpool, así una ráfaga de logins no acapara
+# los hilos que usan el resto de los endpoints.
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def register_buyer(payload: RegisterBuyer, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == payload.email).first():
+async def register_buyer(payload: RegisterBuyer, db: Session = Depends(get_db)):
+    if await run_in_threadpool(_email_taken, db, payload.email):
         raise HTTPException(status_code=400, detail="Email ya registrado")
     user = Customer(
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
         role=UserRole.buyer,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return await run_in_threadpool(_save_user, db, user)
 
 
 @router.post("/login", response_model=TokenOut)
-def login(payload: LoginInput, db: Session = Depends(get_db)):
-    user = authenticate(db, payload.email, payload.password)
+async def login(payload: LoginInput, db: Session = Depends(get_db)):
+    user = await authenticate_async(db, payload.email, payload.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -49,5 +61,6 @@ def login(payload: LoginInput, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserOut)
-def me(current: User = Depends(get_current_user)):
-    return current
+def me(current: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
+    # el principal cacheado no trae email: acá sí se lee el User
+    return db.get(User, current.id)
@@ -4,8 +4,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user, require_role
-from app.models.user import UserRole, User
+from app.api.deps import get_db, get_current_user, require_role, Principal
+from app.models.user import UserRole
 from app.models.car_model import CarModel
 from app.schemas.car_model import CarModelOut
 from app.services import car_models as car_models_service
@@ -22,7 +22,7 @@ router = APIRouter()
 def search_car_models(
     q: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Devuelve modelos de auto del catálogo global (tabla car_models),
@@ -1,15 +1,30 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from app.api.deps import get_db, require_role, get_current_user
-from app.models.user import User, UserRole
+from app.api.deps import (
+    Principal,
+    get_current_user,
+    get_db,
+    get_read_db,
+    require_role,
+)
+from app.core.config import settings
+from app.core.http_cache import http_cache
+from app.core.responses import FastJSONResponse
+from app.db.query_stats import query_budget
+from app.models.user import UserRole
 from app.models.favorite import Favorite
 from app.models.listing import Listing
-from app.schemas.favorite import FavoriteOut, FavoriteWithListingOut
+from app.schemas.favorite import (
+    CursorFavoritesOut,
+    FavoriteOut,
+    FavoriteWithListingOut,
+)
 from app.services.favorites import (
     list_favorites_for_buyer,
+    page_favorites_for_buyer,
     add_favorite as svc_add_favorite,
     remove_favorite as svc_remove_favorite,
 )
@@ -19,27 +34,52 @@ router = APIRouter()
 
 @router.get(
     "/my",
-    response_model=List[FavoriteWithListingOut],
-    dependencies=[Depends(require_role(UserRole.buyer))],
+    response_model=Union[List[FavoriteWithListingOut], CursorFavoritesOut],
+    response_class=FastJSONResponse,
+    dependencies=[
+        Depends(require_role(UserRole.buyer)),
+        Depends(query_budget(2)),
+        Depends(http_cache()),
+    ],
 )
 def list_my_favorites(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     brand: Optional[str] = Query(None),
     model: Optional[str] = Query(None),
     agency_id: Optional[int] = Query(None, ge=1),
     min_price: Optional[float] = Query(None, ge=0),
     max_price: Optional[float] = Query(None, ge=0),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor de la página anterior"
+    ),
+    page_size: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.HISTORY_MAX_PAGE_SIZE,
+        description="Con cursor o page_size devuelve {items, next_cursor}",
+    ),
 ):
-    return list_favorites_for_buyer(
-        db=db,
-        buyer=current_user,
+    filters = dict(
         brand=brand,
         model=model,
         agency_id=agency_id,
         min_price=min_price,
         max_price=max_price,
     )
+    if cursor is None and page_size is None:
+        return FastJSONResponse(
+            list_favorites_for_buyer(db=db, buyer=current_user, **filters)
+        )
+    return FastJSONResponse(
+        page_favorites_for_buyer(
+            db,
+            current_user,
+            cursor=cursor,
+            page_size=page_size or settings.HISTORY_PAGE_SIZE,
+            **filters,
+        )
+    )
 
 
 @router.post(
@@ -51,7 +91,7 @@ def list_my_favorites(
 def add_favorite(
     listing_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     listing = db.get(Listing, listing_id)
     if not listing:
@@ -68,7 +108,7 @@ def add_favorite(
 def remove_favorite(
     listing_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """
     Elimina un favorito del usuario logueado para el listing dado.
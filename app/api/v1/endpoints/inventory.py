@@ -2,9 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from app.api.deps import get_current_user, require_role
+from app.api.deps import get_current_user, require_role, Principal
 from app.db.session import get_db
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from app.schemas.car_model import CarModelOut, CarModelCreate
 from app.schemas.inventory import InventoryItemOut
 from app.services import inventory as inventory_service
@@ -30,7 +30,7 @@ def list_inventory(
     page: int = 1,
     page_size: int = 20,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.agency_id is None:
         raise HTTPException(
@@ -57,7 +57,7 @@ def list_inventory(
 def create_inventory_item(
     payload: InventoryItemCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.agency_id is None:
         raise HTTPException(
@@ -92,7 +92,7 @@ def create_inventory_item(
 def get_inventory_by_id(
     inventory_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.agency_id is None:
         raise HTTPException(
@@ -125,7 +125,7 @@ def update_inventory_item_endpoint(
     inventory_id: int,
     payload: InventoryItemUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.agency_id is None:
         raise HTTPException(
@@ -157,7 +157,7 @@ def update_inventory_item_endpoint(
 def delete_inventory_item_endpoint(
     inventory_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.agency_id is None:
         raise HTTPException(
@@ -1,21 +1,23 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 from typing import Optional, Literal, Union
 
-from app.api.deps import get_db, require_role
-from app.models.user import User, UserRole
+from app.api.deps import get_db, get_read_db, require_role
+from app.core.config import settings
+from app.core.http_cache import http_cache, not_modified
+from app.core.responses import FastJSONResponse
+from app.db.query_stats import query_budget
+from app.models.user import UserRole
 from app.models.listing import Listing
 from app.schemas.listing import (
+    CursorListingsOut,
     ListingCreate,
     ListingOut,
     ListingUpdate,
 )
-from app.api.deps import optional_current_user, get_current_user
-from app.models.favorite import Favorite
+from app.api.deps import optional_current_user, get_current_user, Principal
 from app.services import listings as listings_service
-from app.models.review import Review
 from app.services import inventory as inventory_service
 from app.utils.datetime import parse_expires_on
 
@@ -26,126 +28,54 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("", response_model=list[ListingOut])
+@router.get(
+    "",
+    response_model=Union[list[ListingOut], CursorListingsOut],
+    response_class=FastJSONResponse,
+    dependencies=[
+        Depends(query_budget(3)),
+        Depends(http_cache(max_age=settings.HTTP_CACHE_MAX_AGE_SECONDS)),
+    ],
+)
 def list_listings(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     q: Optional[str] = Query(None, description="Búsqueda por marca o modelo"),
     brand: Optional[str] = None,
     model: Optional[str] = None,
     agency_id: Optional[str] = Query(None),
     min_price: Optional[str] = Query(None),
     max_price: Optional[str] = Query(None),
-    sort: Optional[Literal["price_asc", "price_desc", "newest"]] = "newest",
+    sort: Optional[
+        Literal["price_asc", "price_desc", "newest", "relevance"]
+    ] = "newest",
     page: int = 1,
     page_size: int = 20,
-    current_user: Optional[User] = Depends(optional_current_user),
+    pagination: Literal["offset", "cursor"] = Query(
+        "offset",
+        description="'cursor' devuelve {items, next_cursor} en lugar de una lista",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Token next_cursor de la página anterior (modo cursor)"
+    ),
+    current_user: Optional[Principal] = Depends(optional_current_user),
 ):
-    query = db.query(Listing)
-
-    def to_int(v):
-        return None if v in (None, "", "null", "undefined") else int(v)
-
-    def to_float(v):
-        return None if v in (None, "", "null", "undefined") else float(v)
-
-    # Filtros
-    aid = to_int(agency_id)
-    if aid is not None:
-        query = query.filter(Listing.agency_id == aid)
-
-    mi = to_float(min_price)
-    if mi is not None:
-        query = query.filter(Listing.current_price_amount >= mi)
-
-    ma = to_float(max_price)
-    if ma is not None:
-        query = query.filter(Listing.current_price_amount <= ma)
-
-    if q:
-        like = f"%{q}%"
-        query = query.filter((Listing.brand.ilike(like)) | (Listing.model.ilike(like)))
-
-    if brand:
-        b = brand.strip()
-        if b:
-            like_b = f"%{b}%"
-            query = query.filter(Listing.brand.ilike(like_b))
-
-    if model:
-        m = model.strip()
-        if m:
-            like_m = f"%{m}%"
-            query = query.filter(Listing.model.ilike(like_m))
-
-    # Orden
-    if sort == "price_asc":
-        query = query.order_by(Listing.current_price_amount.asc())
-    elif sort == "price_desc":
-        query = query.order_by(Listing.current_price_amount.desc())
-    else:
-        query = query.order_by(Listing.id.desc())
-
-    # Paginación
-    page = max(page, 1)
-    offset = (page - 1) * page_size
-    items: list[Listing] = query.offset(offset).limit(page_size).all()
-
-    # Favoritos (si hay user buyer)
-    fav_ids: set[int] = set()
-    if current_user and current_user.role == UserRole.buyer and items:
-        ids = [it.id for it in items]
-        rows = (
-            db.query(Favorite.listing_id)
-            .filter(
-                Favorite.customer_id == current_user.id,
-                Favorite.listing_id.in_(ids),
-            )
-            .all()
-        )
-        fav_ids = {rid for (rid,) in rows}
-
-    # 👇 NUEVO: agregados de ratings por car_model
-    car_model_ids = {it.car_model_id for it in items if it.car_model_id is not None}
-
-    ratings_map: dict[int, tuple[float, int]] = {}
-    if car_model_ids:
-        agg_rows = (
-            db.query(
-                Review.car_model_id,
-                func.avg(Review.rating).label("avg_rating"),
-                func.count(Review.id).label("count_reviews"),
-            )
-            .filter(Review.car_model_id.in_(car_model_ids))
-            .group_by(Review.car_model_id)
-            .all()
-        )
-        ratings_map = {
-            cm_id: (float(avg_rating), int(count_reviews))
-            for (cm_id, avg_rating, count_reviews) in agg_rows
-        }
-
-    result: list[ListingOut] = []
-
-    for it in items:
-        base = ListingOut.model_validate(it, from_attributes=True)
-        is_favorite = it.id in fav_ids
-
-        avg_rating = None
-        reviews_count = 0
-        if it.car_model_id and it.car_model_id in ratings_map:
-            avg_rating, reviews_count = ratings_map[it.car_model_id]
-
-        result.append(
-            base.model_copy(
-                update={
-                    "is_favorite": is_favorite,
-                    "avg_rating": avg_rating,
-                    "reviews_count": reviews_count,
-                }
-            )
-        )
-
-    return result
+    result, etag = listings_service.browse_listings_with_etag(
+        db,
+        viewer=current_user,
+        q=q,
+        brand=brand,
+        model=model,
+        agency_id=agency_id,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort,
+        page=page,
+        page_size=page_size,
+        pagination=pagination,
+        cursor=cursor,
+    )
+    return not_modified(request, etag) or FastJSONResponse(result)
 
 
 @router.post(
@@ -157,7 +87,7 @@ def list_listings(
 def create_listing(
     payload: ListingCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     # Si el payload trae agency_id, validamos que coincida con la agencia del user
     if user.agency_id is None:
@@ -217,7 +147,7 @@ def update_listing(
     listing_id: int,
     payload: ListingUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     listing = db.get(Listing, listing_id)
     if not listing:
@@ -238,18 +168,22 @@ def update_listing(
 @router.get(
     "/{listing_id}",
     response_model=ListingOut,
-    dependencies=[Depends(require_role(UserRole.buyer))],
+    dependencies=[
+        Depends(require_role(UserRole.buyer)),
+        Depends(query_budget(2)),
+        Depends(http_cache()),
+    ],
 )
 def get_listing(
     listing_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Devuelve el detalle de una oferta para un comprador logueado,
     incluyendo si está marcada como favorita.
     """
-    logger.info(f"[endpoint] listing_id={listing_id}, current_user={current_user!r}")
+    logger.debug("[endpoint] listing_id=%s, user_id=%s", listing_id, current_user.id)
     return listings_service.get_listing_for_buyer(
         db=db,
         buyer=current_user,
@@ -264,7 +198,7 @@ def get_listing(
 def cancel_my_listing(
     listing_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     agency_id = current_user.agency_id
     if not agency_id:
@@ -283,7 +217,7 @@ def cancel_my_listing(
 def activate_my_listing(
     listing_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     agency_id = current_user.agency_id
     if not agency_id:
@@ -298,12 +232,12 @@ def activate_my_listing(
 @router.delete(
     "/{listing_id}",
     status_code=204,
-    dependencies=[Depends(require_role(UserRole.agency))],
+    dependencies=[Depends(require_role(UserRole.agency)), Depends(query_budget(8))],
 )
 def delete_my_listing(
     listing_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     agency_id = current_user.agency_id
     if not agency_id:
@@ -1,12 +1,18 @@
 # app/api/v1/endpoints/purchases.py
-from typing import Optional
-from fastapi import APIRouter, Depends, Query, status
+from typing import Optional, Union
+from fastapi import APIRouter, Depends, Header, Query, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user, require_role
+from app.api.deps import get_db, get_current_user, require_role, Principal
+from app.core.config import settings
 from app.models.purchase import PurchaseStatus
-from app.models.user import User, UserRole
-from app.schemas.purchase import PurchaseCreate, PurchaseOut
+from app.models.user import UserRole
+from app.schemas.purchase import (
+    CursorPurchasesOut,
+    PurchaseBatchCreate,
+    PurchaseCreate,
+    PurchaseOut,
+)
 from app.services import purchases as purchases_service
 
 router = APIRouter()
@@ -21,9 +27,37 @@ router = APIRouter()
 def create_purchase(
     payload: PurchaseCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Reintentos con la misma key devuelven la compra original",
+    ),
+):
+    return purchases_service.create_purchase_idempotent(
+        db=db,
+        buyer=current_user,
+        payload=payload,
+        idempotency_key=idempotency_key,
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=list[PurchaseOut],
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_role(UserRole.buyer))],
+)
+def create_purchases_batch(
+    payload: PurchaseBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return purchases_service.create_purchase_for_buyer(
+    """
+    Compra varias ofertas en una sola transacción (todo o nada).
+    """
+    return purchases_service.create_purchases_batch_for_buyer(
         db=db,
         buyer=current_user,
         payload=payload,
@@ -32,12 +66,12 @@ def create_purchase(
 
 @router.get(
     "/my",
-    response_model=list[PurchaseOut],
+    response_model=Union[list[PurchaseOut], CursorPurchasesOut],
     dependencies=[Depends(require_role(UserRole.buyer))],
 )
 def list_my_purchases(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     # 🔹 Filtros opcionales
     status: Optional[PurchaseStatus] = Query(
         None,
@@ -68,14 +102,22 @@ def list_my_purchases(
         ge=0,
         description="Precio unitario máximo",
     ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor de la página anterior"
+    ),
+    page_size: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.HISTORY_MAX_PAGE_SIZE,
+        description="Con cursor o page_size devuelve {items, next_cursor}",
+    ),
 ):
     """
     Devuelve las compras del buyer logueado (activas y canceladas),
-    con filtros opcionales.
+    con filtros opcionales. Con cursor o page_size, de a una página:
+    {items, next_cursor}.
     """
-    return purchases_service.list_purchases_for_buyer(
-        db=db,
-        buyer=current_user,
+    filters = dict(
         status=status,
         listing_id=listing_id,
         min_qty=min_qty,
@@ -83,6 +125,17 @@ def list_my_purchases(
         min_price=min_price,
         max_price=max_price,
     )
+    if cursor is None and page_size is None:
+        return purchases_service.list_purchases_for_buyer(
+            db=db, buyer=current_user, **filters
+        )
+    return purchases_service.page_purchases_for_buyer(
+        db,
+        current_user,
+        cursor=cursor,
+        page_size=page_size or settings.HISTORY_PAGE_SIZE,
+        **filters,
+    )
 
 
 @router.post(
@@ -93,7 +146,7 @@ def list_my_purchases(
 def cancel_purchase(
     purchase_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return purchases_service.cancel_purchase_for_buyer(
         db=db,
@@ -110,7 +163,7 @@ def cancel_purchase(
 def reactivate_purchase(
     purchase_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return purchases_service.reactivate_purchase_for_buyer(
         db=db,
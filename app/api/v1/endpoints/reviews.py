@@ -1,13 +1,23 @@
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Union
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user, require_role
-from app.models.user import User, UserRole
+from app.api.deps import (
+    Principal,
+    get_current_user,
+    get_db,
+    get_read_db,
+    require_role,
+)
+from app.core.config import settings
+from app.core.http_cache import http_cache
+from app.db.query_stats import query_budget
+from app.models.user import UserRole
 from app.models.listing import Listing
 from app.schemas.review import (
     BuyerReviewOut,
+    CursorBuyerReviewsOut,
     ReviewCreate,
     ReviewOut,
     ReviewUpdate,
@@ -25,7 +35,7 @@ router = APIRouter()
 def create_review(
     payload: ReviewCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Crea una review para el CarModel asociado a la listing indicada.
@@ -40,10 +50,14 @@ def create_review(
 @router.get(
     "/by-listing/{listing_id}",
     response_model=list[ReviewOut],
+    dependencies=[
+        Depends(query_budget(2)),
+        Depends(http_cache(max_age=settings.HTTP_CACHE_MAX_AGE_SECONDS)),
+    ],
 )
 def list_reviews_by_listing(
     listing_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Lista las reviews del CarModel asociado a la listing dada.
@@ -68,7 +82,7 @@ def update_review(
     review_id: int,
     payload: ReviewUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Actualiza rating/comentario de una reseña propia.
@@ -83,24 +97,42 @@ def update_review(
 
 @router.get(
     "/my",
-    response_model=List[BuyerReviewOut],
+    response_model=Union[List[BuyerReviewOut], CursorBuyerReviewsOut],
     dependencies=[Depends(require_role(UserRole.buyer))],
 )
 def list_my_reviews(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     brand: Optional[str] = Query(None),
     model: Optional[str] = Query(None),
     min_rating: Optional[int] = Query(None, ge=1, le=5),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor de la página anterior"
+    ),
+    page_size: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.HISTORY_MAX_PAGE_SIZE,
+        description="Con cursor o page_size devuelve {items, next_cursor}",
+    ),
 ):
-    return reviews_service.list_reviews_for_buyer(
-        db=db,
-        author=current_user,
+    filters = dict(
         brand=brand,
         model=model,
         min_rating=min_rating,
         date_from=date_from,
         date_to=date_to,
     )
+    if cursor is None and page_size is None:
+        return reviews_service.list_reviews_for_buyer(
+            db=db, author=current_user, **filters
+        )
+    return reviews_service.page_reviews_for_buyer(
+        db,
+        current_user,
+        cursor=cursor,
+        page_size=page_size or settings.HISTORY_PAGE_SIZE,
+        **filters,
+    )
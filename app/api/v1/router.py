@@ -1,5 +1,7 @@
 from fastapi import APIRouter
+from app.core.config import settings
 from app.api.v1.endpoints import (
+    async_reads,
     inventory,
     ping,
     auth,
@@ -17,6 +19,11 @@ from app.api.v1.endpoints import (
 )
 
 api_router = APIRouter()
+if settings.ASYNC_READS_ENABLED:
+    # mismo path que las rutas sync: al registrarse antes, ganan el match
+    api_router.include_router(
+        async_reads.router, tags=["async-reads"], include_in_schema=False
+    )
 api_router.include_router(ping.router, tags=["ping"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(agencies.router, prefix="/agencies", tags=["agencies"])
@@ -0,0 +1,155 @@
+# app/core/cache.py
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+# Todas las instancias, para poder vaciarlas juntas (tests, admin)
+_registry: list["TTLCache"] = []
+
+
+class TTLCache:
+    """
+    Cache en proceso, thread-safe, con TTL y tamaño máximo (descarta el
+    menos usado). `get_or_set` hace single-flight: si N requests piden la
+    misma key a la vez, sólo una ejecuta `compute` y el resto espera su
+    resultado. Desde el event loop usar `get_or_set_async`: la espera del
+    single-flight sync bloquearía el hilo del loop (y con él al request que
+    tiene que terminar el cálculo).
+
+    Con ttl <= 0 el cache queda desactivado (siempre llama a `compute`).
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, threading.Lock] = {}
+        # (loop, key): un asyncio.Lock sólo sirve dentro de su loop
+        self._inflight_async: dict[tuple, asyncio.Lock] = {}
+        # se incrementa en cada invalidación: un cálculo que empezó antes
+        # no guarda su resultado (podría estar desactualizado)
+        self._generation = 0
+        # time.monotonic() de la última invalidación (ver may_lag_behind)
+        self.invalidated_at = float("-inf")
+        _registry.append(self)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], T]) -> T:
+        if not self.enabled:
+            return compute()
+
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # otro hilo pudo haberlo calculado mientras esperábamos
+            value = self._lookup(key)
+            if value is not _MISSING:
+                return value
+
+            generation = self._generation
+            try:
+                value = compute()
+                with self._lock:
+                    if generation == self._generation:
+                        self._store(key, value)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+            return value
+
+    async def get_or_set_async(
+        self, key: Hashable, compute: Callable[[], Awaitable[T]]
+    ) -> T:
+        """get_or_set para corrutinas: los que esperan ceden el loop."""
+        if not self.enabled:
+            return await compute()
+
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        inflight_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            key_lock = self._inflight_async.setdefault(inflight_key, asyncio.Lock())
+
+        async with key_lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                return value
+
+            generation = self._generation
+            try:
+                value = await compute()
+                with self._lock:
+                    if generation == self._generation:
+                        self._store(key, value)
+            finally:
+                with self._lock:
+                    self._inflight_async.pop(inflight_key, None)
+            return value
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+            self.invalidated_at = time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+            self.invalidated_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # -- internos (asumen self._lock tomado salvo _lookup) --
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+def clear_all_caches() -> None:
+    for cache in _registry:
+        cache.clear()
@@ -15,6 +15,12 @@ def _parse_origins(value: str | None) -> list[str]:
     return [o.strip() for o in value.split(",") if o.strip()]
 
 
+def _parse_list(value: str | None) -> list[str]:
+    if not value:
+        return []
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
 def _get_int(name: str, default: int) -> int:
     raw = os.getenv(name, "").strip()
     if not raw:
@@ -25,11 +31,49 @@ def _get_int(name: str, default: int) -> int:
         return default
 
 
+def _get_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name, "").strip().lower()
+    if not raw:
+        return default
+    return raw in ("1", "true", "yes", "on")
+
+
 class Settings:
     APP_NAME: str = os.getenv("APP_NAME", "CTA Backend")
     APP_VERSION: str = os.getenv("APP_VERSION", "0.1.0")
     APP_ENV: str = os.getenv("APP_ENV", "development")
     DATABASE_URL: str | None = os.getenv("DATABASE_URL")
+    # Falla el request si un endpoint supera su query_budget (para tests/CI);
+    # si no, sólo se loguea
+    QUERY_BUDGET_STRICT: bool = _get_bool("QUERY_BUDGET_STRICT", False)
+    # Réplicas de lectura (coma-separadas). Vacío = todo va al primario.
+    DATABASE_REPLICA_URLS: list[str] = _parse_list(os.getenv("DATABASE_REPLICA_URLS"))
+    # cada cuánto (segundos) se re-chequea una réplica con SELECT 1
+    REPLICA_HEALTH_INTERVAL_SECONDS: int = _get_int(
+        "REPLICA_HEALTH_INTERVAL_SECONDS", 10
+    )
+    # lag de replicación tolerado (segundos): durante ese tiempo después de
+    # invalidar un cache, sus misses se llenan desde el primario
+    REPLICA_MAX_LAG_SECONDS: int = _get_int("REPLICA_MAX_LAG_SECONDS", 2)
+    # Pool de conexiones (por engine; con el async son dos pools)
+    DB_POOL_SIZE: int = _get_int("DB_POOL_SIZE", 10)
+    DB_MAX_OVERFLOW: int = _get_int("DB_MAX_OVERFLOW", 10)
+    DB_POOL_TIMEOUT: int = _get_int("DB_POOL_TIMEOUT", 30)
+    DB_POOL_RECYCLE: int = _get_int("DB_POOL_RECYCLE", 1800)
+    # pre-ping hace un round-trip extra en cada checkout; con DB_POOL_RECYCLE
+    # por debajo del wait_timeout de MySQL suele poder apagarse
+    DB_POOL_PRE_PING: bool = _get_bool("DB_POOL_PRE_PING", True)
+    # Statements más lentos que esto (ms) se loguean (app/db/slow_queries.py);
+    # 0 lo desactiva
+    SLOW_QUERY_THRESHOLD_MS: int = _get_int("SLOW_QUERY_THRESHOLD_MS", 200)
+    # además captura el EXPLAIN la primera vez que aparece cada query lenta
+    SLOW_QUERY_EXPLAIN: bool = _get_bool("SLOW_QUERY_EXPLAIN", False)
+    # Engine async (aiomysql / aiosqlite). Si no se define se deriva de
+    # DATABASE_URL cambiando el driver.
+    ASYNC_DATABASE_URL: str | None = os.getenv("ASYNC_DATABASE_URL")
+    # Sirve los GET calientes (browse, detalle, favoritos, reviews) con
+    # endpoints async sobre AsyncSession en vez del threadpool
+    ASYNC_READS_ENABLED: bool = _get_bool("ASYNC_READS_ENABLED", False)
     CORS_ORIGINS: list[str] = _parse_origins(os.getenv("CORS_ORIGINS"))
 
     # 🔐 Auth/JWT
@@ -38,6 +82,40 @@ class Settings:
     )  # <-- cambia en prod
     ACCESS_TOKEN_EXPIRE_MINUTES: int = _get_int("ACCESS_TOKEN_EXPIRE_MINUTES", 30)
     TOKEN_ALGORITHM: str = os.getenv("TOKEN_ALGORITHM", "HS256")
+    # bcrypt: hilos dedicados y máximo de operaciones en cola (0 = sin tope;
+    # pasado el tope responde 503)
+    PASSWORD_HASH_WORKERS: int = _get_int("PASSWORD_HASH_WORKERS", 2)
+    PASSWORD_HASH_MAX_QUEUE: int = _get_int("PASSWORD_HASH_MAX_QUEUE", 64)
+    # Cache de usuarios autenticados (segundos; 0 lo desactiva). Un cambio en
+    # otro proceso se ve recién cuando vence el TTL.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = _get_int("PRINCIPAL_CACHE_TTL_SECONDS", 30)
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = _get_int("PRINCIPAL_CACHE_MAX_ENTRIES", 10000)
+
+    # Cache del browse de ofertas (GET /listings) por combinación de filtros
+    # (segundos; 0 lo desactiva). Altas/bajas/cambios de ofertas y reseñas lo
+    # invalidan al commitear; el stock que descuentan las compras se ve al
+    # vencer el TTL.
+    LISTINGS_CACHE_TTL_SECONDS: int = _get_int("LISTINGS_CACHE_TTL_SECONDS", 5)
+    LISTINGS_CACHE_MAX_ENTRIES: int = _get_int("LISTINGS_CACHE_MAX_ENTRIES", 1024)
+
+    # Cache-Control de los GET públicos (browse, reseñas) para requests
+    # anónimos, en segundos; con Authorization siempre es private, no-cache
+    HTTP_CACHE_MAX_AGE_SECONDS: int = _get_int("HTTP_CACHE_MAX_AGE_SECONDS", 5)
+
+    # Historiales por cursor (ventas, clientes, compras, favoritos y reseñas
+    # propias): tamaño de página por defecto y máximo que acepta page_size
+    HISTORY_PAGE_SIZE: int = _get_int("HISTORY_PAGE_SIZE", 50)
+    HISTORY_MAX_PAGE_SIZE: int = _get_int("HISTORY_MAX_PAGE_SIZE", 200)
+
+    # Retención de los Idempotency-Key de compras (horas): una key más vieja
+    # ya no se repite y python -m app.scripts.purge_idempotency_keys la borra
+    IDEMPOTENCY_KEY_TTL_HOURS: int = _get_int("IDEMPOTENCY_KEY_TTL_HOURS", 24)
+
+    # ⚡ Cache de reportes de admin (segundos; 0 lo desactiva)
+    REPORTS_CACHE_TTL_SECONDS: int = _get_int("REPORTS_CACHE_TTL_SECONDS", 60)
+    REPORTS_CACHE_MAX_ENTRIES: int = _get_int("REPORTS_CACHE_MAX_ENTRIES", 256)
+    # hilos para correr en paralelo los reportes del dashboard
+    REPORTS_DASHBOARD_WORKERS: int = _get_int("REPORTS_DASHBOARD_WORKERS", 4)
 
 
 settings = Settings()
@@ -0,0 +1,115 @@
+"""
+GET condicionales (ETag / If-None-Match) y Cache-Control por ruta.
+
+- Cada ruta declara su política con la dependency `http_cache(max_age)`:
+
+      dependencies=[Depends(http_cache(max_age=5))]
+
+  Un request anónimo recibe `public, max-age=N`; uno con Authorization (o
+  max_age=0) recibe `private, no-cache`: el cliente revalida siempre con el
+  ETag.
+- ETag: si el endpoint conoce una versión barata del contenido la informa con
+  `not_modified(request, etag)` antes de serializar y, si coincide con
+  If-None-Match, responde 304 sin armar el JSON. Si no, el middleware calcula
+  un ETag débil con el hash del body (ahorra ancho de banda, no CPU).
+"""
+
+import hashlib
+from typing import Optional, Union
+
+from fastapi import Request, Response, status
+
+_STATE_POLICY = "http_cache_max_age"
+_STATE_ETAG = "http_cache_etag"
+
+
+def weak_etag(*parts: Union[str, bytes]) -> str:
+    """ETag débil (W/"...") a partir del contenido o de una versión."""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode() if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return f'W/"{digest.hexdigest()[:24]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil de If-None-Match (lista separada por comas o *)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def http_cache(max_age: int = 0):
+    """Dependency que habilita ETag/304 y fija el Cache-Control de la ruta."""
+
+    def _dep(request: Request) -> None:
+        setattr(request.state, _STATE_POLICY, max_age)
+
+    return _dep
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Registra el ETag del recurso; devuelve la respuesta 304 si el cliente ya
+    lo tiene, None si hay que responder el contenido:
+
+        return not_modified(request, etag) or data
+    """
+    setattr(request.state, _STATE_ETAG, etag)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    return None
+
+
+def _cache_control(request: Request, max_age: int) -> str:
+    if max_age > 0 and "authorization" not in request.headers:
+        return f"public, max-age={max_age}"
+    return "private, no-cache"
+
+
+async def conditional_get_middleware(request: Request, call_next):
+    response = await call_next(request)
+
+    max_age = getattr(request.state, _STATE_POLICY, None)
+    if (
+        max_age is None
+        or request.method not in ("GET", "HEAD")
+        or response.status_code
+        not in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED)
+    ):
+        return response
+
+    etag = getattr(request.state, _STATE_ETAG, None)
+    if etag is None:
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = weak_etag(body)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            response = Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=_without_entity_headers(response.headers),
+            )
+        else:
+            response = Response(
+                content=body,
+                status_code=response.status_code,
+                headers=dict(response.headers),
+            )
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _cache_control(request, max_age)
+    response.headers.add_vary_header("Authorization")
+    return response
+
+
+def _without_entity_headers(headers) -> dict[str, str]:
+    return {
+        k: v
+        for k, v in headers.items()
+        if k.lower() not in ("content-length", "content-type")
+    }
@@ -0,0 +1,122 @@
+"""
+Respuestas rápidas para los endpoints de listas.
+
+Los services arman los schemas una sola vez con `Model.model_construct(...)`
+a partir de las tuplas de la query (los tipos ya vienen convertidos, no hace
+falta validar) y el endpoint devuelve `FastJSONResponse(data)`. Al recibir
+una Response, FastAPI no vuelve a validar contra `response_model` (que queda
+para la documentación) y orjson serializa sin pasar por jsonable_encoder.
+
+Para resultados sin tope (exports) `stream_export` manda las filas de un
+iterador como CSV o NDJSON a medida que llegan, en bloques de
+EXPORT_CHUNK_ROWS filas: la memoria no crece con la cantidad de filas.
+"""
+
+import csv
+import io
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Literal, Union
+
+import orjson
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        # los campos tal cual; orjson resuelve datetime, enum y anidados
+        return obj.__dict__
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"{type(obj).__name__} no es serializable a JSON")
+
+
+def render_json(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse que además acepta schemas pydantic y Decimal."""
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+
+# ---------------------------------------------------------------------------
+# Exports en streaming
+# ---------------------------------------------------------------------------
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_CHUNK_ROWS = 500
+
+_EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunks(rows: Iterable[BaseModel], fields: Sequence[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    pending = 0
+    for row in rows:
+        values = row.__dict__
+        writer.writerow([_csv_value(values[f]) for f in fields])
+        pending += 1
+        if pending >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def _ndjson_chunks(rows: Iterable[BaseModel]) -> Iterator[bytes]:
+    lines: list[bytes] = []
+    for row in rows:
+        lines.append(render_json(row))
+        if len(lines) >= EXPORT_CHUNK_ROWS:
+            yield b"\n".join(lines) + b"\n"
+            lines.clear()
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def export_chunks(
+    rows: Iterable[BaseModel],
+    schema: type[BaseModel],
+    fmt: ExportFormat,
+) -> Iterator[Union[str, bytes]]:
+    """
+    `rows` (schemas de tipo `schema`) como bloques de CSV (una columna por
+    campo, con encabezado) o NDJSON (un objeto por línea).
+    """
+    if fmt == "csv":
+        return _csv_chunks(rows, list(schema.model_fields))
+    return _ndjson_chunks(rows)
+
+
+def stream_export(
+    rows: Iterable[BaseModel],
+    schema: type[BaseModel],
+    fmt: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Descarga de export_chunks como `filename`.csv / .ndjson."""
+    return StreamingResponse(
+        export_chunks(rows, schema, fmt),
+        media_type=_EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -1,14 +1,21 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
+from fastapi import HTTPException, status
 from jose import jwt, JWTError
 from passlib.context import CryptContext
+from prometheus_client import Gauge
 
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 ALGORITHM = "HS256"
 
+T = TypeVar("T")
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -18,6 +25,77 @@ def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
 
+# ---------------------------------------------------------------------------
+# bcrypt fuera del threadpool compartido
+# ---------------------------------------------------------------------------
+# Un pool propio y acotado para hashear/verificar: una ráfaga de logins
+# espera acá (sin ocupar hilos de anyio ni bloquear el event loop) y el
+# resto de los endpoints sync siguen teniendo su threadpool. bcrypt suelta
+# el GIL mientras hashea, así que con hilos alcanza.
+_WORKERS = max(settings.PASSWORD_HASH_WORKERS, 1)
+_password_executor = ThreadPoolExecutor(
+    max_workers=_WORKERS,
+    thread_name_prefix="password",
+)
+# en cola + ejecutándose
+_outstanding = 0
+_outstanding_lock = threading.Lock()
+
+PASSWORD_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Operaciones de bcrypt esperando un worker libre",
+)
+PASSWORD_IN_PROGRESS = Gauge(
+    "password_hash_in_progress",
+    "Operaciones de bcrypt ejecutándose",
+)
+
+
+def _release_slot() -> None:
+    global _outstanding
+    with _outstanding_lock:
+        _outstanding -= 1
+
+
+def _run_tracked(fn: Callable[..., T], *args) -> T:
+    PASSWORD_QUEUE_DEPTH.dec()
+    try:
+        with PASSWORD_IN_PROGRESS.track_inprogress():
+            return fn(*args)
+    finally:
+        _release_slot()
+
+
+async def _run_password_op(fn: Callable[..., T], *args) -> T:
+    global _outstanding
+    max_queue = settings.PASSWORD_HASH_MAX_QUEUE
+    with _outstanding_lock:
+        if max_queue > 0 and _outstanding >= _WORKERS + max_queue:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Demasiados intentos simultáneos, reintentá en unos segundos",
+                headers={"Retry-After": "1"},
+            )
+        _outstanding += 1
+    PASSWORD_QUEUE_DEPTH.inc()
+
+    try:
+        future = _password_executor.submit(_run_tracked, fn, *args)
+    except BaseException:
+        PASSWORD_QUEUE_DEPTH.dec()
+        _release_slot()
+        raise
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_op(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await _run_password_op(verify_password, password, password_hash)
+
+
 def create_access_token(
     *,
     sub: str,
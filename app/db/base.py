@@ -13,3 +13,5 @@ from app.models import purchase  # noqa: F401
 from app.models import car_model  # noqa: F401
 from app.models import review  # noqa: F401
 from app.models import inventory  # noqa: F401
+from app.models import idempotency_key  # noqa: F401
+from app.models import report_rollup  # noqa: F401
@@ -0,0 +1,20 @@
+"""
+Columnas agregadas a tablas que ya existen (scripts que corren sin pasar por
+las migraciones, p.ej. app/scripts/rebuild_rating_stats.py): create_all sólo
+crea tablas nuevas, no les agrega columnas.
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+
+def ensure_columns(engine: Engine, table: str, columns: dict[str, str]) -> list[str]:
+    """ALTER TABLE ADD COLUMN para las que falten. Devuelve las agregadas."""
+    existing = {c["name"] for c in inspect(engine).get_columns(table)}
+    added: list[str] = []
+    with engine.begin() as conn:
+        for name, ddl in columns.items():
+            if name not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+                added.append(name)
+    return added
@@ -0,0 +1,84 @@
+# app/db/fulltext.py
+"""
+Índices de texto completo para las búsquedas por marca/modelo.
+
+- MySQL: índice FULLTEXT con parser ngram (encuentra substrings, igual que el
+  ILIKE '%q%' de antes, pero usando índice).
+- SQLite (tests): tabla virtual FTS5 con tokenizer trigram, sincronizada con
+  la tabla base mediante triggers.
+
+Los DDL se cuelgan de los eventos after_create / before_drop de cada tabla,
+así `Base.metadata.create_all` los crea junto con el resto del esquema.
+"""
+
+from sqlalchemy import DDL, Table, event
+
+# nombre de tabla -> columnas indexadas
+FULLTEXT_COLUMNS: dict[str, tuple[str, ...]] = {}
+
+
+def fts_table_name(table_name: str) -> str:
+    return f"{table_name}_fts"
+
+
+def fulltext_index_name(table_name: str) -> str:
+    return f"ft_{table_name}_search"
+
+
+def _sqlite_ddl(table: str, columns: tuple[str, ...]) -> list[str]:
+    fts = fts_table_name(table)
+    cols = ", ".join(columns)
+    new_vals = ", ".join(f"new.{c}" for c in columns)
+    old_vals = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {old_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END",
+        # por si la tabla base ya tenía filas (create_all sobre una BD existente)
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def _mysql_ddl(table: str, columns: tuple[str, ...]) -> str:
+    return (
+        f"CREATE FULLTEXT INDEX {fulltext_index_name(table)} "
+        f"ON {table} ({', '.join(columns)}) WITH PARSER ngram"
+    )
+
+
+def fulltext_ddl(dialect_name: str, table: str, columns: tuple[str, ...]) -> list[str]:
+    """DDL de creación para un dialecto (lo usan también las migraciones)."""
+    if dialect_name == "mysql":
+        return [_mysql_ddl(table, columns)]
+    if dialect_name == "sqlite":
+        return _sqlite_ddl(table, columns)
+    return []
+
+
+def register_fulltext(table: Table, columns: tuple[str, ...]) -> None:
+    """
+    Declara un índice de texto completo sobre `columns` de `table`.
+    Llamar una vez, a nivel de módulo, después de definir el modelo.
+    """
+    FULLTEXT_COLUMNS[table.name] = columns
+
+    mysql_ddl = DDL(_mysql_ddl(table.name, columns))
+    event.listen(table, "after_create", mysql_ddl.execute_if(dialect="mysql"))
+
+    for stmt in _sqlite_ddl(table.name, columns):
+        event.listen(table, "after_create", DDL(stmt).execute_if(dialect="sqlite"))
+    event.listen(
+        table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {fts_table_name(table.name)}").execute_if(
+            dialect="sqlite"
+        ),
+    )
@@ -0,0 +1,76 @@
+"""
+Migraciones de esquema al arrancar (Alembic, ver migrations/).
+
+- BD vacía: `upgrade head` crea todo desde la baseline.
+- BD creada con el `create_all` de antes de Alembic (tiene tablas pero no
+  alembic_version): se marca con la baseline y se aplican las migraciones
+  siguientes; 0002 crea sólo lo que le falte.
+- BD creada con `create_all` sobre los modelos actuales (tablas e índices
+  completos, sin alembic_version): ya está en head, se marca con head.
+"""
+
+import logging
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[2]
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    cfg = Config(str(ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(ROOT / "migrations"))
+    return cfg
+
+
+def _is_pre_alembic(engine: Engine) -> bool:
+    tables = set(inspect(engine).get_table_names())
+    return "alembic_version" not in tables and "users" in tables
+
+
+def _has_model_schema(engine: Engine) -> bool:
+    """Están todas las tablas e índices de los modelos (create_all actual)."""
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            return False
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        if any(ix.name not in existing for ix in table.indexes):
+            return False
+    return True
+
+
+def run_migrations(engine: Engine) -> None:
+    cfg = alembic_config()
+
+    if _is_pre_alembic(engine):
+        revision = "head" if _has_model_schema(engine) else BASELINE_REVISION
+        logger.info("[DB] Esquema previo a Alembic: se marca con %s", revision)
+        with engine.begin() as conn:
+            cfg.attributes["connection"] = conn
+            command.stamp(cfg, revision)
+
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, "head")
+
+
+def reset_schema(engine: Engine) -> None:
+    """
+    Borra todo y lo recrea por las migraciones (scripts de seed / perf).
+    Con create_all la próxima corrida de run_migrations no sabría en qué
+    revisión está la base.
+    """
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    run_migrations(engine)
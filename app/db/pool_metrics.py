@@ -0,0 +1,85 @@
+"""
+Métricas Prometheus del pool de conexiones.
+
+- Gauges por engine (label `pool`): conexiones en uso, overflow y tamaño
+  configurado; se leen del pool en cada scrape.
+- Histograma del tiempo de espera en el checkout (incluye abrir la conexión
+  si el pool tiene que crear una) y contador de checkouts que vencieron
+  `pool_timeout`.
+
+El label sale de `pool_logging_name` del engine ("primary", "async", ...).
+"""
+
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Conexiones del pool en uso",
+    ["pool"],
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Conexiones abiertas por encima de pool_size",
+    ["pool"],
+)
+POOL_SIZE = Gauge(
+    "db_pool_size",
+    "pool_size configurado",
+    ["pool"],
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Tiempo hasta obtener una conexión del pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts que superaron pool_timeout",
+    ["pool"],
+)
+
+
+class _TimedCheckoutMixin:
+    def _do_get(self):
+        name = self.logging_name or "default"
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(name).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(name).observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def register_pool_metrics(engine: Engine, name: str) -> None:
+    """
+    Engancha los gauges al pool del engine. Se lee `engine.pool` en cada
+    scrape porque dispose() reemplaza el pool por uno nuevo.
+    """
+
+    def _read(attr: str):
+        def _value() -> float:
+            pool = engine.pool
+            fn = getattr(pool, attr, None)
+            return float(fn()) if fn else 0.0
+
+        return _value
+
+    POOL_CHECKED_OUT.labels(name).set_function(_read("checkedout"))
+    POOL_OVERFLOW.labels(name).set_function(_read("overflow"))
+    POOL_SIZE.labels(name).set_function(_read("size"))
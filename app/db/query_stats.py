@@ -0,0 +1,155 @@
+"""
+Cantidad de SQL y tiempo de base por request.
+
+- Listeners globales de Engine (cualquier engine: primario, réplicas, el
+  sync_engine del async) suman cada statement al QueryStats del request
+  actual, que viaja en un ContextVar (llega al threadpool de los endpoints
+  sync y a run_sync de los async).
+- El middleware publica histogramas por ruta, agrega el header
+  `Server-Timing: db;dur=...` y controla el presupuesto declarado con
+  `query_budget(n)`.
+"""
+
+import contextvars
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Statements SQL ejecutados por request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Tiempo total en la base por request",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Un endpoint ejecutó más SQL que su query_budget (modo estricto)."""
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    budget: Optional[int] = None
+    request: Optional[Request] = None
+
+
+_current: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Cuenta los statements del bloque fuera de un request (scripts,
+    benchmarks):
+
+        with track_queries() as stats:
+            ...
+        stats.count, stats.seconds
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def current_route() -> Optional[str]:
+    """Template de la ruta del request en curso (None fuera de un request)."""
+    stats = _current.get()
+    if stats is None or stats.request is None:
+        return None
+    return _route_label(stats.request)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_stats_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+
+def query_budget(max_queries: int):
+    """
+    Dependency que declara cuántos statements puede ejecutar un endpoint
+    (incluye los de sus dependencias):
+
+        dependencies=[Depends(query_budget(2))]
+
+    Pasarse se loguea; con QUERY_BUDGET_STRICT=1 (tests) el request falla.
+    """
+
+    def _dep() -> None:
+        stats = _current.get()
+        if stats is not None:
+            stats.budget = max_queries
+
+    return _dep
+
+
+def _route_label(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+async def query_stats_middleware(request: Request, call_next):
+    stats = QueryStats(request=request)
+    token = _current.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+
+    route = _route_label(request)
+    REQUEST_DB_QUERIES.labels(request.method, route).observe(stats.count)
+    REQUEST_DB_SECONDS.labels(request.method, route).observe(stats.seconds)
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+    )
+
+    if stats.budget is not None and stats.count > stats.budget:
+        message = (
+            f"{request.method} {route} ejecutó {stats.count} queries "
+            f"(presupuesto {stats.budget})"
+        )
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning("[DB] %s", message)
+
+    return response
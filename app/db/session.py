@@ -1,12 +1,41 @@
-from collections.abc import Generator
+import itertools
+import logging
+import threading
+from collections.abc import AsyncGenerator, Generator
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 import time
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
+from app.db.pool_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    register_pool_metrics,
+)
+from app.db.slow_queries import register_slow_query_log
 from sqlalchemy.exc import OperationalError
 
+logger = logging.getLogger(__name__)
+
 _engine = None
 _SessionLocal = None
+_replicas: list["_Replica"] | None = None
+_replica_lock = threading.Lock()
+_replica_rr = itertools.count()
+_async_engine = None
+_AsyncSessionLocal = None
+
+# marca en session.info de las sesiones abiertas contra una réplica
+REPLICA_SESSION = "replica"
+
+# driver sync -> driver async equivalente
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
 
 
 def _wait_for_db(url: str, attempts: int = 45, delay: float = 2.0) -> None:
@@ -35,6 +64,20 @@ def _wait_for_db(url: str, attempts: int = 45, delay: float = 2.0) -> None:
     raise RuntimeError("DB no disponible tras reintentos")
 
 
+def _pool_options(url: str, poolclass) -> dict:
+    """Opciones de pool desde Settings (SQLite usa sus pools por defecto)."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
 def get_engine():
     global _engine, _SessionLocal
     if _engine is None:
@@ -46,13 +89,25 @@ def get_engine():
 
         _engine = create_engine(
             settings.DATABASE_URL,
-            pool_pre_ping=True,  # valida sockets antes de reutilizarlos
-            pool_recycle=1800,  # opcional, evita conexiones viejas
+            pool_logging_name="primary",
+            **_pool_options(settings.DATABASE_URL, InstrumentedQueuePool),
         )
+        register_pool_metrics(_engine, "primary")
+        register_slow_query_log(_engine)
         _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
     return _engine
 
 
+def get_sessionmaker() -> sessionmaker:
+    """
+    Fábrica de sesiones del pool, para endpoints que necesitan más de una
+    sesión por request (p. ej. consultas en paralelo).
+    """
+    if _SessionLocal is None:
+        get_engine()
+    return _SessionLocal
+
+
 def get_db() -> Generator[Session, None, None]:
     global _SessionLocal
     if _SessionLocal is None:
@@ -62,3 +117,165 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+# ---------------------------------------------------------------------------
+# Réplicas de lectura
+# ---------------------------------------------------------------------------
+class _Replica:
+    """
+    Engine de una réplica + estado de salud. El chequeo (SELECT 1) corre como
+    mucho una vez cada REPLICA_HEALTH_INTERVAL_SECONDS, en el request que
+    la elige; entre chequeos se confía en el último resultado.
+    """
+
+    def __init__(self, index: int, url: str):
+        self.name = f"replica{index}"
+        self.engine = create_engine(
+            url,
+            pool_logging_name=self.name,
+            **_pool_options(url, InstrumentedQueuePool),
+        )
+        register_pool_metrics(self.engine, self.name)
+        register_slow_query_log(self.engine)
+        self.sessionmaker = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=self.engine,
+            info={REPLICA_SESSION: True},
+        )
+        self.healthy = True
+        self.next_check = 0.0
+        self._lock = threading.Lock()
+
+    def is_healthy(self) -> bool:
+        now = time.monotonic()
+        if now < self.next_check:
+            return self.healthy
+        # un solo hilo chequea; el resto usa el último estado conocido
+        if not self._lock.acquire(blocking=False):
+            return self.healthy
+        try:
+            try:
+                with self.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                if not self.healthy:
+                    logger.warning("[DB] %s volvió a responder", self.name)
+                self.healthy = True
+            except OperationalError as e:
+                if self.healthy:
+                    logger.warning("[DB] %s no responde: %s", self.name, e)
+                self.healthy = False
+            self.next_check = now + settings.REPLICA_HEALTH_INTERVAL_SECONDS
+            return self.healthy
+        finally:
+            self._lock.release()
+
+
+def _get_replicas() -> list[_Replica]:
+    global _replicas
+    if _replicas is None:
+        with _replica_lock:
+            if _replicas is None:
+                _replicas = [
+                    _Replica(i, url)
+                    for i, url in enumerate(settings.DATABASE_REPLICA_URLS, 1)
+                ]
+    return _replicas
+
+
+def _pick_replica() -> "_Replica | None":
+    """Round-robin entre réplicas sanas; None si no hay ninguna."""
+    replicas = _get_replicas()
+    if not replicas:
+        return None
+    start = next(_replica_rr)
+    for offset in range(len(replicas)):
+        replica = replicas[(start + offset) % len(replicas)]
+        if replica.is_healthy():
+            return replica
+    return None
+
+
+def get_read_sessionmaker() -> sessionmaker:
+    """Fábrica de sesiones de lectura: una réplica sana o el primario."""
+    replica = _pick_replica()
+    if replica is not None:
+        return replica.sessionmaker
+    return get_sessionmaker()
+
+
+def may_lag_behind(db: Session, changed_at: float) -> bool:
+    """
+    True si `db` es de una réplica y el cambio de `changed_at`
+    (time.monotonic()) tiene menos de REPLICA_MAX_LAG_SECONDS: la réplica
+    puede no tenerlo todavía.
+    """
+    return (
+        bool(db.info.get(REPLICA_SESSION))
+        and time.monotonic() - changed_at < settings.REPLICA_MAX_LAG_SECONDS
+    )
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Sesión para endpoints de sólo lectura (browse, reviews, favoritos,
+    reportes). Puede ver datos con el lag de replicación; las escrituras
+    siempre van por get_db.
+    """
+    db = get_read_sessionmaker()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def dispose_replicas() -> None:
+    for replica in _replicas or ():
+        replica.engine.dispose()
+
+
+def async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    if not settings.DATABASE_URL:
+        raise RuntimeError("DATABASE_URL no está configurada en .env")
+
+    url = make_url(settings.DATABASE_URL)
+    driver = _ASYNC_DRIVERS.get(url.drivername)
+    if driver is None:
+        raise RuntimeError(
+            f"No hay driver async para '{url.drivername}': "
+            "configurá ASYNC_DATABASE_URL"
+        )
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        # la espera a MySQL ya la hizo get_engine() en el startup
+        url = async_database_url()
+        _async_engine = create_async_engine(
+            url,
+            pool_logging_name="async",
+            **_pool_options(url, InstrumentedAsyncAdaptedQueuePool),
+        )
+        register_pool_metrics(_async_engine.sync_engine, "async")
+        register_slow_query_log(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    if _AsyncSessionLocal is None:
+        get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    if _async_engine is not None:
+        await _async_engine.dispose()
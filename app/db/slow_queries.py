@@ -0,0 +1,166 @@
+"""
+Log de queries lentas.
+
+Cualquier statement que tarde más de SLOW_QUERY_THRESHOLD_MS se loguea con:
+- el SQL normalizado (literales -> ?, listas IN colapsadas) y su fingerprint,
+- la forma de los parámetros (tipos, nunca valores: puede haber PII),
+- la ruta del request (app/db/query_stats.py) y la duración.
+
+Con SLOW_QUERY_EXPLAIN=1 además se captura el EXPLAIN (EXPLAIN QUERY PLAN en
+SQLite) la primera vez que aparece cada fingerprint, sobre la misma conexión
+y con los mismos parámetros.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.query_stats import current_route
+
+logger = logging.getLogger(__name__)
+
+_START_KEY = "slow_query_start"
+
+# fingerprints que ya tienen su EXPLAIN; acotado para no crecer sin límite
+_MAX_EXPLAINED = 1000
+_explained: set[str] = set()
+_explained_lock = threading.Lock()
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|:\w+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """SQL sin literales ni placeholders propios del driver, en una línea."""
+    sql = _STRING.sub("?", statement)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?+)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+def _type_name(value: Any) -> str:
+    return "null" if value is None else type(value).__name__
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Tipos de los parámetros: {'id': 'int'} / [int, str] / 50x[...]."""
+    if executemany:
+        rows = list(parameters or ())
+        first = parameter_shape(rows[0]) if rows else "[]"
+        return f"{len(rows)}x{first}"
+    if isinstance(parameters, dict):
+        inner = ", ".join(f"{k}: {_type_name(v)}" for k, v in parameters.items())
+        return "{" + inner + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "[" + ", ".join(_type_name(v) for v in parameters) + "]"
+    return _type_name(parameters)
+
+
+def _explain_prefix(dialect_name: str) -> str:
+    return "EXPLAIN QUERY PLAN " if dialect_name == "sqlite" else "EXPLAIN "
+
+
+def _first_time(fp: str) -> bool:
+    with _explained_lock:
+        if fp in _explained or len(_explained) >= _MAX_EXPLAINED:
+            return False
+        _explained.add(fp)
+        return True
+
+
+def _is_streaming(context) -> bool:
+    """
+    Cursor del lado del servidor (stream_results / yield_per, p. ej. los
+    exports): el resultado sigue pendiente en la conexión y un EXPLAIN ahí
+    mismo lo descartaría (pymysql termina la query sin buffer) y el export
+    terminaría antes de tiempo, sin error.
+    """
+    if context is None:
+        return False
+    options = context.execution_options
+    return bool(options.get("stream_results") or options.get("yield_per"))
+
+
+def _capture_explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    """
+    EXPLAIN con un cursor nuevo sobre la misma conexión DBAPI (misma
+    transacción). Si falla sólo se loguea en debug: nunca rompe el request.
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(_explain_prefix(conn.dialect.name) + statement, parameters or ())
+        rows = cursor.fetchall()
+    except Exception as e:  # noqa: BLE001 - el EXPLAIN es best effort
+        logger.debug("[DB] no se pudo capturar EXPLAIN: %s", e)
+        return None
+    finally:
+        cursor.close()
+    return "\n".join(" | ".join(str(col) for col in row) for row in rows)
+
+
+def register_slow_query_log(
+    engine: Engine,
+    threshold_ms: Optional[int] = None,
+    explain: Optional[bool] = None,
+) -> None:
+    """
+    Engancha el log a un engine (para el async, pasar `engine.sync_engine`).
+    threshold_ms <= 0 lo desactiva.
+    """
+    threshold_ms = (
+        settings.SLOW_QUERY_THRESHOLD_MS if threshold_ms is None else threshold_ms
+    )
+    explain = settings.SLOW_QUERY_EXPLAIN if explain is None else explain
+    if threshold_ms <= 0:
+        return
+    threshold = threshold_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(_START_KEY)
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        if elapsed < threshold:
+            return
+
+        normalized = normalize_sql(statement)
+        fp = fingerprint(normalized)
+        logger.warning(
+            "[DB] query lenta %.1fms route=%s fingerprint=%s params=%s sql=%s",
+            elapsed * 1000,
+            current_route() or "-",
+            fp,
+            parameter_shape(parameters, executemany),
+            normalized,
+        )
+
+        if (
+            explain
+            and not executemany
+            and not _is_streaming(context)
+            and normalized[:6].upper() == "SELECT"
+            and _first_time(fp)
+        ):
+            plan = _capture_explain(conn, statement, parameters)
+            if plan is not None:
+                logger.warning("[DB] EXPLAIN fingerprint=%s\n%s", fp, plan)
@@ -3,10 +3,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.http_cache import conditional_get_middleware
 from app.api.v1.router import api_router
 
-from app.db.base import Base
-from app.db.session import get_engine
+from app.db.migrate import run_migrations
+from app.db.query_stats import query_stats_middleware
+from app.db.session import dispose_async_engine, dispose_replicas, get_engine
 import app.models.agency  # ← nuevo
 import app.models.user  # ← nuevo
 from sqlalchemy.exc import SQLAlchemyError
@@ -20,22 +22,28 @@ async def lifespan(app: FastAPI):
     # STARTUP
     engine = get_engine()
     try:
+        # en tests el esquema lo crea conftest con create_all
         if settings.APP_ENV != "test":
-            Base.metadata.create_all(bind=engine)  # crea tablas si no existen
+            run_migrations(engine)  # alembic upgrade head
     except SQLAlchemyError as e:
         # Loguea y repropaga para que el contenedor reinicie si corresponde
-        print(f"[DB] Error creando tablas: {e}")
+        print(f"[DB] Error migrando el esquema: {e}")
         raise
     try:
         logging.info("Startup complete. Metrics exposed.")
         yield
     finally:
         engine.dispose()  # opcional
+        dispose_replicas()
+        await dispose_async_engine()
 
 
 setup_logging()
 app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan)
 
+app.middleware("http")(query_stats_middleware)
+app.middleware("http")(conditional_get_middleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
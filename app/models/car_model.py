@@ -3,6 +3,7 @@ from sqlalchemy import Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.fulltext import register_fulltext
 
 
 class CarModel(Base):
@@ -19,8 +20,25 @@ class CarModel(Base):
 
     year: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
+    # Agregados de reseñas desnormalizados (los mantiene app/services/reviews.py)
+    reviews_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    rating_sum: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
     inventory_items = relationship(
         "Inventory",
         back_populates="car_model",
         cascade="all, delete-orphan",
     )
+
+    @property
+    def avg_rating(self) -> float | None:
+        if not self.reviews_count:
+            return None
+        return self.rating_sum / self.reviews_count
+
+
+register_fulltext(CarModel.__table__, ("brand", "model"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, DateTime, ForeignKey, UniqueConstraint, text
+from sqlalchemy import Integer, DateTime, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -7,9 +7,8 @@ class Favorite(Base):
     __tablename__ = "favorites"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    customer_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), index=True
-    )
+    # indexado por ix_favorites_customer_created (prefijo)
+    customer_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     listing_id: Mapped[int] = mapped_column(
         ForeignKey("listings.id", ondelete="CASCADE"), index=True
     )
@@ -24,4 +23,6 @@ class Favorite(Base):
         UniqueConstraint(
             "customer_id", "listing_id", name="uq_favorite_customer_listing"
         ),
+        # "mis favoritos" ordenados por fecha
+        Index("ix_favorites_customer_created", "customer_id", "created_at"),
     )
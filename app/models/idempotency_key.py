@@ -0,0 +1,41 @@
+# app/models/idempotency_key.py
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Respuesta guardada para un header Idempotency-Key de un usuario.
+    Un reintento con la misma key devuelve `response_body` sin repetir la
+    operación.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    # sha256 del payload: misma key con otro body es un error del cliente
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    response_body: Mapped[str] = mapped_column(Text(), nullable=False)
+    created_at: Mapped["DateTime"] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("CURRENT_TIMESTAMP"),
+        index=True,
+    )
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_user_key"),
+    )
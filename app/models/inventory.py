@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Integer, Boolean
+from sqlalchemy import ForeignKey, Index, Integer, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -23,3 +23,8 @@ class Inventory(Base):
 
     agency = relationship("Agency", back_populates="inventory_items")
     car_model = relationship("CarModel", back_populates="inventory_items")
+
+    __table_args__ = (
+        # inventario de una agencia / item por (agencia, car model)
+        Index("ix_inventory_agency_car_model", "agency_id", "car_model_id"),
+    )
@@ -13,6 +13,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
+from app.db.fulltext import register_fulltext
 from app.models.car_model import CarModel
 
 
@@ -20,8 +21,9 @@ class Listing(Base):
     __tablename__ = "listings"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # indexado por ix_listings_agency_created (prefijo)
     agency_id: Mapped[int] = mapped_column(
-        ForeignKey("agencies.id", ondelete="CASCADE"), index=True
+        ForeignKey("agencies.id", ondelete="CASCADE")
     )
 
     car_model_id: Mapped[int] = mapped_column(
@@ -60,4 +62,15 @@ class Listing(Base):
 
     car_model: Mapped["CarModel"] = relationship("CarModel", back_populates="listings")
 
-    __table_args__ = (Index("ix_listings_brand_model", "brand", "model"),)
+    __table_args__ = (
+        Index("ix_listings_brand_model", "brand", "model"),
+        # soporte para la paginación por cursor ordenada por precio
+        Index("ix_listings_price_id", "current_price_amount", "id"),
+        # browse público: activas ordenadas por id
+        Index("ix_listings_active_id", "is_active", "id"),
+        # ofertas / ventas de una agencia
+        Index("ix_listings_agency_created", "agency_id", "created_at"),
+    )
+
+
+register_fulltext(Listing.__table__, ("brand", "model"))
@@ -1,6 +1,15 @@
 # app/models/purchase.py
 from decimal import Decimal
-from sqlalchemy import Integer, DateTime, ForeignKey, Numeric, String, text, Enum
+from sqlalchemy import (
+    Integer,
+    DateTime,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    text,
+    Enum,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 from enum import Enum as PyEnum
@@ -19,8 +28,9 @@ class Purchase(Base):
     buyer_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), index=True
     )
+    # indexado por ix_purchases_listing_status (prefijo)
     listing_id: Mapped[int] = mapped_column(
-        ForeignKey("listings.id", ondelete="CASCADE"), index=True
+        ForeignKey("listings.id", ondelete="CASCADE")
     )
 
     unit_price_amount: Mapped[Decimal] = mapped_column(
@@ -48,3 +58,10 @@ class Purchase(Base):
 
     buyer = relationship("User", back_populates="purchases")
     listing = relationship("Listing", back_populates="purchases")
+
+    __table_args__ = (
+        # reportes / rebuild de rollups: compras COMPLETED por rango de fecha
+        Index("ix_purchases_status_created", "status", "created_at"),
+        # ventas por listing y chequeo de compras al borrar una listing
+        Index("ix_purchases_listing_status", "listing_id", "status"),
+    )
@@ -0,0 +1,71 @@
+# app/models/report_rollup.py
+"""
+Tablas de rollup diario para los reportes de admin.
+
+Cada fila acumula un día (fecha de Purchase.created_at / Favorite.created_at)
+para una clave (car model, buyer, agencia, listing). Las mantiene
+app/services/report_rollups.py: incrementalmente en cada compra/cancelación/
+favorito, y en bloque con `python -m app.scripts.rebuild_report_rollups`.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DailyCarModelSales(Base):
+    __tablename__ = "daily_car_model_sales"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    car_model_id: Mapped[int] = mapped_column(
+        ForeignKey("car_models.id", ondelete="CASCADE"), primary_key=True
+    )
+    units_sold: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0
+    )
+
+
+class DailyBuyerPurchases(Base):
+    __tablename__ = "daily_buyer_purchases"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    buyer_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    purchases_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_spent: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0
+    )
+    last_purchase_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class DailyAgencySales(Base):
+    __tablename__ = "daily_agency_sales"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    agency_id: Mapped[int] = mapped_column(
+        ForeignKey("agencies.id", ondelete="CASCADE"), primary_key=True
+    )
+    sales_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0
+    )
+
+
+class DailyFavorites(Base):
+    __tablename__ = "daily_favorites"
+
+    # por listing y no por brand+model: el PATCH de la listing puede cambiar
+    # brand/model; el reporte los toma de la listing al leer
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    listing_id: Mapped[int] = mapped_column(
+        ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True
+    )
+    favorites_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,4 +1,12 @@
-from sqlalchemy import Integer, ForeignKey, String, SmallInteger, DateTime, text
+from sqlalchemy import (
+    Integer,
+    ForeignKey,
+    Index,
+    String,
+    SmallInteger,
+    DateTime,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -9,10 +17,10 @@ class Review(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
+    # indexado por ix_reviews_car_model_created (prefijo)
     car_model_id: Mapped[int] = mapped_column(
         ForeignKey("car_models.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     author_id: Mapped[int] = mapped_column(
@@ -33,3 +41,8 @@ class Review(Base):
 
     car_model = relationship("CarModel", back_populates="reviews")
     author = relationship("User", back_populates="reviews")
+
+    __table_args__ = (
+        # reviews de un car model ordenadas por fecha
+        Index("ix_reviews_car_model_created", "car_model_id", "created_at"),
+    )
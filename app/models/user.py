@@ -30,6 +30,11 @@ class User(Base):
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), nullable=False, index=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default="1")
+    # se incrementa en cada UPDATE vía ORM (version_id_col); identifica la
+    # versión cacheada del principal (app/services/auth_service.py)
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
     agency_id: Mapped[int | None] = mapped_column(
         ForeignKey("agencies.id"), nullable=True
     )
@@ -69,6 +74,7 @@ class User(Base):
     __mapper_args__ = {
         "polymorphic_on": role,
         "polymorphic_identity": None,  # base abstracta
+        "version_id_col": version,
     }
 
 
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import List, Optional
 
 
 class FavoriteOut(BaseModel):
@@ -19,3 +20,9 @@ class FavoriteWithListingOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CursorFavoritesOut(BaseModel):
+    items: List[FavoriteWithListingOut]
+    # None cuando no hay más páginas
+    next_cursor: Optional[str] = None
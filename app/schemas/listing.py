@@ -43,6 +43,12 @@ class ListingOut(BaseModel):
     reviews_count: int = 0
 
 
+class CursorListingsOut(BaseModel):
+    items: List[ListingOut]
+    # None cuando no hay más páginas
+    next_cursor: Optional[str] = None
+
+
 class ListingAgencyOut(BaseModel):
     id: int
     car_model_id: int
@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel, Field
 
 from app.models.purchase import PurchaseStatus
@@ -9,6 +11,10 @@ class PurchaseCreate(BaseModel):
     quantity: int = Field(default=1, ge=1)
 
 
+class PurchaseBatchCreate(BaseModel):
+    items: list[PurchaseCreate] = Field(..., min_length=1, max_length=50)
+
+
 class PurchaseOut(BaseModel):
     id: int
     listing_id: int
@@ -19,6 +25,12 @@ class PurchaseOut(BaseModel):
     status: PurchaseStatus
 
 
+class CursorPurchasesOut(BaseModel):
+    items: List[PurchaseOut]
+    # None cuando no hay más páginas
+    next_cursor: Optional[str] = None
+
+
 class AgencySaleOut(BaseModel):
     id: int
     listing_id: int
@@ -40,6 +52,12 @@ class AgencySaleOut(BaseModel):
         from_attributes = True
 
 
+class CursorAgencySalesOut(BaseModel):
+    items: List[AgencySaleOut]
+    # None cuando no hay más páginas
+    next_cursor: Optional[str] = None
+
+
 class AgencyCustomerOut(BaseModel):
     customer_id: int
     email: str
@@ -49,3 +67,9 @@ class AgencyCustomerOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CursorAgencyCustomersOut(BaseModel):
+    items: List[AgencyCustomerOut]
+    # None cuando no hay más páginas
+    next_cursor: Optional[str] = None
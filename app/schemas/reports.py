@@ -30,3 +30,10 @@ class TopFavoriteCarOut(BaseModel):
     favorites_count: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class AdminDashboardOut(BaseModel):
+    top_sold_cars: list[TopSoldCarOut]
+    top_buyers: list[TopBuyerOut]
+    top_favorites: list[TopFavoriteCarOut]
+    top_agencies: list[TopAgencyOut]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class ReviewCreate(BaseModel):
@@ -24,6 +24,12 @@ class BuyerReviewOut(BaseModel):
     created_at: datetime
 
 
+class CursorBuyerReviewsOut(BaseModel):
+    items: List[BuyerReviewOut]
+    # None cuando no hay más páginas
+    next_cursor: Optional[str] = None
+
+
 class ReviewOut(BaseModel):
     id: int
     car_model_id: int
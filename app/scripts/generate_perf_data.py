@@ -0,0 +1,397 @@
+"""
+Generador de datos masivos y deterministas para la base de performance
+(cta_perf), para que k6 mida contra volúmenes reales y no contra una base
+casi vacía como la de seed_perf.
+
+- Volúmenes configurables (presets small / medium / large o flags sueltos).
+- Mismo --seed => mismas filas (ids explícitos, fechas desde una base fija).
+- Distribución sesgada (Zipf): pocas agencias con muchas ofertas, pocas
+  ofertas que concentran compras y favoritos, modelos populares.
+- INSERT en lotes con executemany (un lote = una transacción), sin ORM.
+
+Uso:
+    python -m app.scripts.generate_perf_data --preset medium
+    python -m app.scripts.generate_perf_data --preset large --seed 7
+    python -m app.scripts.generate_perf_data --listings 50000 --purchases 200000
+
+Borra y recrea el esquema (migraciones). Usuarios fijos para k6, todos con
+password Perf1234!: agency_perf@cta.com, buyer_perf@cta.com, admin_perf@cta.com.
+"""
+
+import argparse
+import itertools
+import random
+import time
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.security import hash_password
+from app.db.migrate import reset_schema
+from app.db.session import get_engine
+from app.models.agency import Agency
+from app.models.car_model import CarModel
+from app.models.favorite import Favorite
+from app.models.inventory import Inventory
+from app.models.listing import Listing
+from app.models.purchase import Purchase, PurchaseStatus
+from app.models.review import Review
+from app.models.user import User, UserRole
+from app.services.report_rollups import rebuild_report_rollups
+from app.services.reviews import rebuild_rating_stats
+
+PASSWORD = "Perf1234!"
+# fechas relativas a una base fija (no a now()) para que sea reproducible
+BASE_DATE = datetime(2024, 1, 1)
+HISTORY_DAYS = 540
+
+BRANDS = {
+    "Toyota": ["Corolla", "Hilux", "Etios", "Yaris", "SW4", "RAV4"],
+    "Volkswagen": ["Gol Trend", "Amarok", "Polo", "Vento", "Taos", "T-Cross"],
+    "Fiat": ["Cronos", "Argo", "Mobi", "Toro", "Strada", "Pulse"],
+    "Chevrolet": ["Onix", "Cruze", "Tracker", "S10", "Spin", "Equinox"],
+    "Ford": ["Ranger", "Territory", "Ka", "Focus", "Bronco", "Maverick"],
+    "Renault": ["Sandero", "Logan", "Duster", "Kangoo", "Alaskan", "Kwid"],
+    "Peugeot": ["208", "2008", "308", "3008", "Partner", "5008"],
+    "Honda": ["Civic", "HR-V", "CR-V", "Fit", "City", "WR-V"],
+}
+YEARS = range(2008, 2026)
+
+
+@dataclass(frozen=True)
+class Volumes:
+    agencies: int
+    buyers: int
+    car_models: int
+    listings: int
+    purchases: int
+    favorites: int
+    reviews: int
+
+
+PRESETS: dict[str, Volumes] = {
+    "small": Volumes(50, 2_000, 200, 5_000, 20_000, 10_000, 5_000),
+    "medium": Volumes(1_000, 100_000, 500, 100_000, 1_000_000, 500_000, 200_000),
+    "large": Volumes(
+        10_000, 1_000_000, 864, 1_000_000, 10_000_000, 5_000_000, 2_000_000
+    ),
+}
+
+
+# ---------------------------------------------------------------------------
+# Distribuciones
+# ---------------------------------------------------------------------------
+class Zipf:
+    """
+    Elige ids 1..n con probabilidad ~ 1/rank^s. El rank se permuta con el
+    rng, así los ids "populares" no son siempre los primeros.
+    """
+
+    def __init__(self, rng: random.Random, n: int, s: float = 1.1):
+        self.rng = rng
+        self.ids = list(range(1, n + 1))
+        rng.shuffle(self.ids)
+        self.cum_weights = list(
+            itertools.accumulate(1 / (rank**s) for rank in range(1, n + 1))
+        )
+        self.total = self.cum_weights[-1]
+
+    def one(self) -> int:
+        idx = bisect_left(self.cum_weights, self.rng.random() * self.total)
+        return self.ids[min(idx, len(self.ids) - 1)]
+
+    def many(self, k: int) -> list[int]:
+        return self.rng.choices(self.ids, cum_weights=self.cum_weights, k=k)
+
+
+def _split(total: int, parts: int, rng: random.Random, s: float = 1.0) -> list[int]:
+    """Reparte `total` en `parts` cantidades sesgadas (suman exactamente total)."""
+    if parts <= 0:
+        return []
+    zipf = Zipf(rng, parts, s)
+    counts = [0] * (parts + 1)
+    for i in zipf.many(total):
+        counts[i] += 1
+    return counts[1:]
+
+
+def _ts(rng: random.Random, not_before: datetime = BASE_DATE) -> datetime:
+    end = BASE_DATE + timedelta(days=HISTORY_DAYS)
+    span = max(int((end - not_before).total_seconds()), 1)
+    return not_before + timedelta(seconds=rng.randrange(span))
+
+
+def _batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(rows)
+    while batch := list(itertools.islice(it, size)):
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# Generadores de filas (ids explícitos: las FK se calculan sin releer la BD)
+# ---------------------------------------------------------------------------
+class _State:
+    """Lo que las tablas siguientes necesitan de las anteriores."""
+
+    def __init__(self) -> None:
+        self.first_buyer_id = 0
+        self.car_models: list[tuple[str, str]] = []  # índice = id - 1
+        self.agency_inventory: dict[int, list[int]] = {}
+        self.listing_price: list[float] = [0.0]  # índice = id
+        self.listing_created: list[datetime] = [BASE_DATE]
+
+
+def _agencies(vol: Volumes, rng: random.Random) -> Iterator[dict]:
+    for i in range(1, vol.agencies + 1):
+        name = "Agencia Perf CTA" if i == 1 else f"Agencia Perf {i:05d}"
+        yield {"id": i, "name": name, "created_at": _ts(rng)}
+
+
+def _users(
+    vol: Volumes, st: _State, rng: random.Random, password_hash: str
+) -> Iterator[dict]:
+    def user(uid: int, email: str, role: UserRole, agency_id=None) -> dict:
+        created = _ts(rng)
+        return {
+            "id": uid,
+            "email": email,
+            "password_hash": password_hash,
+            "role": role,
+            "is_active": True,
+            "version": 1,
+            "agency_id": agency_id,
+            "created_at": created,
+            "updated_at": created,
+        }
+
+    uid = 1
+    yield user(uid, "admin_perf@cta.com", UserRole.admin)
+    # un usuario por agencia (uq_user_agency_role)
+    for agency_id in range(1, vol.agencies + 1):
+        uid += 1
+        email = (
+            "agency_perf@cta.com"
+            if agency_id == 1
+            else f"agency{agency_id:05d}@perf.cta"
+        )
+        yield user(uid, email, UserRole.agency, agency_id)
+    st.first_buyer_id = uid + 1
+    for n in range(1, vol.buyers + 1):
+        uid += 1
+        email = "buyer_perf@cta.com" if n == 1 else f"buyer{n:07d}@perf.cta"
+        yield user(uid, email, UserRole.buyer)
+
+
+def _car_models(vol: Volumes, st: _State) -> Iterator[dict]:
+    # año por año: cualquier prefijo (car_models < total) tiene todas las marcas
+    combos = [
+        (brand, model, year)
+        for year in sorted(YEARS, reverse=True)
+        for brand, models in BRANDS.items()
+        for model in models
+    ]
+    for i, (brand, model, year) in enumerate(combos[: vol.car_models], 1):
+        st.car_models.append((brand, model))
+        yield {"id": i, "brand": brand, "model": model, "year": year}
+
+
+def _inventory(vol: Volumes, st: _State, rng: random.Random) -> Iterator[dict]:
+    models = Zipf(rng, len(st.car_models))
+    inv_id = 0
+    for agency_id in range(1, vol.agencies + 1):
+        # catálogo de 3..30 modelos por agencia, sesgado a los populares
+        wanted = min(rng.randint(3, 30), len(st.car_models))
+        catalog: list[int] = []
+        seen: set[int] = set()
+        while len(catalog) < wanted:
+            cm = models.one()
+            if cm not in seen:
+                seen.add(cm)
+                catalog.append(cm)
+        st.agency_inventory[agency_id] = catalog
+        for cm in catalog:
+            inv_id += 1
+            yield {
+                "id": inv_id,
+                "agency_id": agency_id,
+                "car_model_id": cm,
+                "quantity": rng.randint(0, 50),
+                "is_used": rng.random() < 0.3,
+            }
+
+
+def _listings(vol: Volumes, st: _State, rng: random.Random) -> Iterator[dict]:
+    agencies = Zipf(rng, vol.agencies)
+    for listing_id in range(1, vol.listings + 1):
+        agency_id = agencies.one()
+        catalog = st.agency_inventory[agency_id]
+        # dentro del catálogo de la agencia, los primeros salen más
+        cm = catalog[min(int(rng.expovariate(0.4)), len(catalog) - 1)]
+        brand, model = st.car_models[cm - 1]
+        price = round(rng.lognormvariate(10, 0.5), 2)
+        created = _ts(rng)
+        st.listing_price.append(price)
+        st.listing_created.append(created)
+        yield {
+            "id": listing_id,
+            "agency_id": agency_id,
+            "car_model_id": cm,
+            "brand": brand,
+            "model": model,
+            "current_price_amount": price,
+            "current_price_currency": "USD",
+            "stock": rng.randint(1, 20),
+            "seller_notes": None,
+            "expires_on": None,
+            "created_at": created,
+            "is_active": rng.random() < 0.95,
+        }
+
+
+def _purchases(vol: Volumes, st: _State, rng: random.Random) -> Iterator[dict]:
+    buyers = Zipf(rng, vol.buyers, s=0.8)
+    listings = Zipf(rng, vol.listings)
+    for purchase_id in range(1, vol.purchases + 1):
+        listing_id = listings.one()
+        yield {
+            "id": purchase_id,
+            "buyer_id": st.first_buyer_id + buyers.one() - 1,
+            "listing_id": listing_id,
+            "unit_price_amount": st.listing_price[listing_id],
+            "unit_price_currency": "USD",
+            "quantity": 1 if rng.random() < 0.85 else rng.randint(2, 3),
+            "status": (
+                PurchaseStatus.COMPLETED
+                if rng.random() < 0.95
+                else PurchaseStatus.CANCELLED
+            ),
+            "created_at": _ts(rng, st.listing_created[listing_id]),
+        }
+
+
+def _favorites(vol: Volumes, st: _State, rng: random.Random) -> Iterator[dict]:
+    listings = Zipf(rng, vol.listings)
+    per_buyer = _split(vol.favorites, vol.buyers, rng, s=0.9)
+    fav_id = 0
+    for n, count in enumerate(per_buyer):
+        # (customer, listing) es único: se deduplica por comprador
+        chosen: set[int] = set()
+        count = min(count, vol.listings)
+        while len(chosen) < count:
+            chosen.add(listings.one())
+        for listing_id in sorted(chosen):
+            fav_id += 1
+            yield {
+                "id": fav_id,
+                "customer_id": st.first_buyer_id + n,
+                "listing_id": listing_id,
+                "created_at": _ts(rng, st.listing_created[listing_id]),
+            }
+
+
+def _reviews(vol: Volumes, st: _State, rng: random.Random) -> Iterator[dict]:
+    models = Zipf(rng, len(st.car_models))
+    authors = Zipf(rng, vol.buyers, s=0.8)
+    for review_id in range(1, vol.reviews + 1):
+        yield {
+            "id": review_id,
+            "car_model_id": models.one(),
+            "author_id": st.first_buyer_id + authors.one() - 1,
+            "rating": rng.choices((1, 2, 3, 4, 5), weights=(5, 7, 15, 35, 38))[0],
+            "comment": None,
+            "created_at": _ts(rng),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Carga
+# ---------------------------------------------------------------------------
+def _load(engine: Engine, model, rows: Iterable[dict], batch_size: int) -> int:
+    table = model.__table__
+    total = 0
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        is_mysql = conn.dialect.name == "mysql"
+        if is_mysql:
+            # datos generados consistentes: no hace falta validar cada fila
+            conn.exec_driver_sql("SET FOREIGN_KEY_CHECKS=0, UNIQUE_CHECKS=0")
+        try:
+            for batch in _batched(rows, batch_size):
+                conn.execute(table.insert(), batch)
+                conn.commit()
+                total += len(batch)
+        finally:
+            if is_mysql:
+                # la conexión vuelve al pool: nunca con los chequeos apagados
+                conn.rollback()
+                conn.exec_driver_sql("SET FOREIGN_KEY_CHECKS=1, UNIQUE_CHECKS=1")
+    elapsed = time.perf_counter() - started
+    print(f"  {table.name:<12} {total:>11,} filas en {elapsed:7.1f}s")
+    return total
+
+
+def generate(
+    engine: Engine,
+    volumes: Volumes,
+    seed: int = 42,
+    batch_size: int = 5_000,
+    reset: bool = True,
+) -> dict[str, int]:
+    """Carga los volúmenes pedidos y recalcula agregados/rollups."""
+    if reset:
+        reset_schema(engine)
+
+    rng = random.Random(seed)
+    st = _State()
+    password_hash = hash_password(PASSWORD)  # un solo bcrypt para todos
+
+    counts = {
+        "agencies": _load(engine, Agency, _agencies(volumes, rng), batch_size),
+        "users": _load(
+            engine, User, _users(volumes, st, rng, password_hash), batch_size
+        ),
+        "car_models": _load(engine, CarModel, _car_models(volumes, st), batch_size),
+        "inventory": _load(engine, Inventory, _inventory(volumes, st, rng), batch_size),
+        "listings": _load(engine, Listing, _listings(volumes, st, rng), batch_size),
+        "purchases": _load(engine, Purchase, _purchases(volumes, st, rng), batch_size),
+        "favorites": _load(engine, Favorite, _favorites(volumes, st, rng), batch_size),
+        "reviews": _load(engine, Review, _reviews(volumes, st, rng), batch_size),
+    }
+
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        rebuild_rating_stats(db)
+        rebuild_report_rollups(db)
+    return counts
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    for field in Volumes.__dataclass_fields__:
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, dest=field)
+    return parser.parse_args(argv)
+
+
+def run(argv=None):
+    args = _parse_args(argv)
+    overrides = {
+        k: v for k, v in vars(args).items() if k in Volumes.__dataclass_fields__
+    }
+    volumes = replace(
+        PRESETS[args.preset], **{k: v for k, v in overrides.items() if v is not None}
+    )
+    print(f"Generando datos PERF (seed={args.seed}): {asdict(volumes)}")
+    started = time.perf_counter()
+    generate(get_engine(), volumes, seed=args.seed, batch_size=args.batch_size)
+    print(f"Listo en {time.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    run()
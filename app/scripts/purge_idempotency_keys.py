@@ -0,0 +1,36 @@
+"""
+Borra las Idempotency-Key de compras más viejas que
+IDEMPOTENCY_KEY_TTL_HOURS (correrlo periódicamente, p. ej. por cron).
+
+Uso:
+    python -m app.scripts.purge_idempotency_keys
+"""
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.session import get_engine
+from app.services.purchases import purge_expired_idempotency_keys
+
+
+def run():
+    engine = get_engine()
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+
+    try:
+        deleted = purge_expired_idempotency_keys(db)
+        print(
+            f"Idempotency-Key borradas: {deleted} "
+            f"(más viejas que {settings.IDEMPOTENCY_KEY_TTL_HOURS} h)."
+        )
+    except Exception as e:
+        db.rollback()
+        print("Error en purge_idempotency_keys:", e)
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,47 @@
+"""
+Backfill / reparación de los agregados de reseñas en car_models
+(reviews_count, rating_sum).
+
+Uso:
+    python -m app.scripts.rebuild_rating_stats
+"""
+
+from sqlalchemy.orm import sessionmaker
+
+from app.db.columns import ensure_columns
+from app.db.session import get_engine
+from app.services.reviews import rebuild_rating_stats
+
+STATS_COLUMNS = ("reviews_count", "rating_sum")
+
+
+def ensure_stats_columns(engine) -> None:
+    added = ensure_columns(
+        engine,
+        "car_models",
+        {name: "INTEGER NOT NULL DEFAULT 0" for name in STATS_COLUMNS},
+    )
+    for name in added:
+        print(f"Columna car_models.{name} agregada.")
+
+
+def run():
+    engine = get_engine()
+    ensure_stats_columns(engine)
+
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+
+    try:
+        updated = rebuild_rating_stats(db)
+        print(f"Agregados de reseñas recalculados para {updated} CarModels.")
+    except Exception as e:
+        db.rollback()
+        print("Error en rebuild_rating_stats:", e)
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run()
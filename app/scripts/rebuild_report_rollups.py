@@ -0,0 +1,44 @@
+"""
+Job de rollup de reportes: recalcula las tablas daily_* a partir de
+purchases / favorites.
+
+Uso:
+    python -m app.scripts.rebuild_report_rollups                # todo
+    python -m app.scripts.rebuild_report_rollups 2025-01-01     # desde
+    python -m app.scripts.rebuild_report_rollups 2025-01-01 2025-01-31
+"""
+
+import sys
+from datetime import date
+
+from sqlalchemy.orm import sessionmaker
+
+from app.db.migrate import run_migrations
+from app.db.session import get_engine
+from app.services.report_rollups import rebuild_report_rollups
+
+
+def run(date_from: date | None = None, date_to: date | None = None):
+    engine = get_engine()
+    # crea las tablas de rollup si la BD es anterior a ellas
+    run_migrations(engine)
+
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+
+    try:
+        rebuild_report_rollups(db, date_from=date_from, date_to=date_to)
+        print(
+            f"Rollups de reportes recalculados ({date_from or '-'} → {date_to or '-'})."
+        )
+    except Exception as e:
+        db.rollback()
+        print("Error en rebuild_report_rollups:", e)
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    args = [date.fromisoformat(a) for a in sys.argv[1:3]]
+    run(*args)
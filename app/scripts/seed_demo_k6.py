@@ -1,7 +1,7 @@
 from sqlalchemy.orm import sessionmaker
 
 from app.db.session import get_engine
-from app.db.base import Base
+from app.db.migrate import reset_schema
 from app.models.user import User, UserRole
 from app.models.agency import Agency
 from app.models.car_model import CarModel
@@ -9,12 +9,6 @@ from app.models.listing import Listing
 from app.core.security import hash_password
 
 
-def reset_database(engine):
-
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-
-
 def get_or_create_carmodel(db, brand: str, model: str) -> CarModel:
     cm = (
         db.query(CarModel)
@@ -52,7 +46,7 @@ def get_or_create_user(db, email: str, role: UserRole, password: str, agency_id=
 
 def run():
     engine = get_engine()
-    reset_database(engine)
+    reset_schema(engine)
 
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = SessionLocal()
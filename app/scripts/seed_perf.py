@@ -1,18 +1,13 @@
 from sqlalchemy.orm import sessionmaker
 
 from app.db.session import get_engine
-from app.db.base import Base
+from app.db.migrate import reset_schema
 from app.models.user import User, UserRole
 from app.models.agency import Agency
 from app.models.car_model import CarModel
 from app.core.security import hash_password
 
 
-def reset_database(engine):
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-
-
 def create_perf_car_models(db):
 
     base_models = [
@@ -57,7 +52,7 @@ def run():
     engine = get_engine()
 
     # Opcional: si querés que cta_perf se resetee siempre:
-    reset_database(engine)
+    reset_schema(engine)
 
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = SessionLocal()
@@ -6,6 +6,7 @@ from app.models.favorite import Favorite
 from app.models.listing import Listing
 from app.models.user import User
 from app.schemas.admin_favorites import AdminFavoriteOut, PaginatedAdminFavoritesOut
+from app.services.search import text_search_clause
 
 
 def list_favorites(
@@ -20,7 +21,15 @@ def list_favorites(
         page_size = 20
 
     query = (
-        db.query(Favorite, Listing, User)
+        db.query(
+            Favorite.id,
+            Favorite.listing_id,
+            User.id.label("customer_id"),
+            User.email.label("customer_email"),
+            Listing.brand,
+            Listing.model,
+            Favorite.created_at,
+        )
         .join(Listing, Favorite.listing_id == Listing.id)
         .join(User, Favorite.customer_id == User.id)
     )
@@ -28,9 +37,7 @@ def list_favorites(
     if q:
         like = f"%{q}%"
         query = query.filter(
-            (User.email.ilike(like))
-            | (Listing.brand.ilike(like))
-            | (Listing.model.ilike(like))
+            (User.email.ilike(like)) | text_search_clause(db, Listing, q)
         )
 
     total = query.count()
@@ -41,21 +48,20 @@ def list_favorites(
         query.order_by(Favorite.created_at.desc()).offset(offset).limit(page_size).all()
     )
 
-    items: list[AdminFavoriteOut] = []
-    for fav, listing, user in rows:
-        items.append(
-            AdminFavoriteOut(
-                id=fav.id,
-                listing_id=listing.id,
-                customer_id=user.id,
-                customer_email=user.email,
-                brand=listing.brand,
-                model=listing.model,
-                created_at=fav.created_at,
-            )
+    items = [
+        AdminFavoriteOut.model_construct(
+            id=row.id,
+            listing_id=row.listing_id,
+            customer_id=row.customer_id,
+            customer_email=row.customer_email,
+            brand=row.brand,
+            model=row.model,
+            created_at=row.created_at,
         )
+        for row in rows
+    ]
 
-    return PaginatedAdminFavoritesOut(
+    return PaginatedAdminFavoritesOut.model_construct(
         items=items,
         total=total,
         page=page,
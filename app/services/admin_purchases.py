@@ -9,6 +9,7 @@ from app.models.listing import Listing
 from app.models.user import User
 from app.models.agency import Agency
 from app.schemas.admin_purchases import AdminPurchaseOut, PaginatedAdminPurchasesOut
+from app.services.search import text_search_clause
 
 
 def list_purchases_for_admin(
@@ -23,7 +24,21 @@ def list_purchases_for_admin(
 
     # Query base
     query = (
-        db.query(Purchase, Listing, User, Agency)
+        db.query(
+            Purchase.id,
+            Purchase.listing_id,
+            Purchase.buyer_id,
+            User.email.label("buyer_email"),
+            Agency.id.label("agency_id"),
+            Agency.name.label("agency_name"),
+            Listing.brand,
+            Listing.model,
+            Purchase.unit_price_amount,
+            Purchase.unit_price_currency,
+            Purchase.quantity,
+            Purchase.status,
+            Purchase.created_at,
+        )
         .join(Listing, Purchase.listing_id == Listing.id)
         .join(User, Purchase.buyer_id == User.id)
         .join(Agency, Listing.agency_id == Agency.id)
@@ -44,8 +59,7 @@ def list_purchases_for_admin(
         like = f"%{q}%"
         query = query.filter(
             (User.email.ilike(like))
-            | (Listing.brand.ilike(like))
-            | (Listing.model.ilike(like))
+            | text_search_clause(db, Listing, q)
             | (Agency.name.ilike(like))
         )
 
@@ -65,29 +79,29 @@ def list_purchases_for_admin(
 
     items: list[AdminPurchaseOut] = []
 
-    for purchase, listing, buyer, agency in rows:
-        total_amount = float(purchase.unit_price_amount) * purchase.quantity
+    for row in rows:
+        unit_price = float(row.unit_price_amount)
 
         items.append(
-            AdminPurchaseOut(
-                id=purchase.id,
-                listing_id=purchase.listing_id,
-                buyer_id=purchase.buyer_id,
-                buyer_email=buyer.email,
-                agency_id=agency.id,
-                agency_name=agency.name,
-                brand=listing.brand,
-                model=listing.model,
-                unit_price_amount=float(purchase.unit_price_amount),
-                unit_price_currency=purchase.unit_price_currency,
-                quantity=purchase.quantity,
-                total_amount=total_amount,
-                status=purchase.status,
-                created_at=purchase.created_at,
+            AdminPurchaseOut.model_construct(
+                id=row.id,
+                listing_id=row.listing_id,
+                buyer_id=row.buyer_id,
+                buyer_email=row.buyer_email,
+                agency_id=row.agency_id,
+                agency_name=row.agency_name,
+                brand=row.brand,
+                model=row.model,
+                unit_price_amount=unit_price,
+                unit_price_currency=row.unit_price_currency,
+                quantity=row.quantity,
+                total_amount=unit_price * row.quantity,
+                status=row.status,
+                created_at=row.created_at,
             )
         )
 
-    return PaginatedAdminPurchasesOut(
+    return PaginatedAdminPurchasesOut.model_construct(
         items=items,
         total=total,
         page=page,
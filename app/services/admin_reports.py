@@ -1,18 +1,97 @@
-from datetime import date, datetime, timedelta
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from typing import Optional, List, Dict
 
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session, sessionmaker
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
+
+from app.core.config import settings
+from app.db.session import get_sessionmaker, may_lag_behind
 
 from app.models.agency import Agency
-from app.models.favorite import Favorite
-from app.models.purchase import Purchase, PurchaseStatus
-from app.models.listing import Listing
 from app.models.car_model import CarModel
+from app.models.listing import Listing
+from app.models.report_rollup import (
+    DailyAgencySales,
+    DailyBuyerPurchases,
+    DailyCarModelSales,
+    DailyFavorites,
+)
 from app.models.user import User
-from app.schemas.reports import TopAgencyOut, TopBuyerOut, TopFavoriteCarOut
+from app.schemas.reports import (
+    AdminDashboardOut,
+    TopAgencyOut,
+    TopBuyerOut,
+    TopFavoriteCarOut,
+)
+from app.services.report_rollups import reports_cache
+
+# Los reportes leen los rollups diarios (app/services/report_rollups.py):
+# un rango de fechas se resuelve sumando días, no escaneando compras.
+# Además cada resultado queda en `reports_cache` (TTL configurable) hasta que
+# una compra / favorito commitea cambios en los rollups; los misses que caen
+# dentro del lag de réplica tolerado se calculan en el primario.
+
+
+def _as_day(value: date | datetime | None) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _filter_days(
+    query: Query,
+    day_column,
+    date_from: date | datetime | None,
+    date_to: date | datetime | None,
+) -> Query:
+    """Rango de días inclusivo en ambos extremos."""
+    day_from = _as_day(date_from)
+    day_to = _as_day(date_to)
+    if day_from is not None:
+        query = query.filter(day_column >= day_from)
+    if day_to is not None:
+        query = query.filter(day_column <= day_to)
+    return query
+
+
+def _cached_report(name: str):
+    """
+    Cachea el reporte por parámetros normalizados: los datetimes se llevan a
+    día (el rollup no tiene más resolución), así "hoy 10:00" y "hoy 10:05"
+    comparten entrada.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(
+            db: Session,
+            date_from: date | datetime | None,
+            date_to: date | datetime | None,
+            limit: int = 5,
+        ):
+            def compute():
+                # recién invalidado, una réplica atrasada cachearía el
+                # reporte de antes del commit durante todo el TTL
+                if not reports_cache.enabled or not may_lag_behind(
+                    db, reports_cache.invalidated_at
+                ):
+                    return fn(db, date_from, date_to, limit)
+                with get_sessionmaker()() as primary:
+                    return fn(primary, date_from, date_to, limit)
+
+            key = (name, _as_day(date_from), _as_day(date_to), limit)
+            return reports_cache.get_or_set(key, compute)
 
+        return wrapper
 
+    return decorator
+
+
+@_cached_report("top_sold_cars")
 def top_sold_cars(
     db: Session,
     date_from: Optional[date],
@@ -20,29 +99,21 @@ def top_sold_cars(
     limit: int = 5,
 ) -> List[Dict]:
 
-    query = (
-        db.query(
-            CarModel.brand.label("brand"),
-            CarModel.model.label("model"),
-            func.sum(Purchase.quantity).label("units_sold"),
-            func.sum(Purchase.unit_price_amount * Purchase.quantity).label(
-                "total_amount"
-            ),
-        )
-        .join(Listing, Listing.id == Purchase.listing_id)
-        .join(CarModel, CarModel.id == Listing.car_model_id)
-        .filter(Purchase.status == PurchaseStatus.COMPLETED)
-    )
-
-    if date_from:
-        query = query.filter(Purchase.created_at >= date_from)
+    units_expr = func.sum(DailyCarModelSales.units_sold)
+    amount_expr = func.sum(DailyCarModelSales.total_amount)
 
-    if date_to:
-        query = query.filter(Purchase.created_at < date_to + timedelta(days=1))
+    query = db.query(
+        CarModel.brand.label("brand"),
+        CarModel.model.label("model"),
+        units_expr.label("units_sold"),
+        amount_expr.label("total_amount"),
+    ).join(CarModel, CarModel.id == DailyCarModelSales.car_model_id)
+    query = _filter_days(query, DailyCarModelSales.day, date_from, date_to)
 
     rows = (
         query.group_by(CarModel.id, CarModel.brand, CarModel.model)
-        .order_by(func.sum(Purchase.quantity).desc())
+        .having(units_expr > 0)
+        .order_by(units_expr.desc())
         .limit(limit)
         .all()
     )
@@ -61,6 +132,7 @@ def top_sold_cars(
     return result
 
 
+@_cached_report("top_favorites")
 def get_top_favorites(
     db: Session,
     date_from: datetime | None,
@@ -69,23 +141,22 @@ def get_top_favorites(
 ) -> list[TopFavoriteCarOut]:
     """
     Top de autos (brand + model) con más favoritos.
-    El rango de fechas se aplica sobre Favorite.created_at.
+    El rango de fechas se aplica sobre el día de Favorite.created_at.
     """
+    count_expr = func.sum(DailyFavorites.favorites_count)
 
+    # el rollup va por listing: brand/model se toman de la listing al leer
     query = db.query(
         Listing.brand.label("brand"),
         Listing.model.label("model"),
-        func.count(Favorite.id).label("favorites_count"),
-    ).join(Listing, Favorite.listing_id == Listing.id)
-
-    if date_from is not None:
-        query = query.filter(Favorite.created_at >= date_from)
-    if date_to is not None:
-        query = query.filter(Favorite.created_at <= date_to)
+        count_expr.label("favorites_count"),
+    ).join(Listing, Listing.id == DailyFavorites.listing_id)
+    query = _filter_days(query, DailyFavorites.day, date_from, date_to)
 
     query = (
         query.group_by(Listing.brand, Listing.model)
-        .order_by(func.count(Favorite.id).desc())
+        .having(count_expr > 0)
+        .order_by(count_expr.desc())
         .limit(limit)
     )
 
@@ -101,6 +172,7 @@ def get_top_favorites(
     ]
 
 
+@_cached_report("top_buyers")
 def get_top_buyers(
     db: Session,
     date_from: datetime | None,
@@ -108,28 +180,21 @@ def get_top_buyers(
     limit: int = 5,
 ) -> list[TopBuyerOut]:
 
-    query = (
-        db.query(
-            User.id.label("buyer_id"),
-            User.email.label("email"),
-            func.count(Purchase.id).label("purchases_count"),
-            func.sum(Purchase.unit_price_amount * Purchase.quantity).label(
-                "total_spent"
-            ),
-            func.max(Purchase.created_at).label("last_purchase_at"),
-        )
-        .join(User, Purchase.buyer_id == User.id)
-        .filter(Purchase.status == PurchaseStatus.COMPLETED)
-    )
+    count_expr = func.sum(DailyBuyerPurchases.purchases_count)
 
-    if date_from is not None:
-        query = query.filter(Purchase.created_at >= date_from)
-    if date_to is not None:
-        query = query.filter(Purchase.created_at <= date_to)
+    query = db.query(
+        User.id.label("buyer_id"),
+        User.email.label("email"),
+        count_expr.label("purchases_count"),
+        func.sum(DailyBuyerPurchases.total_spent).label("total_spent"),
+        func.max(DailyBuyerPurchases.last_purchase_at).label("last_purchase_at"),
+    ).join(User, DailyBuyerPurchases.buyer_id == User.id)
+    query = _filter_days(query, DailyBuyerPurchases.day, date_from, date_to)
 
     query = (
         query.group_by(User.id, User.email)
-        .order_by(func.count(Purchase.id).desc())
+        .having(count_expr > 0)
+        .order_by(count_expr.desc())
         .limit(limit)
     )
 
@@ -147,6 +212,7 @@ def get_top_buyers(
     ]
 
 
+@_cached_report("top_agencies")
 def get_top_agencies(
     db: Session,
     date_from: datetime | None,
@@ -154,28 +220,20 @@ def get_top_agencies(
     limit: int = 5,
 ) -> list[TopAgencyOut]:
 
-    query = (
-        db.query(
-            Agency.id.label("agency_id"),
-            Agency.name.label("agency_name"),
-            func.count(Purchase.id).label("sales_count"),
-            func.sum(Purchase.unit_price_amount * Purchase.quantity).label(
-                "total_amount"
-            ),
-        )
-        .join(Listing, Listing.agency_id == Agency.id)
-        .join(Purchase, Purchase.listing_id == Listing.id)
-        .filter(Purchase.status == PurchaseStatus.COMPLETED)
-    )
+    count_expr = func.sum(DailyAgencySales.sales_count)
 
-    if date_from is not None:
-        query = query.filter(Purchase.created_at >= date_from)
-    if date_to is not None:
-        query = query.filter(Purchase.created_at <= date_to)
+    query = db.query(
+        Agency.id.label("agency_id"),
+        Agency.name.label("agency_name"),
+        count_expr.label("sales_count"),
+        func.sum(DailyAgencySales.total_amount).label("total_amount"),
+    ).join(Agency, DailyAgencySales.agency_id == Agency.id)
+    query = _filter_days(query, DailyAgencySales.day, date_from, date_to)
 
     query = (
         query.group_by(Agency.id, Agency.name)
-        .order_by(func.count(Purchase.id).desc())
+        .having(count_expr > 0)
+        .order_by(count_expr.desc())
         .limit(limit)
     )
 
@@ -190,3 +248,57 @@ def get_top_agencies(
         )
         for row in rows
     ]
+
+
+# Pool propio (no el threadpool de anyio donde ya corre el endpoint: si
+# estuviera saturado, las tareas del dashboard esperarían a su propio caller).
+_dashboard_executor = ThreadPoolExecutor(
+    max_workers=max(settings.REPORTS_DASHBOARD_WORKERS, 1),
+    thread_name_prefix="admin-dashboard",
+)
+
+
+def _shares_single_connection(session_factory: sessionmaker) -> bool:
+    """Pools de una sola conexión (SQLite en memoria): no hay paralelismo real."""
+    bind = session_factory.kw.get("bind")
+    pool = getattr(bind, "pool", None)
+    return isinstance(pool, (StaticPool, SingletonThreadPool))
+
+
+def get_admin_dashboard(
+    session_factory: sessionmaker,
+    date_from: date | datetime | None,
+    date_to: date | datetime | None,
+    limit: int = 5,
+) -> AdminDashboardOut:
+    """
+    Los cuatro reportes en un solo payload. Cada uno corre en su propia
+    sesión (y conexión del pool) en paralelo, así el total tarda lo que la
+    consulta más lenta.
+    """
+    reports = {
+        "top_sold_cars": top_sold_cars,
+        "top_buyers": get_top_buyers,
+        "top_favorites": get_top_favorites,
+        "top_agencies": get_top_agencies,
+    }
+
+    if _shares_single_connection(session_factory):
+        with session_factory() as db:
+            results = {
+                name: report(db, date_from, date_to, limit)
+                for name, report in reports.items()
+            }
+        return AdminDashboardOut(**results)
+
+    def _run(report):
+        with session_factory() as db:
+            return report(db, date_from, date_to, limit)
+
+    # cada tarea corre con una copia del contexto del request (QueryStats de
+    # app/db/query_stats.py, logging) para que sus queries sumen al request
+    futures = {
+        name: _dashboard_executor.submit(contextvars.copy_context().run, _run, report)
+        for name, report in reports.items()
+    }
+    return AdminDashboardOut(**{name: f.result() for name, f in futures.items()})
@@ -9,6 +9,7 @@ from app.models.review import Review
 from app.models.user import User
 from app.models.car_model import CarModel
 from app.schemas.admin_reviews import AdminReviewOut, PaginatedAdminReviewsOut
+from app.services.search import text_search_clause
 
 
 def list_reviews(
@@ -28,7 +29,17 @@ def list_reviews(
         page_size = 20
 
     query = (
-        db.query(Review, User, CarModel)
+        db.query(
+            Review.id,
+            CarModel.id.label("car_model_id"),
+            CarModel.brand,
+            CarModel.model,
+            User.id.label("buyer_id"),
+            User.email.label("buyer_email"),
+            Review.rating,
+            Review.comment,
+            Review.created_at,
+        )
         .join(User, Review.author_id == User.id)
         .join(CarModel, Review.car_model_id == CarModel.id)
     )
@@ -38,8 +49,7 @@ def list_reviews(
         query = query.filter(
             or_(
                 User.email.ilike(like),
-                CarModel.brand.ilike(like),
-                CarModel.model.ilike(like),
+                text_search_clause(db, CarModel, q),
                 Review.comment.ilike(like),
             )
         )
@@ -65,23 +75,22 @@ def list_reviews(
         query.order_by(Review.created_at.desc()).offset(offset).limit(page_size).all()
     )
 
-    items: list[AdminReviewOut] = []
-    for review, user, car_model in rows:
-        items.append(
-            AdminReviewOut(
-                id=review.id,
-                car_model_id=car_model.id,
-                brand=car_model.brand,
-                model=car_model.model,
-                buyer_id=user.id,
-                buyer_email=user.email,
-                rating=review.rating,
-                comment=review.comment,
-                created_at=review.created_at,
-            )
+    items = [
+        AdminReviewOut.model_construct(
+            id=row.id,
+            car_model_id=row.car_model_id,
+            brand=row.brand,
+            model=row.model,
+            buyer_id=row.buyer_id,
+            buyer_email=row.buyer_email,
+            rating=row.rating,
+            comment=row.comment,
+            created_at=row.created_at,
         )
+        for row in rows
+    ]
 
-    return PaginatedAdminReviewsOut(
+    return PaginatedAdminReviewsOut.model_construct(
         items=items,
         total=total,
         page=page,
@@ -21,7 +21,14 @@ def list_users(
     if page_size < 1:
         page_size = 20
 
-    query = db.query(User, Agency).outerjoin(Agency, User.agency_id == Agency.id)
+    query = db.query(
+        User.id,
+        User.email,
+        User.role,
+        User.agency_id,
+        Agency.name.label("agency_name"),
+        User.created_at,
+    ).outerjoin(Agency, User.agency_id == Agency.id)
 
     if q:
         like = f"%{q}%"
@@ -36,20 +43,19 @@ def list_users(
 
     rows = query.order_by(User.id.asc()).offset(offset).limit(page_size).all()
 
-    items: list[AdminUserSummary] = []
-    for user, agency in rows:
-        items.append(
-            AdminUserSummary(
-                id=user.id,
-                email=user.email,
-                role=user.role,
-                agency_id=user.agency_id,
-                agency_name=agency.name if agency else None,
-                created_at=user.created_at,
-            )
+    items = [
+        AdminUserSummary.model_construct(
+            id=row.id,
+            email=row.email,
+            role=row.role,
+            agency_id=row.agency_id,
+            agency_name=row.agency_name,
+            created_at=row.created_at,
         )
+        for row in rows
+    ]
 
-    return PaginatedUsersOut(
+    return PaginatedUsersOut.model_construct(
         items=items,
         total=total,
         page=page,
@@ -1,8 +1,22 @@
+from dataclasses import dataclass
 from typing import Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User, UserRole
+from app.core.security import verify_password, verify_password_async
+
 
-from app.models.user import User
-from app.core.security import verify_password
+def _find_active_user(db: Session, email: str) -> Optional[User]:
+    user = db.query(User).filter(User.email == email).first()
+    if not user or not user.is_active:
+        return None
+    return user
 
 
 def authenticate(db: Session, email: str, password: str) -> Optional[User]:
@@ -10,9 +24,134 @@ def authenticate(db: Session, email: str, password: str) -> Optional[User]:
     Autentica por email+password.
     Devuelve el User si es válido y está activo; si no, None.
     """
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not user.is_active:
+    user = _find_active_user(db, email)
+    if not user:
         return None
     if not verify_password(password, user.password_hash):
         return None
     return user
+
+
+async def authenticate_async(db: Session, email: str, password: str) -> Optional[User]:
+    """
+    Como authenticate, para endpoints async: el SELECT va al threadpool y
+    bcrypt al pool de passwords (app/core/security.py).
+    """
+    user = await run_in_threadpool(_find_active_user, db, email)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.password_hash):
+        return None
+    return user
+
+
+# ---------------------------------------------------------------------------
+# Principal: lo mínimo para autorizar un request, cacheado por user_id
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class Principal:
+    """
+    Usuario autenticado tal como lo ven los endpoints (get_current_user).
+    No es una entidad ORM: si hace falta algo más (email, agency) hay que
+    cargar el User.
+    """
+
+    id: int
+    role: UserRole
+    agency_id: Optional[int]
+    is_active: bool
+    # User.version leído (version_id_col): ver _cache_principal
+    version: int
+
+
+principal_cache = TTLCache(
+    "principals",
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+# Última User.version commiteada por usuario. Un SELECT que empezó antes de
+# un commit puede terminar después de la invalidación: su principal (versión
+# vieja) no se guarda. Vive lo mismo que las entradas del cache.
+_committed_versions = TTLCache(
+    "principal_versions",
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+_CHANGED_USERS = "principal_changed_users"
+
+
+def _cache_principal(principal: Principal) -> None:
+    committed = _committed_versions.get(principal.id)
+    if committed is not None and principal.version < committed:
+        return
+    principal_cache.set(principal.id, principal)
+
+
+def get_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """
+    Principal del usuario desde el cache; en un miss lo lee con un SELECT de
+    columnas (sin el join a agencies de User). None si el usuario no existe
+    (eso no se cachea).
+    """
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    row = db.execute(
+        select(User.id, User.role, User.agency_id, User.is_active, User.version).where(
+            User.id == user_id
+        )
+    ).first()
+    if row is None:
+        return None
+
+    principal = Principal(
+        id=row.id,
+        role=row.role,
+        agency_id=row.agency_id,
+        is_active=bool(row.is_active),
+        version=row.version,
+    )
+    _cache_principal(principal)
+    return principal
+
+
+async def get_principal_async(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    """get_principal para AsyncSession: en un hit del cache no toca la base."""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    return await db.run_sync(get_principal, user_id)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    Para cambios que no pasan por el ORM (UPDATE/DELETE en bloque, SQL a
+    mano). Los cambios vía ORM se invalidan solos al commitear.
+    """
+    principal_cache.delete(user_id)
+
+
+@event.listens_for(User, "after_update", propagate=True)
+@event.listens_for(User, "after_delete", propagate=True)
+def _track_user_change(mapper, connection, target: User) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        # version ya es la nueva (version_id_col la sube en el UPDATE)
+        session.info.setdefault(_CHANGED_USERS, {})[target.id] = target.version
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session: Session) -> None:
+    # se invalida después del commit: antes, otro request podría volver a
+    # cachear la versión vieja
+    for user_id, version in session.info.pop(_CHANGED_USERS, {}).items():
+        _committed_versions.set(user_id, version)
+        principal_cache.delete(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_principals(session: Session) -> None:
+    session.info.pop(_CHANGED_USERS, None)
@@ -1,9 +1,9 @@
 from typing import Optional, List
 
-from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app.models.car_model import CarModel
+from app.services.search import text_search_clause
 
 
 def search_car_models(
@@ -15,12 +15,6 @@ def search_car_models(
     query = db.query(CarModel)
 
     if q:
-        like = f"%{q}%"
-        query = query.filter(
-            or_(
-                CarModel.brand.ilike(like),
-                CarModel.model.ilike(like),
-            )
-        )
+        query = query.filter(text_search_clause(db, CarModel, q))
 
     return query.order_by(CarModel.brand, CarModel.model).limit(limit).all()
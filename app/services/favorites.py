@@ -1,11 +1,15 @@
 from __future__ import annotations
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.models.favorite import Favorite
 from app.models.listing import Listing
 from app.models.user import User
-from app.schemas.favorite import FavoriteWithListingOut
+from app.schemas.favorite import CursorFavoritesOut, FavoriteWithListingOut
+from app.services import report_rollups
+from app.utils.cursor import keyset_page
 
 
 def get_favorite(db: Session, user_id: int, listing_id: int) -> Optional[Favorite]:
@@ -25,6 +29,8 @@ def add_favorite(db: Session, user_id: int, listing_id: int) -> Favorite:
     fav = Favorite(customer_id=user_id, listing_id=listing_id)
     db.add(fav)
     try:
+        db.flush()
+        report_rollups.record_favorite(db, fav.id)
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -42,12 +48,26 @@ def remove_favorite(db: Session, user_id: int, listing_id: int) -> bool:
     fav = get_favorite(db, user_id, listing_id)
     if not fav:
         return False
+    report_rollups.record_favorite(db, fav.id, sign=-1)
     db.delete(fav)
     db.commit()
     return True
 
 
-def list_favorites_for_buyer(
+def _favorite_out(row) -> FavoriteWithListingOut:
+    return FavoriteWithListingOut.model_construct(
+        favorite_id=row.favorite_id,
+        listing_id=row.listing_id,
+        brand=row.brand,
+        model=row.model,
+        agency_id=row.agency_id,
+        price=float(row.price) if row.price is not None else None,
+        currency=row.currency,
+        created_at=row.created_at,
+    )
+
+
+def _favorites_query(
     db: Session,
     buyer: User,
     brand: Optional[str] = None,
@@ -55,7 +75,7 @@ def list_favorites_for_buyer(
     agency_id: Optional[int] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
-) -> List[FavoriteWithListingOut]:
+) -> Query:
     q = (
         db.query(
             Favorite.id.label("favorite_id"),
@@ -82,20 +102,58 @@ def list_favorites_for_buyer(
     if max_price is not None:
         q = q.filter(Listing.current_price_amount <= max_price)
 
-    q = q.order_by(Favorite.created_at.desc())
+    return q.order_by(Favorite.created_at.desc(), Favorite.id.desc())
 
-    rows = q.all()
 
-    return [
-        FavoriteWithListingOut(
-            favorite_id=row.favorite_id,
-            listing_id=row.listing_id,
-            brand=row.brand,
-            model=row.model,
-            agency_id=row.agency_id,
-            price=float(row.price) if row.price is not None else None,
-            currency=row.currency,
-            created_at=row.created_at,
-        )
-        for row in rows
-    ]
+def list_favorites_for_buyer(
+    db: Session,
+    buyer: User,
+    brand: Optional[str] = None,
+    model: Optional[str] = None,
+    agency_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+) -> List[FavoriteWithListingOut]:
+    rows = _favorites_query(
+        db, buyer, brand, model, agency_id, min_price, max_price
+    ).all()
+    return [_favorite_out(row) for row in rows]
+
+
+def page_favorites_for_buyer(
+    db: Session,
+    buyer: User,
+    cursor: Optional[str] = None,
+    page_size: int = settings.HISTORY_PAGE_SIZE,
+    **filters,
+) -> CursorFavoritesOut:
+    """Una página de list_favorites_for_buyer (ver app/utils/cursor.py)."""
+    rows, next_cursor = keyset_page(
+        _favorites_query(db, buyer, **filters),
+        Favorite.created_at,
+        Favorite.id,
+        cursor,
+        page_size,
+        id_attr="favorite_id",
+    )
+    return CursorFavoritesOut.model_construct(
+        items=[_favorite_out(row) for row in rows], next_cursor=next_cursor
+    )
+
+
+async def list_favorites_for_buyer_async(
+    db: AsyncSession, buyer: User, **filters
+) -> List[FavoriteWithListingOut]:
+    """list_favorites_for_buyer sobre una AsyncSession (vía run_sync)."""
+    return await db.run_sync(
+        lambda session: list_favorites_for_buyer(session, buyer, **filters)
+    )
+
+
+async def page_favorites_for_buyer_async(
+    db: AsyncSession, buyer: User, **params
+) -> CursorFavoritesOut:
+    """page_favorites_for_buyer sobre una AsyncSession (vía run_sync)."""
+    return await db.run_sync(
+        lambda session: page_favorites_for_buyer(session, buyer, **params)
+    )
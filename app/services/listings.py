@@ -1,70 +1,512 @@
 import logging
-from typing import Optional
-from sqlalchemy import desc, func
-from sqlalchemy.orm import Session
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Union
+from sqlalchemy import and_, desc, event, exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
 from fastapi import HTTPException, status
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http_cache import weak_etag
+from app.core.responses import render_json
+from app.db.session import get_sessionmaker, may_lag_behind
 from app.models.car_model import CarModel
 from app.models.listing import Listing
 from app.models.favorite import Favorite
+from app.models.purchase import Purchase
 from app.models.review import Review
-from app.models.user import User
-from app.schemas.listing import ListingOut
+from app.models.user import User, UserRole
+from app.schemas.listing import CursorListingsOut, ListingOut
+from app.services import report_rollups
+from app.services import search as search_service
+from app.utils.cursor import decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
 
-def get_listing_for_buyer(
-    db: Session,
-    buyer: User,
-    listing_id: int,
-) -> ListingOut:
+def apply_listing_sort(query: Query, sort: Optional[str]) -> Query:
+    """
+    Orden del browse público. Siempre desempata por id para que el orden sea
+    total y el cursor (keyset) no saltee ni repita filas.
+    """
+    if sort == "price_asc":
+        return query.order_by(Listing.current_price_amount.asc(), Listing.id.asc())
+    if sort == "price_desc":
+        return query.order_by(Listing.current_price_amount.desc(), Listing.id.desc())
+    return query.order_by(Listing.id.desc())
+
+
+def apply_listing_cursor(query: Query, sort: Optional[str], cursor: str) -> Query:
+    """
+    Filtra las filas posteriores al cursor según el orden pedido:
+    WHERE (sort_key, id) > / < (cursor_key, cursor_id), expandido a OR/AND
+    para que MySQL lo resuelva como rango sobre el índice.
+    """
+    sort = sort or "newest"
+    data = decode_cursor(cursor)
+    if data.get("s") != sort:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El cursor no corresponde al orden solicitado",
+        )
 
-    logger.info(f"[service] buyer={buyer!r}, listing_id={listing_id}")
-    listing = db.get(Listing, listing_id)
-    logger.info(f"[service] listing={listing!r}")
-    if not listing:
+    try:
+        last_id = int(data["id"])
+        last_price = Decimal(str(data["k"])) if sort != "newest" else None
+    except (KeyError, TypeError, ValueError, InvalidOperation):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Listing no encontrada",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido",
         )
 
-    fav = (
-        db.query(Favorite)
+    price = Listing.current_price_amount
+    if sort == "price_asc":
+        return query.filter(
+            or_(price > last_price, and_(price == last_price, Listing.id > last_id))
+        )
+    if sort == "price_desc":
+        return query.filter(
+            or_(price < last_price, and_(price == last_price, Listing.id < last_id))
+        )
+    return query.filter(Listing.id < last_id)
+
+
+def listing_cursor_for(listing, sort: Optional[str]) -> str:
+    """
+    Cursor que apunta a la fila siguiente a `listing` (entidad o fila con id y
+    current_price_amount) en el orden `sort`.
+    """
+    sort = sort or "newest"
+    data: dict = {"s": sort, "id": listing.id}
+    if sort != "newest":
+        data["k"] = str(listing.current_price_amount)
+    return encode_cursor(data)
+
+
+# ---------------------------------------------------------------------------
+# Cache del browse
+# ---------------------------------------------------------------------------
+# Cada página se guarda tal como la ve un anónimo (is_favorite=False), junto
+# con el ETag de su contenido, con key = (versión, filtros normalizados).
+# Para un buyer se superponen sus favoritos después del hit. Crear/modificar/borrar una Listing o una Review
+# sube la versión cuando la transacción commitea: las keys viejas dejan de
+# pedirse y salen por LRU/TTL, y un cálculo que empezó antes del cambio guarda
+# su resultado bajo la versión vieja. Los UPDATE en bloque lo marcan con
+# mark_listings_changed; el stock que descuentan o devuelven las compras no:
+# se ve al vencer el TTL (si no, el cache se vaciaría con cada compra).
+# Recién subida la versión, los misses se llenan desde el primario (ver
+# _cacheable_page).
+listings_browse_cache = TTLCache(
+    "listings_browse",
+    ttl=settings.LISTINGS_CACHE_TTL_SECONDS,
+    maxsize=settings.LISTINGS_CACHE_MAX_ENTRIES,
+)
+
+_LISTINGS_CHANGED = "listings_browse_changed"
+_browse_version = 0
+_browse_changed_at = float("-inf")
+_browse_version_lock = threading.Lock()
+
+
+def mark_listings_changed(db: Session) -> None:
+    """
+    Para cambios que no pasan por el ORM (UPDATE en bloque): invalida el
+    cache del browse cuando `db` commitea.
+    """
+    db.info[_LISTINGS_CHANGED] = True
+
+
+def invalidate_browse_cache() -> None:
+    global _browse_version, _browse_changed_at
+    with _browse_version_lock:
+        _browse_version += 1
+        _browse_changed_at = time.monotonic()
+
+
+@event.listens_for(Listing, "after_insert")
+@event.listens_for(Listing, "after_update")
+@event.listens_for(Listing, "after_delete")
+@event.listens_for(Review, "after_insert")
+@event.listens_for(Review, "after_update")
+@event.listens_for(Review, "after_delete")
+def _track_listing_change(mapper, connection, target) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        mark_listings_changed(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_browse_cache(session: Session) -> None:
+    # después del commit: antes, otro request podría cachear la versión vieja
+    if session.info.pop(_LISTINGS_CHANGED, False):
+        invalidate_browse_cache()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_browse_changes(session: Session, previous_transaction) -> None:
+    # sólo la transacción de afuera: un SAVEPOINT deshecho no deshace lo
+    # que la transacción ya había cambiado
+    if previous_transaction.parent is None:
+        session.info.pop(_LISTINGS_CHANGED, None)
+
+
+def _to_int(v):
+    return None if v in (None, "", "null", "undefined") else int(v)
+
+
+def _to_float(v):
+    return None if v in (None, "", "null", "undefined") else float(v)
+
+
+def _to_text(v: Optional[str]) -> Optional[str]:
+    # la búsqueda (ILIKE / FULLTEXT / FTS5) no distingue mayúsculas
+    v = v.strip().casefold() if v else ""
+    return v or None
+
+
+def _normalize_browse_params(
+    *,
+    q: Optional[str] = None,
+    brand: Optional[str] = None,
+    model: Optional[str] = None,
+    agency_id: Optional[str] = None,
+    min_price: Optional[str] = None,
+    max_price: Optional[str] = None,
+    sort: Optional[str] = "newest",
+    page: int = 1,
+    page_size: int = 20,
+    pagination: str = "offset",
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    Parámetros del browse en forma canónica: dos requests que devuelven la
+    misma página dan el mismo dict (y la misma key de cache).
+    """
+    cursor_mode = pagination == "cursor" or bool(cursor)
+    return {
+        "q": " ".join(q.split()).casefold() if q and q.strip() else None,
+        "brand": _to_text(brand),
+        "model": _to_text(model),
+        "agency_id": _to_int(agency_id),
+        "min_price": _to_float(min_price),
+        "max_price": _to_float(max_price),
+        "sort": sort or "newest",
+        "page": None if cursor_mode else max(page, 1),
+        "page_size": max(page_size, 1) if cursor_mode else page_size,
+        "cursor_mode": cursor_mode,
+        "cursor": cursor or None,
+    }
+
+
+# columnas de ListingOut (+ agregados desnormalizados de CarModel): el browse
+# y el detalle arman la respuesta desde la tupla, sin cargar entidades
+_LISTING_OUT_COLUMNS = (
+    Listing.id,
+    Listing.agency_id,
+    Listing.brand,
+    Listing.model,
+    Listing.current_price_amount,
+    Listing.current_price_currency,
+    Listing.stock,
+    Listing.seller_notes,
+    CarModel.reviews_count,
+    CarModel.rating_sum,
+)
+
+
+def _listing_out(row, is_favorite: bool = False) -> ListingOut:
+    reviews_count = int(row.reviews_count or 0)
+    return ListingOut.model_construct(
+        id=row.id,
+        agency_id=row.agency_id,
+        brand=row.brand,
+        model=row.model,
+        current_price_amount=float(row.current_price_amount),
+        current_price_currency=row.current_price_currency,
+        stock=row.stock,
+        seller_notes=row.seller_notes,
+        is_favorite=is_favorite,
+        avg_rating=row.rating_sum / reviews_count if reviews_count else None,
+        reviews_count=reviews_count,
+    )
+
+
+def _browse_page(
+    db: Session,
+    *,
+    q: Optional[str],
+    brand: Optional[str],
+    model: Optional[str],
+    agency_id: Optional[int],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    sort: str,
+    page: Optional[int],
+    page_size: int,
+    cursor_mode: bool,
+    cursor: Optional[str],
+) -> Union[list[ListingOut], CursorListingsOut]:
+    """Una página del browse tal como la ve un anónimo (sin favoritos)."""
+    query = db.query(*_LISTING_OUT_COLUMNS).outerjoin(
+        CarModel, CarModel.id == Listing.car_model_id
+    )
+    by_relevance = sort == "relevance" and bool(q)
+    if cursor_mode and sort == "relevance":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El orden por relevancia no admite paginación por cursor",
+        )
+
+    # Filtros
+    if agency_id is not None:
+        query = query.filter(Listing.agency_id == agency_id)
+    if min_price is not None:
+        query = query.filter(Listing.current_price_amount >= min_price)
+    if max_price is not None:
+        query = query.filter(Listing.current_price_amount <= max_price)
+
+    # Búsqueda de texto (índice FULLTEXT / FTS5, ver app/services/search.py)
+    query = search_service.apply_text_search(
+        query, db, Listing, q, order_by_relevance=by_relevance
+    )
+
+    if brand:
+        query = query.filter(
+            search_service.column_search_clause(db, Listing, Listing.brand, brand)
+        )
+
+    if model:
+        query = query.filter(
+            search_service.column_search_clause(db, Listing, Listing.model, model)
+        )
+
+    # Orden
+    if not by_relevance:
+        query = apply_listing_sort(query, sort)
+
+    # Paginación
+    next_cursor: Optional[str] = None
+    if cursor_mode:
+        # Keyset: buscamos desde el cursor en vez de descartar filas con OFFSET
+        if cursor:
+            query = apply_listing_cursor(query, sort, cursor)
+        rows = query.limit(page_size + 1).all()
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = listing_cursor_for(rows[-1], sort)
+    else:
+        offset = (page - 1) * page_size
+        rows = query.offset(offset).limit(page_size).all()
+
+    result = [_listing_out(row) for row in rows]
+    if cursor_mode:
+        return CursorListingsOut.model_construct(items=result, next_cursor=next_cursor)
+    return result
+
+
+def _page_etag(page: Union[list[ListingOut], CursorListingsOut]) -> str:
+    return weak_etag(render_json(page))
+
+
+def _with_favorites(
+    db: Session,
+    buyer_id: int,
+    page: Union[list[ListingOut], CursorListingsOut],
+    etag: str,
+) -> tuple[Union[list[ListingOut], CursorListingsOut], str]:
+    """
+    Copia de `page` con is_favorite marcado para el buyer (no toca el cache).
+    El ETag sale del de la página anónima + los ids favoritos, sin serializar.
+    """
+    items = page.items if isinstance(page, CursorListingsOut) else page
+    if not items:
+        return page, etag
+
+    rows = (
+        db.query(Favorite.listing_id)
         .filter(
-            Favorite.customer_id == buyer.id,
-            Favorite.listing_id == listing_id,
+            Favorite.customer_id == buyer_id,
+            Favorite.listing_id.in_([it.id for it in items]),
         )
-        .first()
+        .all()
     )
-    is_fav = fav is not None
-
-    logger.info(f"[service] fav_exists={fav!r}")
-    avg_rating = None
-    reviews_count = 0
-
-    if listing.car_model_id is not None:
-        avg_val, count_val = (
-            db.query(
-                func.avg(Review.rating),
-                func.count(Review.id),
-            )
-            .filter(Review.car_model_id == listing.car_model_id)
-            .one()
-        )
-        if count_val:
-            avg_rating = float(avg_val)  # avg_val puede venir como Decimal
-            reviews_count = int(count_val)
-
-    # devolvemos el ListingOut enriquecido
-    return ListingOut.model_validate(listing, from_attributes=True).model_copy(
-        update={
-            "is_favorite": is_fav,
-            "avg_rating": avg_rating,
-            "reviews_count": reviews_count,
-        }
+    fav_ids = sorted(rid for (rid,) in rows)
+    if not fav_ids:
+        return page, etag
+
+    marked = [
+        it.model_copy(update={"is_favorite": True}) if it.id in fav_ids else it
+        for it in items
+    ]
+    etag = weak_etag(etag, ",".join(map(str, fav_ids)))
+    if isinstance(page, CursorListingsOut):
+        page = CursorListingsOut.model_construct(
+            items=marked, next_cursor=page.next_cursor
+        )
+        return page, etag
+    return marked, etag
+
+
+def _cacheable_page(
+    db: Session, params: dict
+) -> Union[list[ListingOut], CursorListingsOut]:
+    """
+    Con el cache activo y la versión recién subida, una página pedida sobre
+    una réplica se arma en el primario: una réplica atrasada guardaría la
+    página de antes del cambio bajo la versión nueva durante todo el TTL.
+    Pasado el lag tolerado se vuelve a leer de la réplica.
+    """
+    if not listings_browse_cache.enabled or not may_lag_behind(db, _browse_changed_at):
+        return _browse_page(db, **params)
+    with get_sessionmaker()() as primary:
+        return _browse_page(primary, **params)
+
+
+def _browse_key(params: dict) -> tuple:
+    return (_browse_version, *params.values())
+
+
+def browse_listings_with_etag(
+    db: Session,
+    *,
+    viewer: Optional[User] = None,
+    q: Optional[str] = None,
+    brand: Optional[str] = None,
+    model: Optional[str] = None,
+    agency_id: Optional[str] = None,
+    min_price: Optional[str] = None,
+    max_price: Optional[str] = None,
+    sort: Optional[str] = "newest",
+    page: int = 1,
+    page_size: int = 20,
+    pagination: str = "offset",
+    cursor: Optional[str] = None,
+) -> tuple[Union[list[ListingOut], CursorListingsOut], str]:
+    """
+    Browse público de ofertas (GET /listings) y su ETag. `viewer` es el
+    usuario logueado si lo hay: para un buyer se marca is_favorite. La página
+    (y el hash de su contenido) sale de `listings_browse_cache` si está, así
+    que un 304 no necesita serializar nada.
+    """
+    params = _normalize_browse_params(
+        q=q,
+        brand=brand,
+        model=model,
+        agency_id=agency_id,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort,
+        page=page,
+        page_size=page_size,
+        pagination=pagination,
+        cursor=cursor,
     )
 
+    def compute():
+        result = _cacheable_page(db, params)
+        return result, _page_etag(result)
+
+    result, etag = listings_browse_cache.get_or_set(_browse_key(params), compute)
+
+    if viewer and viewer.role == UserRole.buyer:
+        result, etag = _with_favorites(db, viewer.id, result, etag)
+    return result, etag
+
+
+def browse_listings(
+    db: Session, **params
+) -> Union[list[ListingOut], CursorListingsOut]:
+    """browse_listings_with_etag sin el ETag."""
+    return browse_listings_with_etag(db, **params)[0]
+
+
+async def browse_listings_with_etag_async(
+    db: AsyncSession, *, viewer: Optional[User] = None, **params
+) -> tuple[Union[list[ListingOut], CursorListingsOut], str]:
+    """
+    browse_listings_with_etag sobre una AsyncSession: las mismas consultas
+    (Query ORM) corren vía run_sync sobre la conexión async, sin ocupar un
+    hilo del threadpool. El cache se consulta afuera, con get_or_set_async:
+    run_sync corre en el hilo del loop y esperar ahí a otro request que
+    calcula la misma key lo dejaría trabado.
+    """
+    params = _normalize_browse_params(**params)
+
+    async def compute():
+        result = await db.run_sync(lambda session: _cacheable_page(session, params))
+        return result, _page_etag(result)
+
+    result, etag = await listings_browse_cache.get_or_set_async(
+        _browse_key(params), compute
+    )
+
+    if viewer and viewer.role == UserRole.buyer:
+        result, etag = await db.run_sync(
+            lambda session: _with_favorites(session, viewer.id, result, etag)
+        )
+    return result, etag
+
+
+async def browse_listings_async(
+    db: AsyncSession, **params
+) -> Union[list[ListingOut], CursorListingsOut]:
+    """browse_listings_with_etag_async sin el ETag."""
+    return (await browse_listings_with_etag_async(db, **params))[0]
+
+
+def _listing_detail_stmt(buyer_id: int, listing_id: int):
+    is_favorite = (
+        exists()
+        .where(
+            Favorite.customer_id == buyer_id,
+            Favorite.listing_id == Listing.id,
+        )
+        .label("is_favorite")
+    )
+
+    return (
+        select(*_LISTING_OUT_COLUMNS, is_favorite)
+        .outerjoin(CarModel, CarModel.id == Listing.car_model_id)
+        .where(Listing.id == listing_id)
+    )
+
+
+def _listing_detail_out(row) -> ListingOut:
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Listing no encontrada",
+        )
+    return _listing_out(row, is_favorite=bool(row.is_favorite))
+
+
+def get_listing_for_buyer(
+    db: Session,
+    buyer: User,
+    listing_id: int,
+) -> ListingOut:
+    """
+    Detalle de una oferta para un comprador en un único SELECT:
+    columnas de la listing + EXISTS(favorito) + agregados de CarModel.
+    """
+    logger.debug("[service] buyer_id=%s, listing_id=%s", buyer.id, listing_id)
+    row = db.execute(_listing_detail_stmt(buyer.id, listing_id)).first()
+    return _listing_detail_out(row)
+
+
+async def get_listing_for_buyer_async(
+    db: AsyncSession,
+    buyer: User,
+    listing_id: int,
+) -> ListingOut:
+    """Como get_listing_for_buyer, con el mismo SELECT sobre una AsyncSession."""
+    logger.debug("[service] buyer_id=%s, listing_id=%s", buyer.id, listing_id)
+    row = (await db.execute(_listing_detail_stmt(buyer.id, listing_id))).first()
+    return _listing_detail_out(row)
+
 
 def list_my_agency_listings(
     db: Session,
@@ -84,7 +526,17 @@ def list_my_agency_listings(
         page_size = 10
 
     query = (
-        db.query(Listing, CarModel)
+        db.query(
+            Listing.id,
+            Listing.car_model_id,
+            Listing.current_price_amount,
+            Listing.current_price_currency,
+            Listing.stock,
+            Listing.is_active,
+            Listing.created_at,
+            CarModel.brand,
+            CarModel.model,
+        )
         .join(CarModel, Listing.car_model_id == CarModel.id)
         .filter(Listing.agency_id == agency_id)
     )
@@ -123,21 +575,20 @@ def list_my_agency_listings(
 
     rows = query.offset(offset).limit(page_size).all()
 
-    items = []
-    for listing, car_model in rows:
-        items.append(
-            {
-                "id": listing.id,
-                "car_model_id": listing.car_model_id,
-                "price": float(listing.current_price_amount),
-                "currency": listing.current_price_currency,
-                "stock": listing.stock,
-                "is_active": listing.is_active,
-                "created_at": listing.created_at,
-                "brand": car_model.brand,
-                "model": car_model.model,
-            }
-        )
+    items = [
+        {
+            "id": row.id,
+            "car_model_id": row.car_model_id,
+            "price": float(row.current_price_amount),
+            "currency": row.current_price_currency,
+            "stock": row.stock,
+            "is_active": row.is_active,
+            "created_at": row.created_at,
+            "brand": row.brand,
+            "model": row.model,
+        }
+        for row in rows
+    ]
 
     return {
         "items": items,
@@ -201,13 +652,17 @@ def delete_listing(
 ):
     listing = get_listing_owned_by_agency(db, listing_id, agency_id)
 
-    # Si querés proteger contra borrar algo con compras:
-    if listing.purchases and len(listing.purchases) > 0:
+    # Si querés proteger contra borrar algo con compras (EXISTS: no carga
+    # la colección listing.purchases entera)
+    has_purchases = db.query(exists().where(Purchase.listing_id == listing.id)).scalar()
+    if has_purchases:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No se puede eliminar una oferta con compras asociadas",
         )
 
+    # los favoritos se borran en cascada: los descontamos del rollup
+    report_rollups.record_listing_favorites_removed(db, listing.id)
     db.delete(listing)
     db.commit()
     return None
@@ -1,57 +1,147 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta, timezone
+import hashlib
 import logging
+from collections.abc import Iterator
 from typing import List, Optional
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query, Session
 from fastapi import HTTPException
 
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
 from app.models.listing import Listing
 from app.models.purchase import Purchase, PurchaseStatus
 from app.models.user import User
-from app.schemas.purchase import AgencyCustomerOut, AgencySaleOut, PurchaseCreate
+from app.schemas.purchase import (
+    AgencyCustomerOut,
+    AgencySaleOut,
+    CursorAgencyCustomersOut,
+    CursorAgencySalesOut,
+    CursorPurchasesOut,
+    PurchaseBatchCreate,
+    PurchaseCreate,
+    PurchaseOut,
+)
 from app.schemas.reports import TopBuyerOut
+from app.services import report_rollups
+from app.utils.cursor import keyset_page
 
 logger = logging.getLogger(__name__)
 
+# filas por viaje del cursor del servidor en los exports
+EXPORT_BATCH_SIZE = 1000
+
+
+def _take_stock(db: Session, listing_id: int, quantity: int) -> bool:
+    """
+    Descuenta stock con un UPDATE condicional (stock >= quantity, activa).
+    La condición y la escritura son atómicas en la BD: no hay lost updates
+    entre requests concurrentes. True si se pudo descontar.
+    """
+    result = db.execute(
+        update(Listing)
+        .where(
+            Listing.id == listing_id,
+            Listing.stock >= quantity,
+            Listing.is_active.is_(True),
+        )
+        .values(stock=Listing.stock - quantity)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
 
-def create_purchase_for_buyer(
-    db: Session,
-    buyer: User,
-    payload: PurchaseCreate,
-) -> Purchase:
-    listing = db.get(Listing, payload.listing_id)
+
+def _return_stock(db: Session, listing_id: int, quantity: int) -> bool:
+    result = db.execute(
+        update(Listing)
+        .where(Listing.id == listing_id)
+        .values(stock=Listing.stock + quantity)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def _raise_stock_error(db: Session, listing_id: int, quantity: int) -> None:
+    """
+    Falló el UPDATE condicional: leemos el estado actual sólo para
+    devolver el mismo error que antes.
+    """
+    listing = db.get(Listing, listing_id, populate_existing=True)
     if not listing:
         raise HTTPException(status_code=404, detail="Listing no encontrada")
 
-    if listing.stock <= 0:
+    if not listing.is_active:
         raise HTTPException(
             status_code=400,
-            detail="No hay stock disponible para esta oferta",
+            detail="La oferta no está activa",
         )
 
-    if payload.quantity > listing.stock:
+    if listing.stock <= 0:
         raise HTTPException(
             status_code=400,
-            detail=(
-                f"Cantidad solicitada ({payload.quantity}) supera "
-                f"el stock disponible ({listing.stock})"
-            ),
+            detail="No hay stock disponible para esta oferta",
         )
 
+    raise HTTPException(
+        status_code=400,
+        detail=(
+            f"Cantidad solicitada ({quantity}) supera "
+            f"el stock disponible ({listing.stock})"
+        ),
+    )
+
+
+def _add_purchase(
+    db: Session,
+    buyer: User,
+    payload: PurchaseCreate,
+) -> Purchase:
+    """Descuenta stock y agrega la Purchase a la sesión, sin commitear."""
+    # Descontar stock (atómico; también bloquea la fila hasta el commit)
+    if not _take_stock(db, payload.listing_id, payload.quantity):
+        db.rollback()
+        _raise_stock_error(db, payload.listing_id, payload.quantity)
+
+    price_amount, price_currency = db.execute(
+        select(Listing.current_price_amount, Listing.current_price_currency).where(
+            Listing.id == payload.listing_id
+        )
+    ).one()
+
     purchase = Purchase(
         buyer_id=buyer.id,
-        listing_id=listing.id,
-        unit_price_amount=listing.current_price_amount,
-        unit_price_currency=listing.current_price_currency,
+        listing_id=payload.listing_id,
+        unit_price_amount=price_amount,
+        unit_price_currency=price_currency,
         quantity=payload.quantity,
         status=PurchaseStatus.COMPLETED,
     )
 
-    # Descontar stock
-    listing.stock = listing.stock - payload.quantity
-
     db.add(purchase)
-    db.add(listing)
+    db.flush()
+    report_rollups.record_purchases(db, [purchase.id])
+    return purchase
+
+
+def _purchase_out(purchase: Purchase) -> PurchaseOut:
+    return PurchaseOut(
+        id=purchase.id,
+        listing_id=purchase.listing_id,
+        buyer_id=purchase.buyer_id,
+        unit_price_amount=float(purchase.unit_price_amount),
+        unit_price_currency=purchase.unit_price_currency,
+        quantity=purchase.quantity,
+        status=purchase.status,
+    )
+
+
+def create_purchase_for_buyer(
+    db: Session,
+    buyer: User,
+    payload: PurchaseCreate,
+) -> Purchase:
+    purchase = _add_purchase(db, buyer, payload)
     db.commit()
     db.refresh(purchase)
 
@@ -60,14 +150,187 @@ def create_purchase_for_buyer(
         extra={
             "purchase_id": purchase.id,
             "buyer_id": buyer.id,
-            "listing_id": listing.id,
+            "listing_id": purchase.listing_id,
         },
     )
 
     return purchase
 
 
-def list_purchases_for_buyer(
+def _request_hash(payload: PurchaseCreate) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def _utcnow() -> datetime:
+    # naive, como vuelve created_at de la BD
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _idempotency_cutoff() -> datetime:
+    return _utcnow() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+def _replay_idempotent(
+    db: Session,
+    buyer: User,
+    key: str,
+    request_hash: str,
+) -> Optional[PurchaseOut]:
+    record = (
+        db.query(IdempotencyKey)
+        .filter(IdempotencyKey.user_id == buyer.id, IdempotencyKey.key == key)
+        .first()
+    )
+    if record is None:
+        return None
+    if record.created_at < _idempotency_cutoff():
+        # vencida: la key queda libre para una compra nueva
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == record.id))
+        return None
+    if record.request_hash != request_hash:
+        raise HTTPException(
+            status_code=409,
+            detail="Idempotency-Key ya usada con otro payload",
+        )
+    return PurchaseOut.model_validate_json(record.response_body)
+
+
+def create_purchase_idempotent(
+    db: Session,
+    buyer: User,
+    payload: PurchaseCreate,
+    idempotency_key: Optional[str],
+) -> PurchaseOut:
+    """
+    Como create_purchase_for_buyer, pero un reintento con la misma
+    Idempotency-Key devuelve la respuesta guardada sin tocar el stock.
+    La key se inserta en la misma transacción que la compra: si dos
+    reintentos corren a la vez, el UNIQUE hace fallar a uno, que se
+    deshace entero (stock incluido) y responde con lo guardado.
+    """
+    if not idempotency_key:
+        return _purchase_out(create_purchase_for_buyer(db, buyer, payload))
+
+    request_hash = _request_hash(payload)
+    stored = _replay_idempotent(db, buyer, idempotency_key, request_hash)
+    if stored is not None:
+        return stored
+
+    purchase = _add_purchase(db, buyer, payload)
+    result = _purchase_out(purchase)
+    db.add(
+        IdempotencyKey(
+            user_id=buyer.id,
+            key=idempotency_key,
+            request_hash=request_hash,
+            response_body=result.model_dump_json(),
+            # explícito en UTC: la retención se compara contra _utcnow()
+            created_at=_utcnow(),
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        stored = _replay_idempotent(db, buyer, idempotency_key, request_hash)
+        if stored is None:
+            raise
+        return stored
+
+    logger.info(
+        "Compra creada",
+        extra={
+            "purchase_id": result.id,
+            "buyer_id": buyer.id,
+            "listing_id": result.listing_id,
+        },
+    )
+    return result
+
+
+def purge_expired_idempotency_keys(db: Session, batch_size: int = 1000) -> int:
+    """
+    Borra las Idempotency-Key vencidas, en lotes (un DELETE enorme bloquearía
+    la tabla mientras siguen entrando compras). Devuelve cuántas borró.
+    """
+    cutoff = _idempotency_cutoff()
+    total = 0
+    while True:
+        ids = db.scalars(
+            select(IdempotencyKey.id)
+            .where(IdempotencyKey.created_at < cutoff)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            return total
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(ids)))
+        db.commit()
+        total += len(ids)
+
+
+def create_purchases_batch_for_buyer(
+    db: Session,
+    buyer: User,
+    payload: PurchaseBatchCreate,
+) -> list[PurchaseOut]:
+    """
+    Checkout de carrito: todas las compras en una sola transacción.
+    Si alguna oferta no tiene stock, no se compra ninguna.
+    """
+    # Cantidad total por listing (el carrito puede repetir una oferta)
+    totals: dict[int, int] = {}
+    for item in payload.items:
+        totals[item.listing_id] = totals.get(item.listing_id, 0) + item.quantity
+
+    # Descontamos en orden de id: dos carritos concurrentes toman los
+    # locks de fila en el mismo orden y no pueden hacer deadlock.
+    for listing_id in sorted(totals):
+        if not _take_stock(db, listing_id, totals[listing_id]):
+            db.rollback()
+            _raise_stock_error(db, listing_id, totals[listing_id])
+
+    prices = {
+        row.id: (row.current_price_amount, row.current_price_currency)
+        for row in db.execute(
+            select(
+                Listing.id,
+                Listing.current_price_amount,
+                Listing.current_price_currency,
+            ).where(Listing.id.in_(totals))
+        )
+    }
+
+    purchases = [
+        Purchase(
+            buyer_id=buyer.id,
+            listing_id=item.listing_id,
+            unit_price_amount=prices[item.listing_id][0],
+            unit_price_currency=prices[item.listing_id][1],
+            quantity=item.quantity,
+            status=PurchaseStatus.COMPLETED,
+        )
+        for item in payload.items
+    ]
+    db.add_all(purchases)
+    db.flush()  # INSERT en lote, asigna ids sin cerrar la transacción
+    report_rollups.record_purchases(db, [p.id for p in purchases])
+
+    # Armamos la respuesta antes del commit para no recargar cada fila
+    result = [_purchase_out(p) for p in purchases]
+    db.commit()
+
+    logger.info(
+        "Compra en lote creada",
+        extra={
+            "buyer_id": buyer.id,
+            "purchase_ids": [p.id for p in result],
+        },
+    )
+
+    return result
+
+
+def _buyer_purchases_query(
     db: Session,
     buyer: User,
     status: Optional[PurchaseStatus] = None,
@@ -76,7 +339,7 @@ def list_purchases_for_buyer(
     max_qty: Optional[int] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
-) -> List[Purchase]:
+) -> Query:
 
     query = db.query(Purchase).filter(Purchase.buyer_id == buyer.id)
 
@@ -98,10 +361,73 @@ def list_purchases_for_buyer(
     if max_price is not None:
         query = query.filter(Purchase.unit_price_amount <= max_price)
 
-    # opcional: orden por fecha desc
-    query = query.order_by(Purchase.created_at.desc())
+    # orden por fecha desc (id desempata)
+    return query.order_by(Purchase.created_at.desc(), Purchase.id.desc())
+
+
+def list_purchases_for_buyer(
+    db: Session,
+    buyer: User,
+    status: Optional[PurchaseStatus] = None,
+    listing_id: Optional[int] = None,
+    min_qty: Optional[int] = None,
+    max_qty: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+) -> List[Purchase]:
+    return _buyer_purchases_query(
+        db, buyer, status, listing_id, min_qty, max_qty, min_price, max_price
+    ).all()
+
+
+def page_purchases_for_buyer(
+    db: Session,
+    buyer: User,
+    cursor: Optional[str] = None,
+    page_size: int = settings.HISTORY_PAGE_SIZE,
+    **filters,
+) -> CursorPurchasesOut:
+    """list_purchases_for_buyer por páginas (ver app/utils/cursor.py)."""
+    query = _buyer_purchases_query(db, buyer, **filters)
+    rows, next_cursor = keyset_page(
+        query, Purchase.created_at, Purchase.id, cursor, page_size
+    )
+    return CursorPurchasesOut.model_construct(
+        items=[_purchase_out(p) for p in rows], next_cursor=next_cursor
+    )
+
+
+def _set_purchase_status(
+    db: Session,
+    buyer: User,
+    purchase_id: int,
+    from_cancelled: bool,
+    new_status: PurchaseStatus,
+) -> bool:
+    """
+    Cambia el status sólo si la compra es del buyer y está en el estado
+    esperado. Evita que dos cancelaciones simultáneas devuelvan stock dos veces.
+    """
+    if from_cancelled:
+        status_cond = Purchase.status == PurchaseStatus.CANCELLED
+    else:
+        status_cond = Purchase.status != PurchaseStatus.CANCELLED
+
+    result = db.execute(
+        update(Purchase)
+        .where(
+            Purchase.id == purchase_id,
+            Purchase.buyer_id == buyer.id,
+            status_cond,
+        )
+        .values(status=new_status)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
 
-    return query.all()
+def _load_purchase(db: Session, purchase_id: int) -> Optional[Purchase]:
+    return db.get(Purchase, purchase_id, populate_existing=True)
 
 
 def cancel_purchase_for_buyer(
@@ -109,35 +435,36 @@ def cancel_purchase_for_buyer(
     buyer: User,
     purchase_id: int,
 ) -> Purchase:
-    purchase = db.get(Purchase, purchase_id)
-    if not purchase:
-        raise HTTPException(status_code=404, detail="Compra no encontrada")
-
-    if purchase.buyer_id != buyer.id:
-        raise HTTPException(
-            status_code=403,
-            detail="No podés cancelar compras de otro usuario",
-        )
+    if not _set_purchase_status(
+        db, buyer, purchase_id, False, PurchaseStatus.CANCELLED
+    ):
+        db.rollback()
+        purchase = _load_purchase(db, purchase_id)
+        if not purchase:
+            raise HTTPException(status_code=404, detail="Compra no encontrada")
+
+        if purchase.buyer_id != buyer.id:
+            raise HTTPException(
+                status_code=403,
+                detail="No podés cancelar compras de otro usuario",
+            )
 
-    if purchase.status == PurchaseStatus.CANCELLED:
         raise HTTPException(
             status_code=400,
             detail="La compra ya está cancelada",
         )
 
-    listing = purchase.listing
-    if not listing:
+    purchase = _load_purchase(db, purchase_id)
+
+    # Al cancelar, devolvemos el stock
+    if not _return_stock(db, purchase.listing_id, purchase.quantity):
+        db.rollback()
         raise HTTPException(
             status_code=500,
             detail="Inconsistencia: la compra no tiene listing asociado",
         )
+    report_rollups.record_purchases(db, [purchase_id], sign=-1)
 
-    # Al cancelar, devolvemos el stock
-    listing.stock = listing.stock + purchase.quantity
-    purchase.status = PurchaseStatus.CANCELLED
-
-    db.add(listing)
-    db.add(purchase)
     db.commit()
     db.refresh(purchase)
 
@@ -146,7 +473,7 @@ def cancel_purchase_for_buyer(
         extra={
             "purchase_id": purchase.id,
             "buyer_id": buyer.id,
-            "listing_id": listing.id,
+            "listing_id": purchase.listing_id,
         },
     )
 
@@ -158,44 +485,49 @@ def reactivate_purchase_for_buyer(
     buyer: User,
     purchase_id: int,
 ) -> Purchase:
-    purchase = db.get(Purchase, purchase_id)
-    if not purchase:
-        raise HTTPException(status_code=404, detail="Compra no encontrada")
-
-    if purchase.buyer_id != buyer.id:
-        raise HTTPException(
-            status_code=403,
-            detail="No podés reactivar compras de otro usuario",
-        )
+    if not _set_purchase_status(db, buyer, purchase_id, True, PurchaseStatus.COMPLETED):
+        db.rollback()
+        purchase = _load_purchase(db, purchase_id)
+        if not purchase:
+            raise HTTPException(status_code=404, detail="Compra no encontrada")
+
+        if purchase.buyer_id != buyer.id:
+            raise HTTPException(
+                status_code=403,
+                detail="No podés reactivar compras de otro usuario",
+            )
 
-    if purchase.status != PurchaseStatus.CANCELLED:
         raise HTTPException(
             status_code=400,
             detail="Solo se pueden reactivar compras canceladas",
         )
 
-    listing = purchase.listing
-    if not listing:
-        raise HTTPException(
-            status_code=500,
-            detail="Inconsistencia: la compra no tiene listing asociado",
-        )
+    purchase = _load_purchase(db, purchase_id)
+    listing_id, quantity = purchase.listing_id, purchase.quantity
 
-    if listing.stock < purchase.quantity:
+    # Al reactivar, volvemos a descontar stock
+    if not _take_stock(db, listing_id, quantity):
+        db.rollback()
+        listing = db.get(Listing, listing_id, populate_existing=True)
+        if not listing:
+            raise HTTPException(
+                status_code=500,
+                detail="Inconsistencia: la compra no tiene listing asociado",
+            )
+        if not listing.is_active:
+            raise HTTPException(
+                status_code=400,
+                detail="La oferta no está activa",
+            )
         raise HTTPException(
             status_code=400,
             detail=(
                 "No hay stock suficiente para reactivar la compra. "
-                f"Stock actual: {listing.stock}, cantidad de la compra: {purchase.quantity}"
+                f"Stock actual: {listing.stock}, cantidad de la compra: {quantity}"
             ),
         )
+    report_rollups.record_purchases(db, [purchase_id])
 
-    # Al reactivar, volvemos a descontar stock
-    listing.stock = listing.stock - purchase.quantity
-    purchase.status = PurchaseStatus.ACTIVE
-
-    db.add(listing)
-    db.add(purchase)
     db.commit()
     db.refresh(purchase)
 
@@ -204,14 +536,14 @@ def reactivate_purchase_for_buyer(
         extra={
             "purchase_id": purchase.id,
             "buyer_id": buyer.id,
-            "listing_id": listing.id,
+            "listing_id": purchase.listing_id,
         },
     )
 
     return purchase
 
 
-def list_sales_for_agency(
+def _sales_query(
     db: Session,
     agency_id: int,
     brand: Optional[str] = None,
@@ -219,10 +551,21 @@ def list_sales_for_agency(
     customer: Optional[str] = None,  # nombre o email
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-) -> list[AgencySaleOut]:
-
+) -> Query:
     q = (
-        db.query(Purchase, Listing, User)
+        db.query(
+            Purchase.id,
+            Purchase.listing_id,
+            Purchase.buyer_id,
+            User.email.label("buyer_email"),
+            Listing.brand,
+            Listing.model,
+            Purchase.unit_price_amount,
+            Purchase.unit_price_currency,
+            Purchase.quantity,
+            Purchase.status,
+            Purchase.created_at,
+        )
         .join(Listing, Purchase.listing_id == Listing.id)
         .join(User, Purchase.buyer_id == User.id)
         .filter(
@@ -254,40 +597,84 @@ def list_sales_for_agency(
     if date_to:
         q = q.filter(Purchase.created_at <= date_to)
 
-    rows = q.order_by(Purchase.created_at.desc()).all()
-
-    result: list[AgencySaleOut] = []
-
-    for purchase, listing, buyer in rows:
-        total_amount = float(purchase.unit_price_amount) * purchase.quantity
-
-        result.append(
-            AgencySaleOut(
-                id=purchase.id,
-                listing_id=purchase.listing_id,
-                buyer_id=purchase.buyer_id,
-                buyer_email=buyer.email,
-                brand=listing.brand,
-                model=listing.model,
-                unit_price_amount=float(purchase.unit_price_amount),
-                unit_price_currency=purchase.unit_price_currency,
-                quantity=purchase.quantity,
-                total_amount=total_amount,
-                status=purchase.status,
-                created_at=purchase.created_at,
-            )
-        )
+    return q.order_by(Purchase.created_at.desc(), Purchase.id.desc())
+
+
+def _sale_out(row) -> AgencySaleOut:
+    unit_price = float(row.unit_price_amount)
+    return AgencySaleOut.model_construct(
+        id=row.id,
+        listing_id=row.listing_id,
+        buyer_id=row.buyer_id,
+        buyer_email=row.buyer_email,
+        brand=row.brand,
+        model=row.model,
+        unit_price_amount=unit_price,
+        unit_price_currency=row.unit_price_currency,
+        quantity=row.quantity,
+        total_amount=unit_price * row.quantity,
+        status=row.status,
+        created_at=row.created_at,
+    )
 
-    return result
 
+def list_sales_for_agency(
+    db: Session,
+    agency_id: int,
+    brand: Optional[str] = None,
+    model: Optional[str] = None,
+    customer: Optional[str] = None,  # nombre o email
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> list[AgencySaleOut]:
+    rows = _sales_query(db, agency_id, brand, model, customer, date_from, date_to).all()
+    return [_sale_out(row) for row in rows]
 
-def list_customers_for_agency(
+
+def page_sales_for_agency(
+    db: Session,
+    agency_id: int,
+    cursor: Optional[str] = None,
+    page_size: int = settings.HISTORY_PAGE_SIZE,
+    **filters,
+) -> CursorAgencySalesOut:
+    """list_sales_for_agency por páginas (ver app/utils/cursor.py)."""
+    query = _sales_query(db, agency_id, **filters)
+    rows, next_cursor = keyset_page(
+        query, Purchase.created_at, Purchase.id, cursor, page_size
+    )
+    return CursorAgencySalesOut.model_construct(
+        items=[_sale_out(row) for row in rows], next_cursor=next_cursor
+    )
+
+
+def iter_sales_for_agency(
+    db: Session,
+    agency_id: int,
+    brand: Optional[str] = None,
+    model: Optional[str] = None,
+    customer: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[AgencySaleOut]:
+    """
+    Las mismas ventas que list_sales_for_agency, de a una, leídas con un
+    cursor del lado del servidor (yield_per => stream_results): la memoria no
+    depende del tamaño del historial.
+    """
+    query = _sales_query(db, agency_id, brand, model, customer, date_from, date_to)
+    for row in query.yield_per(batch_size):
+        yield _sale_out(row)
+
+
+def _customers_query(
     db: Session,
     agency_id: int,
     q: Optional[str] = None,  # buscar por email (o nombre si luego lo agregás)
     min_purchases: Optional[int] = None,  # compras mínimas
     min_spent: Optional[float] = None,  # monto mínimo gastado
-) -> list[AgencyCustomerOut]:
+) -> Query:
 
     # Expresiones reutilizables para HAVING
     total_purchases_expr = func.count(Purchase.id)
@@ -324,20 +711,67 @@ def list_customers_for_agency(
     if min_spent is not None:
         query = query.having(total_spent_expr >= min_spent)
 
-    # Orden: último que compró primero
-    rows = query.order_by(last_purchase_expr.desc()).all()
+    # Orden: último que compró primero (id desempata)
+    return query.order_by(last_purchase_expr.desc(), User.id.desc())
 
-    result: list[AgencyCustomerOut] = []
 
-    for row in rows:
-        result.append(
-            AgencyCustomerOut(
-                customer_id=row.customer_id,
-                email=row.email,
-                total_purchases=int(row.total_purchases),
-                total_spent=float(row.total_spent or 0),
-                last_purchase_at=row.last_purchase_at,
-            )
-        )
+def _customer_out(row) -> AgencyCustomerOut:
+    return AgencyCustomerOut.model_construct(
+        customer_id=row.customer_id,
+        email=row.email,
+        total_purchases=int(row.total_purchases),
+        total_spent=float(row.total_spent or 0),
+        last_purchase_at=row.last_purchase_at,
+    )
 
-    return result
+
+def list_customers_for_agency(
+    db: Session,
+    agency_id: int,
+    q: Optional[str] = None,
+    min_purchases: Optional[int] = None,
+    min_spent: Optional[float] = None,
+) -> list[AgencyCustomerOut]:
+    rows = _customers_query(db, agency_id, q, min_purchases, min_spent).all()
+    return [_customer_out(row) for row in rows]
+
+
+def page_customers_for_agency(
+    db: Session,
+    agency_id: int,
+    cursor: Optional[str] = None,
+    page_size: int = settings.HISTORY_PAGE_SIZE,
+    **filters,
+) -> CursorAgencyCustomersOut:
+    """
+    list_customers_for_agency por páginas, con la clave
+    (last_purchase_at, customer_id) sobre el GROUP BY.
+    """
+    query = _customers_query(db, agency_id, **filters)
+    rows, next_cursor = keyset_page(
+        query,
+        func.max(Purchase.created_at),
+        User.id,
+        cursor,
+        page_size,
+        created_attr="last_purchase_at",
+        id_attr="customer_id",
+        having=True,
+    )
+    return CursorAgencyCustomersOut.model_construct(
+        items=[_customer_out(row) for row in rows], next_cursor=next_cursor
+    )
+
+
+def iter_customers_for_agency(
+    db: Session,
+    agency_id: int,
+    q: Optional[str] = None,
+    min_purchases: Optional[int] = None,
+    min_spent: Optional[float] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[AgencyCustomerOut]:
+    """list_customers_for_agency de a una fila, con cursor del servidor."""
+    query = _customers_query(db, agency_id, q, min_purchases, min_spent)
+    for row in query.yield_per(batch_size):
+        yield _customer_out(row)
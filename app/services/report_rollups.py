@@ -0,0 +1,337 @@
+# app/services/report_rollups.py
+"""
+Mantenimiento de los rollups diarios de reportes (app/models/report_rollup.py).
+
+- Incremental: las rutas de escritura (compras, cancelaciones, favoritos)
+  llaman a record_* dentro de su transacción; cada llamada es un
+  INSERT ... SELECT con upsert que suma (o resta) el delta del día.
+- En bloque: rebuild_report_rollups recalcula un rango desde las tablas crudas
+  (backfill inicial y reparación).
+- Cache: las respuestas de app/services/admin_reports.py se guardan en
+  `reports_cache`; cualquier record_* / rebuild marca la sesión y el cache se
+  vacía cuando esa transacción commitea (no antes: otro request podría
+  recalcular con datos todavía sin commitear y cachearlos).
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import (
+    Select,
+    and_,
+    delete,
+    event,
+    func,
+    inspect,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.favorite import Favorite
+from app.models.listing import Listing
+from app.models.purchase import Purchase, PurchaseStatus
+from app.models.report_rollup import (
+    DailyAgencySales,
+    DailyBuyerPurchases,
+    DailyCarModelSales,
+    DailyFavorites,
+)
+
+reports_cache = TTLCache(
+    "admin_reports",
+    ttl=settings.REPORTS_CACHE_TTL_SECONDS,
+    maxsize=settings.REPORTS_CACHE_MAX_ENTRIES,
+)
+
+_ROLLUPS_CHANGED = "report_rollups_changed"
+
+
+def _mark_changed(db: Session) -> None:
+    db.info[_ROLLUPS_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_reports_cache(session: Session) -> None:
+    if session.info.pop(_ROLLUPS_CHANGED, False):
+        reports_cache.clear()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rollup_changes(session: Session, previous_transaction) -> None:
+    # como en listings: el rollback de un SAVEPOINT no borra el flag
+    if previous_transaction.parent is None:
+        session.info.pop(_ROLLUPS_CHANGED, None)
+
+
+def _day(column) -> ColumnElement:
+    return func.date(column)
+
+
+def _upsert_from_select(
+    db: Session,
+    model,
+    stmt: Select,
+    key_cols: tuple[str, ...],
+    add_cols: tuple[str, ...],
+    max_cols: tuple[str, ...] = (),
+    keep_cols: tuple[str, ...] = (),
+) -> None:
+    """
+    INSERT INTO rollup SELECT ... ; si la fila (día, clave) ya existe suma
+    `add_cols`, se queda con el máximo en `max_cols` y no toca `keep_cols`.
+    """
+    table = model.__table__
+    cols = list(key_cols + add_cols + max_cols + keep_cols)
+    is_mysql = db.get_bind().dialect.name == "mysql"
+
+    if is_mysql:
+        ins = mysql_insert(table).from_select(cols, stmt)
+        new = ins.inserted
+        greatest = func.greatest
+    else:
+        ins = sqlite_insert(table).from_select(cols, stmt)
+        new = ins.excluded
+        greatest = func.max  # max() escalar de SQLite
+
+    updates = {c: table.c[c] + new[c] for c in add_cols}
+    updates.update(
+        {c: greatest(func.coalesce(table.c[c], new[c]), new[c]) for c in max_cols}
+    )
+
+    if is_mysql:
+        ins = ins.on_duplicate_key_update(updates)
+    else:
+        ins = ins.on_conflict_do_update(index_elements=list(key_cols), set_=updates)
+    db.execute(ins)
+
+
+# ---------------------------------------------------------------------------
+# SELECTs de agregación (compartidos por el incremental y el rebuild)
+# ---------------------------------------------------------------------------
+def _car_model_sales_select(where, sign: int = 1) -> Select:
+    day = _day(Purchase.created_at)
+    return (
+        select(
+            day,
+            Listing.car_model_id,
+            func.sum(Purchase.quantity) * sign,
+            func.sum(Purchase.unit_price_amount * Purchase.quantity) * sign,
+        )
+        .join(Listing, Listing.id == Purchase.listing_id)
+        .where(where)
+        .group_by(day, Listing.car_model_id)
+    )
+
+
+def _buyer_purchases_select(where, sign: int = 1) -> Select:
+    day = _day(Purchase.created_at)
+    return (
+        select(
+            day,
+            Purchase.buyer_id,
+            func.count(Purchase.id) * sign,
+            func.sum(Purchase.unit_price_amount * Purchase.quantity) * sign,
+            func.max(Purchase.created_at),
+        )
+        .where(where)
+        .group_by(day, Purchase.buyer_id)
+    )
+
+
+def _agency_sales_select(where, sign: int = 1) -> Select:
+    day = _day(Purchase.created_at)
+    return (
+        select(
+            day,
+            Listing.agency_id,
+            func.count(Purchase.id) * sign,
+            func.sum(Purchase.unit_price_amount * Purchase.quantity) * sign,
+        )
+        .join(Listing, Listing.id == Purchase.listing_id)
+        .where(where)
+        .group_by(day, Listing.agency_id)
+    )
+
+
+def _favorites_select(where, sign: int = 1) -> Select:
+    day = _day(Favorite.created_at)
+    return (
+        select(day, Favorite.listing_id, func.count(Favorite.id) * sign)
+        .where(where)
+        .group_by(day, Favorite.listing_id)
+    )
+
+
+def _write_purchase_rollups(db: Session, where, sign: int) -> None:
+    _upsert_from_select(
+        db,
+        DailyCarModelSales,
+        _car_model_sales_select(where, sign),
+        ("day", "car_model_id"),
+        ("units_sold", "total_amount"),
+    )
+    if sign > 0:
+        _upsert_from_select(
+            db,
+            DailyBuyerPurchases,
+            _buyer_purchases_select(where, sign),
+            ("day", "buyer_id"),
+            ("purchases_count", "total_spent"),
+            max_cols=("last_purchase_at",),
+        )
+    else:
+        _upsert_from_select(
+            db,
+            DailyBuyerPurchases,
+            _buyer_purchases_select(where, sign),
+            ("day", "buyer_id"),
+            ("purchases_count", "total_spent"),
+            keep_cols=("last_purchase_at",),
+        )
+    _upsert_from_select(
+        db,
+        DailyAgencySales,
+        _agency_sales_select(where, sign),
+        ("day", "agency_id"),
+        ("sales_count", "total_amount"),
+    )
+
+
+def _refresh_last_purchase_at(db: Session, purchase_ids: list[int]) -> None:
+    """Tras restar compras, recalcula last_purchase_at de esos (día, buyer)."""
+    affected = select(Purchase.buyer_id).where(Purchase.id.in_(purchase_ids))
+    affected_days = select(_day(Purchase.created_at)).where(
+        Purchase.id.in_(purchase_ids)
+    )
+    last = (
+        select(func.max(Purchase.created_at))
+        .where(
+            Purchase.buyer_id == DailyBuyerPurchases.buyer_id,
+            Purchase.status == PurchaseStatus.COMPLETED,
+            _day(Purchase.created_at) == DailyBuyerPurchases.day,
+        )
+        .scalar_subquery()
+    )
+    db.execute(
+        update(DailyBuyerPurchases)
+        .where(
+            DailyBuyerPurchases.buyer_id.in_(affected),
+            DailyBuyerPurchases.day.in_(affected_days),
+        )
+        .values(last_purchase_at=last)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# ---------------------------------------------------------------------------
+# API incremental (no commitea: corre dentro de la transacción del caller)
+# ---------------------------------------------------------------------------
+def record_purchases(db: Session, purchase_ids: Iterable[int], sign: int = 1) -> None:
+    """
+    Suma (sign=1: compra / reactivación) o resta (sign=-1: cancelación)
+    las compras indicadas. Las filas ya tienen que estar flusheadas.
+    """
+    ids = list(purchase_ids)
+    if not ids:
+        return
+    _mark_changed(db)
+    _write_purchase_rollups(db, Purchase.id.in_(ids), sign)
+    if sign < 0:
+        _refresh_last_purchase_at(db, ids)
+
+
+def record_favorite(db: Session, favorite_id: int, sign: int = 1) -> None:
+    """Llamar después del INSERT (sign=1) o antes del DELETE (sign=-1)."""
+    _mark_changed(db)
+    _upsert_from_select(
+        db,
+        DailyFavorites,
+        _favorites_select(Favorite.id == favorite_id, sign),
+        ("day", "listing_id"),
+        ("favorites_count",),
+    )
+
+
+def record_listing_favorites_removed(db: Session, listing_id: int) -> None:
+    """Antes de borrar una listing (sus favoritos se borran en cascada)."""
+    # explícito: el ON DELETE CASCADE no corre en SQLite sin PRAGMA
+    # foreign_keys y el id de la listing borrada se puede reusar
+    _mark_changed(db)
+    db.execute(delete(DailyFavorites).where(DailyFavorites.listing_id == listing_id))
+
+
+@event.listens_for(Listing, "after_update")
+def _track_listing_renamed(mapper, connection, target: Listing) -> None:
+    # top_favorites agrupa por el brand/model actual de la listing
+    state = inspect(target)
+    if not (
+        state.attrs.brand.history.has_changes()
+        or state.attrs.model.history.has_changes()
+    ):
+        return
+    session = Session.object_session(target)
+    if session is not None:
+        _mark_changed(session)
+
+
+# ---------------------------------------------------------------------------
+# Rebuild en bloque
+# ---------------------------------------------------------------------------
+def _created_between(
+    column, date_from: Optional[date], date_to: Optional[date]
+) -> ColumnElement:
+    conds = [true()]
+    if date_from is not None:
+        conds.append(column >= datetime.combine(date_from, time.min))
+    if date_to is not None:
+        conds.append(column < datetime.combine(date_to + timedelta(days=1), time.min))
+    return and_(*conds)
+
+
+def rebuild_report_rollups(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> None:
+    """
+    Recalcula los rollups del rango [date_from, date_to] (todo si son None)
+    a partir de purchases / favorites.
+    """
+    _mark_changed(db)
+    for model in (
+        DailyCarModelSales,
+        DailyBuyerPurchases,
+        DailyAgencySales,
+        DailyFavorites,
+    ):
+        stmt = delete(model)
+        if date_from is not None:
+            stmt = stmt.where(model.day >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(model.day <= date_to)
+        db.execute(stmt)
+
+    _write_purchase_rollups(
+        db,
+        and_(
+            Purchase.status == PurchaseStatus.COMPLETED,
+            _created_between(Purchase.created_at, date_from, date_to),
+        ),
+        1,
+    )
+    _upsert_from_select(
+        db,
+        DailyFavorites,
+        _favorites_select(_created_between(Favorite.created_at, date_from, date_to)),
+        ("day", "listing_id"),
+        ("favorites_count",),
+    )
+
+    db.commit()
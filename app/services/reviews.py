@@ -1,13 +1,70 @@
 from datetime import date, timedelta
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
 from fastapi import HTTPException, status
 
+from app.core.config import settings
 from app.models.listing import Listing
 from app.models.review import Review
 from app.models.user import User
-from app.schemas.review import BuyerReviewOut, ReviewCreate, ReviewUpdate
+from app.schemas.review import (
+    BuyerReviewOut,
+    CursorBuyerReviewsOut,
+    ReviewCreate,
+    ReviewUpdate,
+)
 from app.models.car_model import CarModel
+from app.services.listings import mark_listings_changed
+from app.utils.cursor import keyset_page
+
+
+def _bump_rating_stats(
+    db: Session,
+    car_model_id: int,
+    count_delta: int,
+    rating_delta: int,
+) -> None:
+    """
+    Ajusta los agregados desnormalizados de CarModel con un UPDATE atómico
+    (col = col + delta), dentro de la misma transacción que la reseña.
+    """
+    if not count_delta and not rating_delta:
+        return
+    db.query(CarModel).filter(CarModel.id == car_model_id).update(
+        {
+            CarModel.reviews_count: CarModel.reviews_count + count_delta,
+            CarModel.rating_sum: CarModel.rating_sum + rating_delta,
+        },
+        synchronize_session=False,
+    )
+
+
+def rebuild_rating_stats(db: Session) -> int:
+    """
+    Recalcula reviews_count / rating_sum de todos los CarModel a partir de la
+    tabla reviews. Sirve como backfill inicial y para reparar desvíos.
+    Devuelve la cantidad de CarModels actualizados.
+    """
+    count_sq = (
+        select(func.count(Review.id))
+        .where(Review.car_model_id == CarModel.id)
+        .scalar_subquery()
+    )
+    sum_sq = (
+        select(func.coalesce(func.sum(Review.rating), 0))
+        .where(Review.car_model_id == CarModel.id)
+        .scalar_subquery()
+    )
+    updated = db.query(CarModel).update(
+        {CarModel.reviews_count: count_sq, CarModel.rating_sum: sum_sq},
+        synchronize_session=False,
+    )
+    # UPDATE en bloque: no pasa por los eventos del ORM
+    mark_listings_changed(db)
+    db.commit()
+    return updated
 
 
 def create_review_for_buyer(
@@ -35,6 +92,7 @@ def create_review_for_buyer(
     )
 
     db.add(review)
+    _bump_rating_stats(db, listing.car_model_id, 1, payload.rating)
     db.commit()
     db.refresh(review)
 
@@ -60,6 +118,23 @@ def list_reviews_for_listing(
     return rows
 
 
+async def list_reviews_for_listing_id_async(
+    db: AsyncSession,
+    listing_id: int,
+) -> list[Review]:
+    """
+    Reviews del CarModel de una listing en un solo SELECT (join por
+    car_model_id), sobre una AsyncSession. Listing inexistente -> [].
+    """
+    result = await db.execute(
+        select(Review)
+        .join(Listing, Listing.car_model_id == Review.car_model_id)
+        .where(Listing.id == listing_id)
+        .order_by(Review.created_at.desc())
+    )
+    return list(result.scalars().all())
+
+
 def update_review_for_buyer(
     db: Session,
     buyer: User,
@@ -84,6 +159,7 @@ def update_review_for_buyer(
         )
 
     if payload.rating is not None:
+        _bump_rating_stats(db, review.car_model_id, 0, payload.rating - review.rating)
         review.rating = payload.rating
     if payload.comment is not None:
         review.comment = payload.comment
@@ -95,7 +171,19 @@ def update_review_for_buyer(
     return review
 
 
-def list_reviews_for_buyer(
+def _buyer_review_out(row) -> BuyerReviewOut:
+    return BuyerReviewOut(
+        id=row.id,
+        car_model_id=row.car_model_id,
+        brand=row.brand,
+        model=row.model,
+        rating=row.rating,
+        comment=row.comment,
+        created_at=row.created_at,
+    )
+
+
+def _buyer_reviews_query(
     db: Session,
     author: User,
     brand: Optional[str] = None,
@@ -103,7 +191,7 @@ def list_reviews_for_buyer(
     min_rating: Optional[int] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-) -> List[BuyerReviewOut]:
+) -> Query:
 
     query = (
         db.query(
@@ -130,18 +218,38 @@ def list_reviews_for_buyer(
     if date_to:
         query = query.filter(Review.created_at < date_to + timedelta(days=1))
 
-    query = query.order_by(Review.created_at.desc(), Review.id.desc())
-    rows = query.all()
-
-    return [
-        BuyerReviewOut(
-            id=row.id,
-            car_model_id=row.car_model_id,
-            brand=row.brand,
-            model=row.model,
-            rating=row.rating,
-            comment=row.comment,
-            created_at=row.created_at,
-        )
-        for row in rows
-    ]
+    return query.order_by(Review.created_at.desc(), Review.id.desc())
+
+
+def list_reviews_for_buyer(
+    db: Session,
+    author: User,
+    brand: Optional[str] = None,
+    model: Optional[str] = None,
+    min_rating: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> List[BuyerReviewOut]:
+    query = _buyer_reviews_query(
+        db, author, brand, model, min_rating, date_from, date_to
+    )
+    return [_buyer_review_out(row) for row in query.all()]
+
+
+def page_reviews_for_buyer(
+    db: Session,
+    author: User,
+    cursor: Optional[str] = None,
+    page_size: int = settings.HISTORY_PAGE_SIZE,
+    **filters,
+) -> CursorBuyerReviewsOut:
+    rows, next_cursor = keyset_page(
+        _buyer_reviews_query(db, author, **filters),
+        Review.created_at,
+        Review.id,
+        cursor,
+        page_size,
+    )
+    return CursorBuyerReviewsOut.model_construct(
+        items=[_buyer_review_out(row) for row in rows], next_cursor=next_cursor
+    )
@@ -0,0 +1,121 @@
+# app/services/search.py
+import re
+from typing import Optional
+
+from sqlalchemy import Float, Integer, and_, or_, select, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import Subquery
+
+from app.db.fulltext import FULLTEXT_COLUMNS, fts_table_name
+
+# Largo mínimo de término que cada índice puede resolver:
+# ngram de MySQL usa tokens de 2, trigram de FTS5 necesita 3.
+_MIN_TERM_LEN = {"mysql": 2, "sqlite": 3}
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _columns(model) -> tuple:
+    names = FULLTEXT_COLUMNS.get(model.__tablename__)
+    if not names:
+        raise ValueError(f"{model.__name__} no tiene índice de texto completo")
+    return tuple(getattr(model, name) for name in names)
+
+
+def _terms(q: str, dialect: str) -> list[str]:
+    """
+    Separa `q` en términos. Devuelve [] si algún término no lo puede resolver
+    el índice del dialecto (muy corto, o dialecto sin soporte): en ese caso
+    se usa el ILIKE de siempre.
+    """
+    min_len = _MIN_TERM_LEN.get(dialect)
+    terms = _TERM_RE.findall(q)
+    if min_len is None or not terms or any(len(t) < min_len for t in terms):
+        return []
+    return terms
+
+
+def search_subquery(db: Session, model, q: Optional[str]) -> Optional[Subquery]:
+    """
+    Subquery (id, score) con las filas de `model` que contienen todos los
+    términos de `q`. Score mayor = más relevante.
+    Devuelve None si la búsqueda no puede resolverse por índice.
+    """
+    if not q:
+        return None
+
+    dialect = db.get_bind().dialect.name
+    terms = _terms(q, dialect)
+    if not terms:
+        return None
+
+    if dialect == "mysql":
+        against = " ".join(f'+"{t}"' for t in terms)
+        score = match(*_columns(model), against=against).in_boolean_mode()
+        return (
+            select(model.id.label("id"), score.label("score")).where(score).subquery()
+        )
+
+    fts = fts_table_name(model.__tablename__)
+    stmt = (
+        text(
+            f"SELECT rowid AS id, -bm25({fts}) AS score "
+            f"FROM {fts} WHERE {fts} MATCH :terms"
+        )
+        .bindparams(terms=" AND ".join(f'"{t}"' for t in terms))
+        .columns(id=Integer, score=Float)
+    )
+    return stmt.subquery()
+
+
+def text_search_clause(db: Session, model, q: str) -> ColumnElement:
+    """
+    Predicado reutilizable "alguna columna buscable de `model` contiene `q`".
+    Sirve para combinarlo con otros filtros (p.ej. email en los listados admin).
+    """
+    sub = search_subquery(db, model, q)
+    if sub is not None:
+        return model.id.in_(select(sub.c.id))
+
+    like = f"%{q}%"
+    return or_(*(col.ilike(like) for col in _columns(model)))
+
+
+def column_search_clause(db: Session, model, column, value: str) -> ColumnElement:
+    """
+    Filtro "`column` contiene `value`" (p.ej. solo marca). El índice acota los
+    candidatos y el ILIKE sobre la columna descarta los que matchearon en otra.
+    """
+    like = f"%{value}%"
+    if search_subquery(db, model, value) is None:
+        return column.ilike(like)
+    return and_(text_search_clause(db, model, value), column.ilike(like))
+
+
+def apply_text_search(
+    query: Query,
+    db: Session,
+    model,
+    q: Optional[str],
+    order_by_relevance: bool = False,
+) -> Query:
+    """
+    Aplica la búsqueda de texto a `query`. Si `order_by_relevance`, ordena
+    por score (y luego id desc); si el índice no aplica, solo por id desc.
+    """
+    if not q:
+        return query
+
+    sub = search_subquery(db, model, q)
+    if sub is None:
+        query = query.filter(text_search_clause(db, model, q))
+        if order_by_relevance:
+            query = query.order_by(model.id.desc())
+        return query
+
+    query = query.join(sub, sub.c.id == model.id)
+    if order_by_relevance:
+        query = query.order_by(sub.c.score.desc(), model.id.desc())
+    return query
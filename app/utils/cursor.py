@@ -0,0 +1,123 @@
+# app/utils/cursor.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import String, and_, literal, or_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(data: dict[str, Any]) -> str:
+    """
+    Serializa la posición de un keyset (clave de orden + id) a un token opaco
+    apto para query string (base64 url-safe sin padding).
+    """
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict[str, Any]:
+    """
+    Inversa de encode_cursor. Si el token está corrupto devuelve 400.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        data = None
+
+    if not isinstance(data, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido",
+        )
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Keyset por (fecha, id), del más nuevo al más viejo
+# ---------------------------------------------------------------------------
+# Los historiales (ventas y clientes de una agencia; compras, favoritos y
+# reseñas de un buyer) tienen dos funciones en su service: `list_*` devuelve
+# la lista completa (como siempre) y `page_*` una página por cursor,
+# {items, next_cursor}, armada con keyset_page. El endpoint usa `page_*`
+# cuando el cliente manda `cursor` o `page_size`; next_cursor es None en la
+# última página y un cursor corrupto devuelve 400.
+
+
+def _decode_position(cursor: str) -> tuple[datetime, int]:
+    data = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(data["t"]), int(data["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido",
+        )
+
+
+def _after_position(query: Query, created_col, id_col, last_created, last_id):
+    """
+    WHERE (created, id) < (last_created, last_id), expandido a OR/AND para que
+    MySQL lo resuelva como rango sobre el índice (created, id).
+
+    SQLite guarda las fechas como texto y las compara como texto: las que puso
+    el server default (CURRENT_TIMESTAMP) quedan 'YYYY-MM-DD HH:MM:SS' y las
+    que manda SQLAlchemy llevan '.ffffff'. Con un segundo justo (el único caso
+    en que puede venir del server default) se compara contra los dos formatos.
+    """
+    if last_created.microsecond or query.session.get_bind().dialect.name != "sqlite":
+        return or_(
+            created_col < last_created,
+            and_(created_col == last_created, id_col < last_id),
+        )
+    short = literal(last_created.strftime("%Y-%m-%d %H:%M:%S"), String)
+    full = literal(last_created.strftime("%Y-%m-%d %H:%M:%S.%f"), String)
+    # 'HH:MM:SS' < 'HH:MM:SS.000000' como texto: lo anterior a ambos es < short
+    return or_(
+        created_col < short,
+        and_(created_col.in_([short, full]), id_col < last_id),
+    )
+
+
+def keyset_page(
+    query: Query,
+    created_col,
+    id_col,
+    cursor: Optional[str],
+    page_size: int,
+    *,
+    created_attr: str = "created_at",
+    id_attr: str = "id",
+    having: bool = False,
+) -> tuple[list, Optional[str]]:
+    """
+    Filas de una página de `query` en orden (created_col, id_col)
+    descendente, y el cursor de la página siguiente.
+
+    Con cursor filtra WHERE (created, id) < (cursor_created, cursor_id) (ver
+    _after_position) y pide page_size + 1 filas para saber si hay otra página.
+    `created_attr` / `id_attr` son los nombres de esas columnas en las filas
+    devueltas; `having=True` cuando la clave es un agregado (GROUP BY).
+    """
+    query = query.order_by(None).order_by(created_col.desc(), id_col.desc())
+
+    if cursor:
+        last_created, last_id = _decode_position(cursor)
+        after = _after_position(query, created_col, id_col, last_created, last_id)
+        query = query.having(after) if having else query.filter(after)
+
+    rows = query.limit(page_size + 1).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            {
+                "t": getattr(last, created_attr).isoformat(),
+                "id": getattr(last, id_attr),
+            }
+        )
+    return rows, next_cursor
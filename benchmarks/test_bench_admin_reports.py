@@ -0,0 +1,44 @@
+from app.services import admin_reports
+from app.services.report_rollups import reports_cache
+
+
+def _uncached(dataset, report):
+    # mide la consulta sobre los rollups, no el hit del cache de reportes
+    def run():
+        reports_cache.clear()
+        with dataset.Session() as db:
+            return report(db, None, None, 10)
+
+    return run
+
+
+def test_top_sold_cars(dataset, measure):
+    assert measure(_uncached(dataset, admin_reports.top_sold_cars))
+
+
+def test_top_buyers(dataset, measure):
+    assert measure(_uncached(dataset, admin_reports.get_top_buyers))
+
+
+def test_top_favorites(dataset, measure):
+    assert measure(_uncached(dataset, admin_reports.get_top_favorites))
+
+
+def test_top_agencies(dataset, measure):
+    assert measure(_uncached(dataset, admin_reports.get_top_agencies))
+
+
+def test_dashboard(dataset, measure):
+    def run():
+        reports_cache.clear()
+        return admin_reports.get_admin_dashboard(dataset.Session, None, None, 5)
+
+    assert measure(run).top_sold_cars
+
+
+def test_top_sold_cars_cached(dataset, measure):
+    def run():
+        with dataset.Session() as db:
+            return admin_reports.top_sold_cars(db, None, None, 10)
+
+    assert measure(run)
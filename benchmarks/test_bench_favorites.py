@@ -0,0 +1,20 @@
+from app.services import favorites as favorites_service
+
+
+def test_add_and_remove_favorite(dataset, measure, fresh_favorite_listing):
+    def run():
+        with dataset.Session() as db:
+            favorites_service.add_favorite(db, dataset.buyer.id, fresh_favorite_listing)
+            favorites_service.remove_favorite(
+                db, dataset.buyer.id, fresh_favorite_listing
+            )
+
+    measure(run)
+
+
+def test_list_favorites_for_buyer(dataset, measure):
+    def run():
+        with dataset.Session() as db:
+            return favorites_service.list_favorites_for_buyer(db, dataset.buyer)
+
+    measure(run)
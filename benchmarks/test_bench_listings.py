@@ -0,0 +1,63 @@
+from app.services import listings as listings_service
+
+
+def _browse(dataset, cached=False, **params):
+    # por defecto mide la consulta, no el hit del cache del browse
+    def run():
+        if not cached:
+            listings_service.listings_browse_cache.clear()
+        with dataset.Session() as db:
+            return listings_service.browse_listings(db, **params)
+
+    return run
+
+
+def test_browse_first_page(dataset, measure):
+    result = measure(_browse(dataset, sort="newest"))
+    assert len(result) == 20
+
+
+def test_browse_deep_page_offset(dataset, measure):
+    measure(_browse(dataset, sort="price_asc", page=40))
+
+
+def test_browse_deep_page_cursor(dataset, measure):
+    # el cursor de la página 40 se obtiene una vez, fuera de la medición
+    with dataset.Session() as db:
+        page = listings_service.browse_listings(
+            db, sort="price_asc", page_size=20 * 39, pagination="cursor"
+        )
+    measure(
+        _browse(dataset, sort="price_asc", pagination="cursor", cursor=page.next_cursor)
+    )
+
+
+def test_browse_text_search(dataset, measure):
+    measure(_browse(dataset, q="toyota cor", sort="relevance"))
+
+
+def test_browse_as_buyer(dataset, measure):
+    measure(_browse(dataset, viewer=dataset.buyer, brand="Fiat"))
+
+
+def test_browse_first_page_cached(dataset, measure):
+    run = _browse(dataset, cached=True, sort="newest")
+    run()  # la página ya cacheada: se mide el hit
+    assert len(measure(run)) == 20
+
+
+def test_browse_as_buyer_cached(dataset, measure):
+    # hit del cache + la query de favoritos del buyer
+    run = _browse(dataset, cached=True, viewer=dataset.buyer, brand="Fiat")
+    run()
+    measure(run)
+
+
+def test_listing_detail_for_buyer(dataset, measure):
+    def run():
+        with dataset.Session() as db:
+            return listings_service.get_listing_for_buyer(
+                db, dataset.buyer, dataset.listing_id
+            )
+
+    assert measure(run).id == dataset.listing_id
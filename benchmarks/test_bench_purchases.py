@@ -0,0 +1,50 @@
+from app.core.responses import export_chunks
+from app.schemas.purchase import AgencySaleOut, PurchaseCreate
+from app.services import purchases as purchases_service
+
+
+def test_purchase_and_cancel(dataset, measure):
+    payload = PurchaseCreate(listing_id=dataset.listing_id, quantity=1)
+
+    def run():
+        with dataset.Session() as db:
+            purchase = purchases_service.create_purchase_for_buyer(
+                db, dataset.buyer, payload
+            )
+            purchases_service.cancel_purchase_for_buyer(db, dataset.buyer, purchase.id)
+
+    measure(run)
+
+
+def test_list_purchases_for_buyer(dataset, measure):
+    def run():
+        with dataset.Session() as db:
+            return purchases_service.list_purchases_for_buyer(db, dataset.buyer)
+
+    assert measure(run)
+
+
+def test_list_sales_for_agency(dataset, measure):
+    def run():
+        with dataset.Session() as db:
+            return purchases_service.list_sales_for_agency(db, dataset.agency_id)
+
+    assert measure(run)
+
+
+def test_list_customers_for_agency(dataset, measure):
+    def run():
+        with dataset.Session() as db:
+            return purchases_service.list_customers_for_agency(db, dataset.agency_id)
+
+    assert measure(run)
+
+
+def test_export_sales_for_agency(dataset, measure):
+    # peak_kib del export no crece con la cantidad de ventas (list_sales sí)
+    def run():
+        with dataset.Session() as db:
+            rows = purchases_service.iter_sales_for_agency(db, dataset.agency_id)
+            return sum(len(c) for c in export_chunks(rows, AgencySaleOut, "csv"))
+
+    assert measure(run)
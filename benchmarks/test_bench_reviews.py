@@ -0,0 +1,19 @@
+from app.models.listing import Listing
+from app.services import reviews as reviews_service
+
+
+def test_list_reviews_for_listing(dataset, measure):
+    def run():
+        with dataset.Session() as db:
+            listing = db.get(Listing, dataset.listing_id)
+            return reviews_service.list_reviews_for_listing(db, listing)
+
+    measure(run)
+
+
+def test_list_reviews_for_buyer(dataset, measure):
+    def run():
+        with dataset.Session() as db:
+            return reviews_service.list_reviews_for_buyer(db, dataset.buyer)
+
+    measure(run)
@@ -0,0 +1,93 @@
+"""
+Serialización de una página de 100 ofertas, antes y después del camino
+rápido (app/core/responses.py). No usa la base: mide sólo armar los schemas
+y producir el JSON.
+
+- before: model_validate(from_attributes) + model_copy por ítem, después
+  FastAPI valida contra response_model y JSONResponse serializa con json.
+- after: model_construct desde la tupla de la query y FastJSONResponse
+  (orjson) sin revalidar.
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_response_field
+
+from app.core.responses import FastJSONResponse
+from app.schemas.listing import ListingOut
+from app.services.listings import _listing_out
+
+N_ITEMS = 100
+
+pytestmark = pytest.mark.benchmark(group="serialization-100-listings")
+
+
+def _rows() -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=i,
+            agency_id=i % 20 + 1,
+            brand="Toyota",
+            model=f"Corolla {i}",
+            current_price_amount=Decimal(f"{15000 + i}.50"),
+            current_price_currency="USD",
+            stock=i % 7,
+            seller_notes="Único dueño, service oficial" if i % 3 else None,
+            reviews_count=i % 11,
+            rating_sum=(i % 11) * 4,
+        )
+        for i in range(1, N_ITEMS + 1)
+    ]
+
+
+def _entities(rows) -> list[SimpleNamespace]:
+    # la forma de antes: entidad Listing con su car_model cargado
+    return [
+        SimpleNamespace(
+            **vars(row),
+            car_model=SimpleNamespace(
+                reviews_count=row.reviews_count,
+                avg_rating=(
+                    row.rating_sum / row.reviews_count if row.reviews_count else None
+                ),
+            ),
+        )
+        for row in rows
+    ]
+
+
+def test_serialize_before(benchmark):
+    entities = _entities(_rows())
+    field = create_response_field(name="response", type_=list[ListingOut])
+
+    def run() -> bytes:
+        items = [
+            ListingOut.model_validate(it, from_attributes=True).model_copy(
+                update={
+                    "is_favorite": False,
+                    "avg_rating": it.car_model.avg_rating,
+                    "reviews_count": it.car_model.reviews_count,
+                }
+            )
+            for it in entities
+        ]
+        # lo que hace fastapi.routing.serialize_response con response_model
+        value, errors = field.validate(items, {}, loc=("response",))
+        assert not errors
+        return JSONResponse(field.serialize(value, mode="json")).body
+
+    benchmark.extra_info["items"] = N_ITEMS
+    benchmark(run)
+
+
+def test_serialize_after(benchmark):
+    rows = _rows()
+
+    def run() -> bytes:
+        return FastJSONResponse([_listing_out(row) for row in rows]).body
+
+    benchmark.extra_info["items"] = N_ITEMS
+    benchmark(run)
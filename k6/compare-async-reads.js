@@ -0,0 +1,88 @@
+import http from "k6/http";
+import { check } from "k6";
+
+// Compara RPS sostenido del path sync vs async de los GET calientes.
+// Correr dos veces contra la misma BD (cta_perf) y comparar `http_reqs`
+// y `dropped_iterations` del resumen:
+//
+//   ASYNC_READS_ENABLED=0 uvicorn app.main:app   ->  k6 run k6/compare-async-reads.js
+//   ASYNC_READS_ENABLED=1 uvicorn app.main:app   ->  k6 run k6/compare-async-reads.js
+//
+// Con tasa constante de llegadas: si el server no da abasto, k6 descarta
+// iteraciones (dropped_iterations) en vez de bajar la carga.
+
+const RATE = parseInt(__ENV.RATE || "300", 10); // requests/s objetivo
+
+export const options = {
+  scenarios: {
+    reads: {
+      executor: "constant-arrival-rate",
+      rate: RATE,
+      timeUnit: "1s",
+      duration: __ENV.DURATION || "2m",
+      preAllocatedVUs: 100,
+      maxVUs: 400,
+    },
+  },
+  thresholds: {
+    http_req_failed: ["rate<0.01"],
+    http_req_duration: ["p(95)<800"],
+  },
+  noConnectionReuse: false,
+  insecureSkipTLSVerify: true,
+};
+
+const BASE_URL = __ENV.API_BASE_URL || "http://127.0.0.1:8000/api/v1";
+const BUYER_EMAIL = __ENV.BUYER_EMAIL || "buyer_perf@cta.com";
+const BUYER_PASSWORD = __ENV.BUYER_PASSWORD || "Perf1234!";
+
+const searchTerms = ["", "peugeot", "fiat", "toyota", "cronos", "208"];
+
+export function setup() {
+  const res = http.post(
+    `${BASE_URL}/auth/login`,
+    JSON.stringify({ email: BUYER_EMAIL, password: BUYER_PASSWORD }),
+    { headers: { "Content-Type": "application/json" } },
+  );
+  check(res, { "login 200": (r) => r.status === 200 });
+  const token = res.json("access_token");
+
+  const listings = http.get(`${BASE_URL}/listings?page_size=50`).json();
+  return {
+    headers: { Authorization: `Bearer ${token}` },
+    listingIds: listings.map((l) => l.id),
+  };
+}
+
+export default function (data) {
+  const pick = Math.random();
+  const id =
+    data.listingIds[Math.floor(Math.random() * data.listingIds.length)];
+  let res;
+
+  if (pick < 0.6) {
+    // browse (el más pesado y el más frecuente)
+    const q = searchTerms[Math.floor(Math.random() * searchTerms.length)];
+    let url = `${BASE_URL}/listings?page_size=20`;
+    if (q) {
+      url += `&q=${encodeURIComponent(q)}`;
+    }
+    res = http.get(url, { headers: data.headers, tags: { name: "browse" } });
+  } else if (pick < 0.8) {
+    res = http.get(`${BASE_URL}/listings/${id}`, {
+      headers: data.headers,
+      tags: { name: "detail" },
+    });
+  } else if (pick < 0.9) {
+    res = http.get(`${BASE_URL}/favorites/my`, {
+      headers: data.headers,
+      tags: { name: "favorites" },
+    });
+  } else {
+    res = http.get(`${BASE_URL}/reviews/by-listing/${id}`, {
+      tags: { name: "reviews" },
+    });
+  }
+
+  check(res, { "status es 200": (r) => r.status === 200 });
+}
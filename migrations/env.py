@@ -0,0 +1,83 @@
+"""
+Entorno de Alembic.
+
+- Desde la CLI (`alembic upgrade head`) conecta a settings.DATABASE_URL.
+- Desde el startup de la app (app/db/migrate.py) recibe la conexión ya
+  abierta en config.attributes["connection"].
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.fulltext import FULLTEXT_COLUMNS, fts_table_name
+
+config = context.config
+
+if config.config_file_name is not None and not config.attributes.get("connection"):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def _include_name(name, type_, parent_names) -> bool:
+    # las tablas FTS5 de SQLite (y sus tablas internas) no son del modelo:
+    # las crea app/db/fulltext.py
+    if type_ == "table":
+        return not any(
+            name == fts or name.startswith(f"{fts}_")
+            for fts in map(fts_table_name, FULLTEXT_COLUMNS)
+        )
+    return True
+
+
+def _url() -> str:
+    if not settings.DATABASE_URL:
+        raise RuntimeError("DATABASE_URL no está configurada en .env")
+    return settings.DATABASE_URL
+
+
+def run_migrations_offline() -> None:
+    """Genera el SQL sin conectarse (`alembic upgrade head --sql`)."""
+    context.configure(
+        url=_url(),
+        target_metadata=target_metadata,
+        include_name=_include_name,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=_include_name,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    engine = create_engine(_url())
+    try:
+        with engine.connect() as conn:
+            _run(conn)
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,233 @@
+"""baseline
+
+Esquema tal como lo dejaba `Base.metadata.create_all` antes de las columnas,
+tablas e índices que se sumaron después (esos van en 0002). Las bases
+creadas antes de Alembic se marcan con esta revisión sin ejecutarla
+(app/db/migrate.py).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 17:48:01.464194
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "agencies",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "car_models",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("brand", sa.String(length=100), nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "inventory",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("agency_id", sa.Integer(), nullable=False),
+        sa.Column("car_model_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("is_used", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["agency_id"], ["agencies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["car_model_id"], ["car_models.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_inventory_id"), "inventory", ["id"], unique=False)
+    op.create_table(
+        "listings",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("agency_id", sa.Integer(), nullable=False),
+        sa.Column("car_model_id", sa.Integer(), nullable=False),
+        sa.Column("brand", sa.String(length=80), nullable=False),
+        sa.Column("model", sa.String(length=80), nullable=False),
+        sa.Column(
+            "current_price_amount", sa.Numeric(precision=12, scale=2), nullable=False
+        ),
+        sa.Column("current_price_currency", sa.String(length=3), nullable=False),
+        sa.Column("stock", sa.Integer(), nullable=False),
+        sa.Column("seller_notes", sa.Text(), nullable=True),
+        sa.Column("expires_on", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("is_active", sa.Boolean(), server_default="1", nullable=False),
+        sa.ForeignKeyConstraint(["agency_id"], ["agencies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["car_model_id"], ["car_models.id"], ondelete="RESTRICT"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_listings_agency_id"), "listings", ["agency_id"], unique=False
+    )
+    op.create_index(op.f("ix_listings_brand"), "listings", ["brand"], unique=False)
+    op.create_index(
+        "ix_listings_brand_model", "listings", ["brand", "model"], unique=False
+    )
+    op.create_index(
+        op.f("ix_listings_car_model_id"), "listings", ["car_model_id"], unique=False
+    )
+    op.create_index(op.f("ix_listings_model"), "listings", ["model"], unique=False)
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("password_hash", sa.String(length=255), nullable=False),
+        sa.Column(
+            "role", sa.Enum("admin", "buyer", "agency", name="userrole"), nullable=False
+        ),
+        sa.Column("is_active", sa.Boolean(), server_default="1", nullable=False),
+        sa.Column("agency_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["agency_id"],
+            ["agencies.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("agency_id", "role", name="uq_user_agency_role"),
+    )
+    op.create_index(op.f("ix_users_email"), "users", ["email"], unique=True)
+    op.create_index(op.f("ix_users_role"), "users", ["role"], unique=False)
+    op.create_table(
+        "favorites",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("customer_id", sa.Integer(), nullable=False),
+        sa.Column("listing_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["customer_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["listing_id"], ["listings.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "customer_id", "listing_id", name="uq_favorite_customer_listing"
+        ),
+    )
+    op.create_index(
+        op.f("ix_favorites_customer_id"), "favorites", ["customer_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_favorites_listing_id"), "favorites", ["listing_id"], unique=False
+    )
+    op.create_table(
+        "purchases",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("buyer_id", sa.Integer(), nullable=False),
+        sa.Column("listing_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "unit_price_amount", sa.Numeric(precision=12, scale=2), nullable=False
+        ),
+        sa.Column("unit_price_currency", sa.String(length=3), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("COMPLETED", "CANCELLED", name="purchase_status"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["buyer_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["listing_id"], ["listings.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_purchases_buyer_id"), "purchases", ["buyer_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_purchases_listing_id"), "purchases", ["listing_id"], unique=False
+    )
+    op.create_table(
+        "reviews",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("car_model_id", sa.Integer(), nullable=False),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.Column("rating", sa.SmallInteger(), nullable=False),
+        sa.Column("comment", sa.String(length=1000), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["author_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["car_model_id"], ["car_models.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_reviews_author_id"), "reviews", ["author_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_reviews_car_model_id"), "reviews", ["car_model_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_reviews_car_model_id"), table_name="reviews")
+    op.drop_index(op.f("ix_reviews_author_id"), table_name="reviews")
+    op.drop_table("reviews")
+    op.drop_index(op.f("ix_purchases_listing_id"), table_name="purchases")
+    op.drop_index(op.f("ix_purchases_buyer_id"), table_name="purchases")
+    op.drop_table("purchases")
+    op.drop_index(op.f("ix_favorites_listing_id"), table_name="favorites")
+    op.drop_index(op.f("ix_favorites_customer_id"), table_name="favorites")
+    op.drop_table("favorites")
+    op.drop_index(op.f("ix_users_role"), table_name="users")
+    op.drop_index(op.f("ix_users_email"), table_name="users")
+    op.drop_table("users")
+    op.drop_index(op.f("ix_listings_model"), table_name="listings")
+    op.drop_index(op.f("ix_listings_car_model_id"), table_name="listings")
+    op.drop_index("ix_listings_brand_model", table_name="listings")
+    op.drop_index(op.f("ix_listings_brand"), table_name="listings")
+    op.drop_index(op.f("ix_listings_agency_id"), table_name="listings")
+    op.drop_table("listings")
+    op.drop_index(op.f("ix_inventory_id"), table_name="inventory")
+    op.drop_table("inventory")
+    op.drop_table("car_models")
+    op.drop_table("agencies")
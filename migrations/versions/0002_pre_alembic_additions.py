@@ -0,0 +1,239 @@
+"""pre-alembic additions
+
+Lo que el esquema sumó sobre la baseline antes de pasar a Alembic: agregados
+de reseñas en car_models, users.version, índices de texto completo,
+idempotency_keys, rollups diarios de reportes e ix_listings_price_id.
+
+Las bases creadas antes de Alembic pueden tener ya una parte (el startup
+viejo hacía create_all + ALTER a mano): cada objeto se crea sólo si falta.
+Los agregados y rollups que se crean acá se cargan desde las tablas crudas.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 17:48:15.102344
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.fulltext import fts_table_name, fulltext_ddl, fulltext_index_name
+
+# tablas con búsqueda de texto completo -> columnas
+FULLTEXT = {"car_models": ("brand", "model"), "listings": ("brand", "model")}
+
+ROLLUP_TABLES = (
+    "daily_car_model_sales",
+    "daily_buyer_purchases",
+    "daily_agency_sales",
+    "daily_favorites",
+)
+
+# mismos agregados que app/services/report_rollups.py (en SQL plano: la
+# migración no depende de los modelos de hoy)
+ROLLUP_BACKFILL = {
+    "daily_car_model_sales": (
+        "INSERT INTO daily_car_model_sales "
+        "(day, car_model_id, units_sold, total_amount) "
+        "SELECT DATE(p.created_at), l.car_model_id, SUM(p.quantity), "
+        "SUM(p.unit_price_amount * p.quantity) "
+        "FROM purchases p JOIN listings l ON l.id = p.listing_id "
+        "WHERE p.status = 'COMPLETED' "
+        "GROUP BY DATE(p.created_at), l.car_model_id"
+    ),
+    "daily_buyer_purchases": (
+        "INSERT INTO daily_buyer_purchases "
+        "(day, buyer_id, purchases_count, total_spent, last_purchase_at) "
+        "SELECT DATE(created_at), buyer_id, COUNT(id), "
+        "SUM(unit_price_amount * quantity), MAX(created_at) "
+        "FROM purchases WHERE status = 'COMPLETED' "
+        "GROUP BY DATE(created_at), buyer_id"
+    ),
+    "daily_agency_sales": (
+        "INSERT INTO daily_agency_sales "
+        "(day, agency_id, sales_count, total_amount) "
+        "SELECT DATE(p.created_at), l.agency_id, COUNT(p.id), "
+        "SUM(p.unit_price_amount * p.quantity) "
+        "FROM purchases p JOIN listings l ON l.id = p.listing_id "
+        "WHERE p.status = 'COMPLETED' "
+        "GROUP BY DATE(p.created_at), l.agency_id"
+    ),
+    "daily_favorites": (
+        "INSERT INTO daily_favorites (day, listing_id, favorites_count) "
+        "SELECT DATE(created_at), listing_id, COUNT(id) "
+        "FROM favorites GROUP BY DATE(created_at), listing_id"
+    ),
+}
+
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _added_columns() -> dict[str, list[sa.Column]]:
+    # nuevas en cada llamada: una Column sólo se puede asociar a una tabla
+    return {
+        "car_models": [
+            sa.Column(
+                "reviews_count", sa.Integer(), server_default="0", nullable=False
+            ),
+            sa.Column("rating_sum", sa.Integer(), server_default="0", nullable=False),
+        ],
+        "users": [
+            sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        ],
+    }
+
+
+def _create_rollup_table(name: str) -> None:
+    if name == "daily_car_model_sales":
+        op.create_table(
+            "daily_car_model_sales",
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("car_model_id", sa.Integer(), nullable=False),
+            sa.Column("units_sold", sa.Integer(), nullable=False),
+            sa.Column(
+                "total_amount", sa.Numeric(precision=14, scale=2), nullable=False
+            ),
+            sa.ForeignKeyConstraint(
+                ["car_model_id"], ["car_models.id"], ondelete="CASCADE"
+            ),
+            sa.PrimaryKeyConstraint("day", "car_model_id"),
+        )
+    elif name == "daily_buyer_purchases":
+        op.create_table(
+            "daily_buyer_purchases",
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("buyer_id", sa.Integer(), nullable=False),
+            sa.Column("purchases_count", sa.Integer(), nullable=False),
+            sa.Column("total_spent", sa.Numeric(precision=14, scale=2), nullable=False),
+            sa.Column("last_purchase_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["buyer_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("day", "buyer_id"),
+        )
+    elif name == "daily_agency_sales":
+        op.create_table(
+            "daily_agency_sales",
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("agency_id", sa.Integer(), nullable=False),
+            sa.Column("sales_count", sa.Integer(), nullable=False),
+            sa.Column(
+                "total_amount", sa.Numeric(precision=14, scale=2), nullable=False
+            ),
+            sa.ForeignKeyConstraint(["agency_id"], ["agencies.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("day", "agency_id"),
+        )
+    else:
+        op.create_table(
+            "daily_favorites",
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("listing_id", sa.Integer(), nullable=False),
+            sa.Column("favorites_count", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(
+                ["listing_id"], ["listings.id"], ondelete="CASCADE"
+            ),
+            sa.PrimaryKeyConstraint("day", "listing_id"),
+        )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, columns in _added_columns().items():
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        for column in columns:
+            if column.name not in existing:
+                op.add_column(table, column)
+    # UPDATE en bloque, también si las columnas ya estaban: deja los
+    # agregados iguales a reviews (lo mismo que rebuild_rating_stats)
+    op.execute(
+        "UPDATE car_models SET "
+        "reviews_count = (SELECT COUNT(*) FROM reviews "
+        "WHERE reviews.car_model_id = car_models.id), "
+        "rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM reviews "
+        "WHERE reviews.car_model_id = car_models.id)"
+    )
+
+    for table, columns in FULLTEXT.items():
+        if dialect == "sqlite" and fts_table_name(table) in tables:
+            continue
+        if dialect == "mysql" and fulltext_index_name(table) in {
+            ix["name"] for ix in inspector.get_indexes(table)
+        }:
+            continue
+        for stmt in fulltext_ddl(dialect, table, columns):
+            op.execute(stmt)
+
+    if "idempotency_keys" not in tables:
+        op.create_table(
+            "idempotency_keys",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("key", sa.String(length=255), nullable=False),
+            sa.Column("request_hash", sa.String(length=64), nullable=False),
+            sa.Column("response_body", sa.Text(), nullable=False),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("CURRENT_TIMESTAMP"),
+                nullable=False,
+            ),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("user_id", "key", name="uq_idempotency_user_key"),
+        )
+        op.create_index(
+            op.f("ix_idempotency_keys_created_at"),
+            "idempotency_keys",
+            ["created_at"],
+            unique=False,
+        )
+
+    # daily_favorites iba por (brand, model): es derivada, se rehace
+    if "daily_favorites" in tables and "listing_id" not in {
+        c["name"] for c in inspector.get_columns("daily_favorites")
+    }:
+        op.drop_table("daily_favorites")
+        tables.discard("daily_favorites")
+    for name in ROLLUP_TABLES:
+        if name not in tables:
+            _create_rollup_table(name)
+            op.execute(ROLLUP_BACKFILL[name])
+
+    if "ix_listings_price_id" not in {
+        ix["name"] for ix in inspector.get_indexes("listings")
+    }:
+        op.create_index(
+            "ix_listings_price_id",
+            "listings",
+            ["current_price_amount", "id"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_listings_price_id", table_name="listings")
+    for name in reversed(ROLLUP_TABLES):
+        op.drop_table(name)
+    op.drop_index(op.f("ix_idempotency_keys_created_at"), table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
+
+    dialect = op.get_bind().dialect.name
+    for table in FULLTEXT:
+        if dialect == "sqlite":
+            fts = fts_table_name(table)
+            # los triggers cuelgan de la tabla base: sin la FTS rompen los INSERT
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
+        elif dialect == "mysql":
+            op.drop_index(fulltext_index_name(table), table_name=table)
+
+    for table, columns in _added_columns().items():
+        for column in columns:
+            op.drop_column(table, column.name)
@@ -0,0 +1,70 @@
+"""performance indexes
+
+Índices compuestos para los predicados calientes. Los índices simples que
+pasan a ser prefijo de uno compuesto se eliminan (mismo uso, una escritura
+menos por INSERT). En MySQL el compuesto se crea antes de borrar el simple:
+la FK necesita siempre un índice que empiece por su columna.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 17:48:28.773151
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nombre, tabla, columnas, índice simple que reemplaza)
+INDEXES = [
+    ("ix_purchases_status_created", "purchases", ["status", "created_at"], None),
+    (
+        "ix_purchases_listing_status",
+        "purchases",
+        ["listing_id", "status"],
+        ("ix_purchases_listing_id", ["listing_id"]),
+    ),
+    (
+        "ix_favorites_customer_created",
+        "favorites",
+        ["customer_id", "created_at"],
+        ("ix_favorites_customer_id", ["customer_id"]),
+    ),
+    (
+        "ix_reviews_car_model_created",
+        "reviews",
+        ["car_model_id", "created_at"],
+        ("ix_reviews_car_model_id", ["car_model_id"]),
+    ),
+    ("ix_listings_active_id", "listings", ["is_active", "id"], None),
+    (
+        "ix_listings_agency_created",
+        "listings",
+        ["agency_id", "created_at"],
+        ("ix_listings_agency_id", ["agency_id"]),
+    ),
+    (
+        "ix_inventory_agency_car_model",
+        "inventory",
+        ["agency_id", "car_model_id"],
+        None,
+    ),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, replaces in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+        if replaces is not None:
+            op.drop_index(replaces[0], table_name=table)
+
+
+def downgrade() -> None:
+    for name, table, columns, replaces in reversed(INDEXES):
+        if replaces is not None:
+            op.create_index(replaces[0], table, replaces[1], unique=False)
+        op.drop_index(name, table_name=table)
@@ -1,6 +1,7 @@
 import os, sys
+from contextlib import contextmanager
 import pytest
-from sqlalchemy import StaticPool, create_engine
+from sqlalchemy import StaticPool, create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from collections.abc import Iterator
 
@@ -11,10 +12,11 @@ if ROOT not in sys.path:
 # --- Config test ---
 os.environ.setdefault("APP_ENV", "test")
 os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+os.environ.setdefault("QUERY_BUDGET_STRICT", "1")
 
 from app.db.base import Base
 from app.main import app
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db, get_read_sessionmaker, get_sessionmaker
 from starlette.testclient import TestClient
 
 from app.models.user import User, UserRole
@@ -23,6 +25,8 @@ from app.models.listing import Listing
 from app.models.car_model import CarModel
 from app.models.inventory import Inventory
 from app.core.security import hash_password
+from app.core.cache import clear_all_caches
+from app.db.session import REPLICA_SESSION
 
 engine = create_engine(
     os.environ["DATABASE_URL"],
@@ -57,6 +61,9 @@ def db() -> Iterator[Session]:
             s.execute(tbl.delete())
         s.commit()
         s.close()
+        # los caches en proceso sobreviven entre tests; la limpieza de arriba
+        # no pasa por los hooks de invalidación
+        clear_all_caches()
 
 
 # ------ Override FastAPI get_db para usar la misma sesión del test ------
@@ -69,9 +76,50 @@ def _override_db_dep(db: Session):
             # la fixture db maneja el cierre/limpieza
             pass
 
+    # las lecturas (réplica) usan la misma sesión: en tests no hay réplicas
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
+    app.dependency_overrides[get_sessionmaker] = lambda: TestingSessionLocal
+    app.dependency_overrides[get_read_sessionmaker] = lambda: TestingSessionLocal
     yield
-    app.dependency_overrides.pop(get_db, None)
+    for dep in (get_db, get_read_db, get_sessionmaker, get_read_sessionmaker):
+        app.dependency_overrides.pop(dep, None)
+
+
+# ------ Conteo de SQL ------
+@contextmanager
+def _count_statements(db: Session) -> Iterator[list[str]]:
+    """Registra los SQL que llegan al driver mientras dura el bloque."""
+    statements: list[str] = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+
+
+@pytest.fixture()
+def count_statements():
+    """`with count_statements(db) as statements: ...`"""
+    return _count_statements
+
+
+@pytest.fixture()
+def lagging_replica() -> Iterator[Session]:
+    """Sesión de réplica que todavía no recibió nada: esquema sin datos."""
+    replica_engine = create_engine("sqlite+pysqlite:///:memory:", poolclass=StaticPool)
+    Base.metadata.create_all(bind=replica_engine)
+    session = sessionmaker(bind=replica_engine, info={REPLICA_SESSION: True})()
+    try:
+        yield session
+    finally:
+        session.close()
+        replica_engine.dispose()
 
 
 # ------ Cliente HTTP de pruebas ------
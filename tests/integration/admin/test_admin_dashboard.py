@@ -0,0 +1,106 @@
+import threading
+
+from fastapi.testclient import TestClient
+from fastapi import status
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base
+from app.models.agency import Agency
+from app.models.car_model import CarModel
+from app.models.user import User
+from app.models.listing import Listing
+from app.services import admin_reports as reports_service
+
+PURCHASE_PATH = "/api/v1/purchases"
+ADMIN_DASHBOARD_PATH = "/api/v1/admin/reports/dashboard"
+
+
+def _login(client: TestClient, email: str, password: str = "secret") -> str:
+    resp = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": password},
+    )
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    return resp.json()["access_token"]
+
+
+def test_admin_dashboard_returns_all_reports(
+    client: TestClient,
+    db: Session,
+    admin_user: User,
+    buyer_user: User,
+    listings_for_top_selling: list[Listing],
+):
+    """
+    El dashboard devuelve los cuatro reportes en un payload, con los mismos
+    datos que los endpoints individuales.
+    """
+    buyer_token = _login(client, buyer_user.email)
+    for listing, quantity in zip(listings_for_top_selling[:3], (3, 2, 1)):
+        resp = client.post(
+            PURCHASE_PATH,
+            json={"listing_id": listing.id, "quantity": quantity},
+            headers={"Authorization": f"Bearer {buyer_token}"},
+        )
+        assert resp.status_code == status.HTTP_201_CREATED, resp.text
+
+    admin_token = _login(client, admin_user.email)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    resp = client.get(ADMIN_DASHBOARD_PATH, params={"limit": 2}, headers=headers)
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    data = resp.json()
+
+    assert [r["units_sold"] for r in data["top_sold_cars"]] == [3, 2]
+    assert [r["purchases_count"] for r in data["top_buyers"]] == [3]
+    assert [r["sales_count"] for r in data["top_agencies"]] == [3]
+    assert data["top_favorites"] == []
+
+    single = client.get(
+        "/api/v1/admin/reports/top-sold-cars", params={"limit": 2}, headers=headers
+    )
+    assert single.json() == data["top_sold_cars"]
+
+
+def test_admin_dashboard_forbidden_for_buyer(client: TestClient, buyer_user: User):
+    buyer_token = _login(client, buyer_user.email)
+    resp = client.get(
+        ADMIN_DASHBOARD_PATH, headers={"Authorization": f"Bearer {buyer_token}"}
+    )
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_admin_dashboard_runs_on_separate_pooled_sessions(tmp_path):
+    """
+    Con un pool real (archivo SQLite, una conexión por hilo) cada reporte
+    corre en el executor del dashboard.
+    """
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'dashboard.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+    with factory() as s:
+        s.add_all([Agency(name="Dashboard"), CarModel(brand="Fiat", model="Uno")])
+        s.commit()
+
+    threads = []
+
+    def tracking_factory():
+        threads.append(threading.current_thread().name)
+        return factory()
+
+    tracking_factory.kw = factory.kw
+
+    try:
+        out = reports_service.get_admin_dashboard(tracking_factory, None, None)
+    finally:
+        engine.dispose()
+
+    assert out.top_sold_cars == []
+    assert out.top_agencies == []
+    assert len(threads) == 4
+    assert all(name.startswith("admin-dashboard") for name in threads)
@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core import responses
+from app.models.listing import Listing
+from app.models.purchase import Purchase, PurchaseStatus
+from app.models.user import User
+
+AGENCIES_PATH = "/api/v1/agencies"
+
+
+@pytest.fixture()
+def agency_headers(client: TestClient, agency_user: User) -> dict:
+    resp = client.post(
+        "/api/v1/auth/login",
+        json={"email": agency_user.email, "password": "secret"},
+    )
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest.fixture()
+def sales(
+    db: Session,
+    sample_listing: Listing,
+    buyer_user: User,
+    second_buyer_user: User,
+    monkeypatch,
+) -> None:
+    # bloques chicos: el export sale en varios chunks
+    monkeypatch.setattr(responses, "EXPORT_CHUNK_ROWS", 2)
+    start = datetime(2024, 3, 1, 12, 0, 0)
+    buyers = [buyer_user, second_buyer_user]
+    db.add_all(
+        Purchase(
+            buyer_id=buyers[i % 2].id,
+            listing_id=sample_listing.id,
+            unit_price_amount=10000 + i,
+            unit_price_currency="USD",
+            quantity=1 + i % 3,
+            status=PurchaseStatus.COMPLETED,
+            created_at=start + timedelta(hours=i),
+        )
+        for i in range(7)
+    )
+    db.commit()
+
+
+def test_sales_csv_export_matches_my_sales(
+    client: TestClient, agency_headers: dict, sales
+) -> None:
+    expected = client.get(f"{AGENCIES_PATH}/my-sales", headers=agency_headers).json()
+
+    resp = client.get(f"{AGENCIES_PATH}/my-sales/export", headers=agency_headers)
+
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="ventas.csv"' in resp.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == len(expected) == 7
+    for row, item in zip(rows, expected):
+        assert int(row["id"]) == item["id"]
+        assert row["buyer_email"] == item["buyer_email"]
+        assert row["status"] == item["status"]
+        assert float(row["total_amount"]) == item["total_amount"]
+        assert row["created_at"] == item["created_at"]
+
+
+def test_sales_ndjson_export_applies_filters(
+    client: TestClient, agency_headers: dict, sales, second_buyer_user: User
+) -> None:
+    params = {"customer": second_buyer_user.email}
+    expected = client.get(
+        f"{AGENCIES_PATH}/my-sales", params=params, headers=agency_headers
+    ).json()
+
+    resp = client.get(
+        f"{AGENCIES_PATH}/my-sales/export",
+        params={**params, "format": "ndjson"},
+        headers=agency_headers,
+    )
+
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines == expected
+    assert len(lines) == 3
+
+
+def test_customers_export(client: TestClient, agency_headers: dict, sales) -> None:
+    expected = client.get(
+        f"{AGENCIES_PATH}/my-customers", headers=agency_headers
+    ).json()
+
+    ndjson = client.get(
+        f"{AGENCIES_PATH}/my-customers/export",
+        params={"format": "ndjson"},
+        headers=agency_headers,
+    )
+    as_csv = client.get(f"{AGENCIES_PATH}/my-customers/export", headers=agency_headers)
+
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == expected
+    rows = list(csv.DictReader(io.StringIO(as_csv.text)))
+    assert [r["email"] for r in rows] == [c["email"] for c in expected]
+
+
+def test_export_rejects_unknown_format_and_non_agency(
+    client: TestClient, agency_headers: dict, buyer_user: User
+) -> None:
+    resp = client.get(
+        f"{AGENCIES_PATH}/my-sales/export",
+        params={"format": "xlsx"},
+        headers=agency_headers,
+    )
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": buyer_user.email, "password": "secret"},
+    )
+    resp = client.get(
+        f"{AGENCIES_PATH}/my-customers/export",
+        headers={"Authorization": f"Bearer {login.json()['access_token']}"},
+    )
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
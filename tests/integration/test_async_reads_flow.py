@@ -0,0 +1,200 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+
+import httpx
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api.v1.endpoints import async_reads
+from app.core.security import create_access_token, hash_password
+from app.db.base import Base
+from app.db.session import get_async_db
+from app.models.agency import Agency
+from app.models.car_model import CarModel
+from app.models.favorite import Favorite
+from app.models.listing import Listing
+from app.models.review import Review
+from app.models.user import User, UserRole
+from app.services import favorites as favorites_service
+from app.services import listings as listings_service
+from app.services import reviews as reviews_service
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture()
+def db_file(tmp_path) -> Iterator[str]:
+    """
+    La BD en memoria de conftest no se comparte entre pysqlite y aiosqlite:
+    usamos un archivo que ven los dos drivers.
+    """
+    path = tmp_path / "async_reads.db"
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    yield str(path)
+
+
+@pytest.fixture()
+def sync_session(db_file: str):
+    engine = create_engine(f"sqlite+pysqlite:///{db_file}")
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture()
+def async_app(db_file: str) -> Iterator[FastAPI]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}", poolclass=NullPool)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def _override_get_async_db() -> AsyncIterator:
+        async with factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(async_reads.router, prefix="/api/v1")
+    app.dependency_overrides[get_async_db] = _override_get_async_db
+    yield app
+
+
+@pytest.fixture()
+def async_client(async_app: FastAPI) -> Iterator[TestClient]:
+    with TestClient(async_app) as client:
+        yield client
+
+
+@pytest.fixture()
+def seeded(sync_session) -> dict:
+    agency = Agency(name="Async Motors")
+    car_model = CarModel(brand="Fiat", model="Cronos")
+    buyer = User(
+        email="async-buyer@example.com",
+        password_hash=hash_password("secret"),
+        role=UserRole.buyer,
+        is_active=True,
+    )
+    sync_session.add_all([agency, car_model, buyer])
+    sync_session.flush()
+
+    listings = [
+        Listing(
+            agency_id=agency.id,
+            car_model_id=car_model.id,
+            brand="Fiat",
+            model="Cronos",
+            current_price_amount=10000.0 + i,
+            current_price_currency="ARS",
+            stock=3,
+            is_active=True,
+        )
+        for i in range(3)
+    ]
+    sync_session.add_all(listings)
+    sync_session.flush()
+    sync_session.add(Favorite(customer_id=buyer.id, listing_id=listings[0].id))
+    sync_session.add(
+        Review(car_model_id=car_model.id, author_id=buyer.id, rating=4, comment="ok")
+    )
+    sync_session.commit()
+
+    token = create_access_token(sub=str(buyer.id), role=buyer.role.value)
+    return {
+        "buyer": buyer,
+        "listings": listings,
+        "headers": {"Authorization": f"Bearer {token}"},
+    }
+
+
+def test_async_browse_matches_sync_service(async_client, sync_session, seeded):
+    resp = async_client.get(
+        "/api/v1/listings",
+        params={"sort": "price_asc"},
+        headers=seeded["headers"],
+    )
+    assert resp.status_code == 200, resp.text
+
+    expected = listings_service.browse_listings(
+        sync_session, viewer=seeded["buyer"], sort="price_asc"
+    )
+    assert resp.json() == [item.model_dump(mode="json") for item in expected]
+    assert [it["is_favorite"] for it in resp.json()] == [True, False, False]
+
+
+def test_concurrent_async_browses_share_one_computation(async_app, seeded):
+    """
+    Requests iguales y simultáneos con el cache vacío: uno calcula, el resto
+    espera sin bloquear el loop (antes quedaban todos trabados).
+    """
+
+    async def browse_five():
+        transport = httpx.ASGITransport(app=async_app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            return await asyncio.gather(
+                *(
+                    client.get("/api/v1/listings", params={"q": "fiat"})
+                    for _ in range(5)
+                )
+            )
+
+    responses = []
+    worker = threading.Thread(
+        target=lambda: responses.extend(asyncio.run(browse_five())), daemon=True
+    )
+    worker.start()
+    worker.join(timeout=10)
+
+    assert not worker.is_alive(), "el browse async quedó trabado"
+    assert [r.status_code for r in responses] == [200] * 5
+    assert all(r.json() == responses[0].json() for r in responses)
+    assert len(responses[0].json()) == 3
+
+
+def test_async_listing_detail_and_404(async_client, sync_session, seeded):
+    listing = seeded["listings"][0]
+    resp = async_client.get(f"/api/v1/listings/{listing.id}", headers=seeded["headers"])
+    assert resp.status_code == 200, resp.text
+    expected = listings_service.get_listing_for_buyer(
+        sync_session, seeded["buyer"], listing.id
+    )
+    assert resp.json() == expected.model_dump(mode="json")
+
+    missing = async_client.get("/api/v1/listings/999999", headers=seeded["headers"])
+    assert missing.status_code == 404
+
+
+def test_async_favorites_and_reviews(async_client, sync_session, seeded):
+    favs = async_client.get("/api/v1/favorites/my", headers=seeded["headers"])
+    assert favs.status_code == 200, favs.text
+    expected = favorites_service.list_favorites_for_buyer(sync_session, seeded["buyer"])
+    assert favs.json() == [f.model_dump(mode="json") for f in expected]
+
+    page = async_client.get(
+        "/api/v1/favorites/my", params={"page_size": 1}, headers=seeded["headers"]
+    ).json()
+    assert page["items"] == favs.json()[:1]
+    assert page["next_cursor"] is None  # un solo favorito
+
+    listing = seeded["listings"][1]
+    reviews = async_client.get(f"/api/v1/reviews/by-listing/{listing.id}")
+    assert reviews.status_code == 200, reviews.text
+    expected_reviews = reviews_service.list_reviews_for_listing(sync_session, listing)
+    assert [r["id"] for r in reviews.json()] == [r.id for r in expected_reviews]
+    assert async_client.get("/api/v1/reviews/by-listing/999999").json() == []
+
+
+def test_async_detail_requires_buyer(async_client, seeded):
+    resp = async_client.get(f"/api/v1/listings/{seeded['listings'][0].id}")
+    assert resp.status_code == 403
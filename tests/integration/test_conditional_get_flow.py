@@ -0,0 +1,90 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.models.listing import Listing
+from app.models.user import User
+
+LISTINGS_PATH = "/api/v1/listings"
+
+
+def _login(client: TestClient, email: str, password: str = "secret") -> dict:
+    resp = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": password},
+    )
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def test_browse_revalidates_with_etag_until_a_listing_changes(
+    client: TestClient,
+    agency_user: User,
+    sample_listing: Listing,
+) -> None:
+    first = client.get(LISTINGS_PATH)
+    assert first.status_code == status.HTTP_200_OK, first.text
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] == "public, max-age=5"
+    assert "Authorization" in first.headers["Vary"]
+
+    again = client.get(LISTINGS_PATH, headers={"If-None-Match": etag})
+    assert again.status_code == status.HTTP_304_NOT_MODIFIED
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+
+    resp = client.patch(
+        f"{LISTINGS_PATH}/{sample_listing.id}",
+        json={"current_price_amount": 9500},
+        headers=_login(client, agency_user.email),
+    )
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+
+    changed = client.get(LISTINGS_PATH, headers={"If-None-Match": etag})
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed.headers["ETag"] != etag
+    assert changed.json()[0]["current_price_amount"] == 9500
+
+
+def test_buyer_browse_etag_includes_own_favorites(
+    client: TestClient,
+    buyer_user: User,
+    sample_listing: Listing,
+) -> None:
+    headers = _login(client, buyer_user.email)
+    anonymous_etag = client.get(LISTINGS_PATH).headers["ETag"]
+
+    before = client.get(LISTINGS_PATH, headers=headers)
+    assert before.headers["Cache-Control"] == "private, no-cache"
+    assert before.headers["ETag"] == anonymous_etag
+
+    resp = client.post(f"/api/v1/favorites/{sample_listing.id}", headers=headers)
+    assert resp.status_code == status.HTTP_201_CREATED, resp.text
+
+    after = client.get(
+        LISTINGS_PATH, headers={**headers, "If-None-Match": anonymous_etag}
+    )
+    assert after.status_code == status.HTTP_200_OK
+    assert after.json()[0]["is_favorite"] is True
+    assert after.headers["ETag"] != anonymous_etag
+
+
+def test_reviews_by_listing_falls_back_to_body_hash(
+    client: TestClient,
+    sample_listing: Listing,
+) -> None:
+    path = f"/api/v1/reviews/by-listing/{sample_listing.id}"
+    first = client.get(path)
+    assert first.status_code == status.HTTP_200_OK, first.text
+
+    again = client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert again.status_code == status.HTTP_304_NOT_MODIFIED
+    assert again.content == b""
+    assert again.headers.get("content-length") in (None, "0")
+
+
+def test_endpoints_without_policy_have_no_etag(client: TestClient) -> None:
+    resp = client.get("/health")
+    assert resp.status_code == status.HTTP_200_OK
+    assert "ETag" not in resp.headers
@@ -0,0 +1,209 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.favorite import Favorite
+from app.models.listing import Listing
+from app.models.purchase import Purchase, PurchaseStatus
+from app.models.review import Review
+from app.models.user import User
+
+START = datetime(2024, 3, 1, 12, 0, 0)
+
+
+def _login(client: TestClient, email: str, password: str = "secret") -> dict:
+    resp = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": password},
+    )
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def _walk(client: TestClient, path: str, headers: dict, **params) -> list[list]:
+    """Recorre todas las páginas siguiendo next_cursor."""
+    pages = []
+    cursor = None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        resp = client.get(path, params=query, headers=headers)
+        assert resp.status_code == status.HTTP_200_OK, resp.text
+        body = resp.json()
+        pages.append(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+        assert len(pages) < 20
+
+
+@pytest.fixture()
+def history(
+    db: Session,
+    sample_listing: Listing,
+    buyer_user: User,
+    second_buyer_user: User,
+) -> None:
+    # horas repetidas: el id tiene que desempatar sin saltear ni repetir filas
+    buyers = [buyer_user, second_buyer_user]
+    db.add_all(
+        Purchase(
+            buyer_id=buyers[i % 2].id,
+            listing_id=sample_listing.id,
+            unit_price_amount=10000 + i,
+            unit_price_currency="USD",
+            quantity=1,
+            status=PurchaseStatus.COMPLETED,
+            created_at=START + timedelta(hours=i // 3),
+        )
+        for i in range(8)
+    )
+
+    listings = [
+        Listing(
+            agency_id=sample_listing.agency_id,
+            car_model_id=sample_listing.car_model_id,
+            brand="Fiat",
+            model=f"Cronos {i}",
+            current_price_amount=10000 + i,
+            current_price_currency="USD",
+            stock=1,
+        )
+        for i in range(5)
+    ]
+    db.add_all(listings)
+    db.flush()
+    db.add_all(
+        Favorite(
+            customer_id=buyer_user.id,
+            listing_id=listing.id,
+            created_at=START + timedelta(hours=i // 2),
+        )
+        for i, listing in enumerate(listings)
+    )
+    db.add_all(
+        Review(
+            car_model_id=sample_listing.car_model_id,
+            author_id=buyer_user.id,
+            rating=1 + i % 5,
+            comment=f"reseña {i}",
+            created_at=START + timedelta(hours=i // 2),
+        )
+        for i in range(5)
+    )
+    db.commit()
+
+
+def test_agency_sales_and_customers_pages(
+    client: TestClient, agency_user: User, history
+) -> None:
+    headers = _login(client, agency_user.email)
+
+    sales = _walk(client, "/api/v1/agencies/my-sales", headers, page_size=3)
+    assert [len(p) for p in sales] == [3, 3, 2]
+    ids = [s["id"] for page in sales for s in page]
+    assert len(set(ids)) == 8
+    keys = [(s["created_at"], s["id"]) for page in sales for s in page]
+    assert keys == sorted(keys, reverse=True)
+
+    customers = _walk(client, "/api/v1/agencies/my-customers", headers, page_size=1)
+    assert [len(p) for p in customers] == [1, 1]
+    emails = [c["email"] for page in customers for c in page]
+    assert len(set(emails)) == 2
+
+
+def test_buyer_histories_pages(client: TestClient, buyer_user: User, history) -> None:
+    headers = _login(client, buyer_user.email)
+
+    purchases = _walk(client, "/api/v1/purchases/my", headers, page_size=3)
+    assert [len(p) for p in purchases] == [3, 1]
+    assert len({p["id"] for page in purchases for p in page}) == 4
+
+    favorites = _walk(client, "/api/v1/favorites/my", headers, page_size=2)
+    assert [len(p) for p in favorites] == [2, 2, 1]
+    assert len({f["favorite_id"] for page in favorites for f in page}) == 5
+
+    reviews = _walk(client, "/api/v1/reviews/my", headers, page_size=4)
+    assert [len(p) for p in reviews] == [4, 1]
+    assert len({r["id"] for page in reviews for r in page}) == 5
+
+
+def test_without_cursor_params_returns_full_list(
+    client: TestClient, agency_user: User, buyer_user: User, history
+) -> None:
+    """Sin cursor ni page_size la respuesta sigue siendo la lista completa."""
+    resp = client.get(
+        "/api/v1/agencies/my-sales", headers=_login(client, agency_user.email)
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert isinstance(resp.json(), list) and len(resp.json()) == 8
+
+    headers = _login(client, buyer_user.email)
+    for path, expected in (
+        ("/api/v1/purchases/my", 4),
+        ("/api/v1/favorites/my", 5),
+        ("/api/v1/reviews/my", 5),
+    ):
+        resp = client.get(path, headers=headers)
+        assert resp.status_code == status.HTTP_200_OK, resp.text
+        assert len(resp.json()) == expected
+
+
+def test_cursor_alone_uses_default_page_size_and_bad_input_fails(
+    client: TestClient, buyer_user: User, history
+) -> None:
+    headers = _login(client, buyer_user.email)
+
+    first = client.get(
+        "/api/v1/favorites/my", params={"page_size": 2}, headers=headers
+    ).json()
+    rest = client.get(
+        "/api/v1/favorites/my",
+        params={"cursor": first["next_cursor"]},
+        headers=headers,
+    ).json()
+    assert len(rest["items"]) == 3
+    assert rest["next_cursor"] is None
+
+    resp = client.get(
+        "/api/v1/purchases/my", params={"cursor": "no-es-un-cursor"}, headers=headers
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    resp = client.get(
+        "/api/v1/reviews/my", params={"page_size": 10_000}, headers=headers
+    )
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_pages_rows_stamped_by_the_server_default(
+    client: TestClient, db: Session, sample_listing: Listing, buyer_user: User
+) -> None:
+    """Sin created_at explícito la BD guarda la fecha sin microsegundos (SQLite:
+    'YYYY-MM-DD HH:MM:SS'); el id desempata las filas del mismo segundo."""
+    listings = [
+        Listing(
+            agency_id=sample_listing.agency_id,
+            car_model_id=sample_listing.car_model_id,
+            brand="Fiat",
+            model=f"Argo {i}",
+            current_price_amount=10000 + i,
+            current_price_currency="USD",
+            stock=1,
+        )
+        for i in range(5)
+    ]
+    db.add_all(listings)
+    db.flush()
+    db.add_all(
+        Favorite(customer_id=buyer_user.id, listing_id=listing.id)
+        for listing in listings
+    )
+    db.commit()
+
+    headers = _login(client, buyer_user.email)
+    favorites = _walk(client, "/api/v1/favorites/my", headers, page_size=2)
+    assert [len(p) for p in favorites] == [2, 2, 1]
+    assert len({f["favorite_id"] for page in favorites for f in page}) == 5
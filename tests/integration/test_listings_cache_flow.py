@@ -0,0 +1,168 @@
+import re
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.listing import Listing
+from app.models.user import User
+from app.services import listings as listings_service
+
+LISTINGS_PATH = "/api/v1/listings"
+REVIEWS_PATH = "/api/v1/reviews"
+
+SERVER_TIMING = re.compile(r'desc="(\d+) queries"')
+
+
+def _login(client: TestClient, email: str, password: str = "secret") -> dict:
+    resp = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": password},
+    )
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def _browse(client: TestClient, headers: dict | None = None, **params):
+    resp = client.get(LISTINGS_PATH, params=params, headers=headers or {})
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    queries = int(SERVER_TIMING.search(resp.headers["Server-Timing"]).group(1))
+    return resp.json(), queries
+
+
+def test_equivalent_anonymous_browses_hit_the_cache(
+    client: TestClient,
+    sample_listing: Listing,
+) -> None:
+    """
+    Dos browses que sólo difieren en mayúsculas/espacios/defaults comparten
+    la key: el segundo no toca la base.
+    """
+    first, first_queries = _browse(client, brand="Fiat", min_price="")
+    second, second_queries = _browse(
+        client, brand="  fiat ", sort="newest", page=1, page_size=20
+    )
+
+    assert [it["id"] for it in first] == [sample_listing.id]
+    assert first_queries >= 1
+    assert second == first
+    assert second_queries == 0
+
+
+def test_listing_and_review_changes_invalidate_the_cache(
+    client: TestClient,
+    buyer_user: User,
+    agency_user: User,
+    sample_listing: Listing,
+) -> None:
+    agency_headers = _login(client, agency_user.email)
+    buyer_headers = _login(client, buyer_user.email)
+    _browse(client)
+
+    resp = client.patch(
+        f"{LISTINGS_PATH}/{sample_listing.id}",
+        json={"current_price_amount": 9500},
+        headers=agency_headers,
+    )
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    body, _ = _browse(client)
+    assert body[0]["current_price_amount"] == 9500
+
+    resp = client.post(
+        REVIEWS_PATH,
+        json={"listing_id": sample_listing.id, "rating": 5, "comment": "Bien"},
+        headers=buyer_headers,
+    )
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    body, _ = _browse(client)
+    assert body[0]["reviews_count"] == 1
+    assert body[0]["avg_rating"] == 5
+
+
+def test_buyer_favorites_are_overlaid_on_the_cached_page(
+    client: TestClient,
+    buyer_user: User,
+    sample_listing: Listing,
+) -> None:
+    """
+    La página cacheada es la anónima; el buyer ve sus favoritos con una sola
+    query extra y el cache no se contamina con ellos.
+    """
+    headers = _login(client, buyer_user.email)
+    resp = client.post(f"/api/v1/favorites/{sample_listing.id}", headers=headers)
+    assert resp.status_code == status.HTTP_201_CREATED, resp.text
+
+    anonymous, _ = _browse(client)
+    as_buyer, buyer_queries = _browse(client, headers=headers)
+    anonymous_again, anonymous_queries = _browse(client)
+
+    assert anonymous[0]["is_favorite"] is False
+    assert as_buyer[0]["is_favorite"] is True
+    assert buyer_queries == 1
+    assert anonymous_again == anonymous
+    assert anonymous_queries == 0
+
+
+def test_purchases_do_not_empty_the_cache(
+    client: TestClient,
+    buyer_user: User,
+    sample_listing: Listing,
+) -> None:
+    """
+    El stock que descuenta una compra se ve al vencer el TTL: si cada compra
+    vaciara el cache, el browse seguiría al volumen de escrituras.
+    """
+    headers = _login(client, buyer_user.email)
+    before, _ = _browse(client)
+    assert before[0]["stock"] == 1
+
+    resp = client.post(
+        "/api/v1/purchases",
+        json={"listing_id": sample_listing.id, "quantity": 1},
+        headers=headers,
+    )
+    assert resp.status_code == status.HTTP_201_CREATED, resp.text
+    cached, cached_queries = _browse(client)
+    assert cached == before
+    assert cached_queries == 0
+
+    listings_service.listings_browse_cache.clear()  # como si venciera el TTL
+    after, _ = _browse(client)
+    assert [it["stock"] for it in after] in ([], [0])
+
+
+def test_cached_page_is_read_from_the_primary_right_after_a_change(
+    monkeypatch,
+    db: Session,
+    lagging_replica: Session,
+    sample_listing: Listing,
+) -> None:
+    """
+    Un miss pedido sobre una réplica atrasada justo después de subir la
+    versión no guarda su página (vieja): la página que se cachea sale del
+    primario.
+    """
+    primary = sessionmaker(bind=db.get_bind())
+    monkeypatch.setattr(listings_service, "get_sessionmaker", lambda: primary)
+    listings_service.invalidate_browse_cache()
+
+    page = listings_service.browse_listings(lagging_replica)
+    cached = listings_service.browse_listings(lagging_replica)
+
+    assert [it.id for it in page] == [sample_listing.id]
+    assert cached == page
+
+
+def test_cache_is_filled_from_the_replica_past_the_lag(
+    monkeypatch,
+    lagging_replica: Session,
+    sample_listing: Listing,
+) -> None:
+    """Sin cambios recientes el miss se arma en la réplica, sin tocar el primario."""
+    monkeypatch.setattr(listings_service, "_browse_changed_at", float("-inf"))
+    monkeypatch.setattr(
+        listings_service, "get_sessionmaker", lambda: pytest.fail("leyó el primario")
+    )
+
+    assert listings_service.browse_listings(lagging_replica) == []
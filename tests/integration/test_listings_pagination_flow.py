@@ -0,0 +1,88 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.agency import Agency
+from app.models.car_model import CarModel
+from app.models.listing import Listing
+
+LISTINGS_PATH = "/api/v1/listings"
+
+
+@pytest.fixture()
+def many_listings(db: Session, agency: Agency) -> list[Listing]:
+    car_model = CarModel(brand="Fiat", model="Cronos")
+    db.add(car_model)
+    db.commit()
+    db.refresh(car_model)
+
+    # precios repetidos a propósito para ejercitar el desempate por id
+    prices = [10000, 12000, 12000, 9000, 15000, 12000, 8000]
+    listings = [
+        Listing(
+            agency_id=agency.id,
+            car_model_id=car_model.id,
+            brand="Fiat",
+            model="Cronos",
+            current_price_amount=price,
+            current_price_currency="USD",
+            stock=1,
+        )
+        for price in prices
+    ]
+    db.add_all(listings)
+    db.commit()
+    for l in listings:
+        db.refresh(l)
+    return listings
+
+
+def _walk(client: TestClient, sort: str, page_size: int) -> list[dict]:
+    seen: list[dict] = []
+    params = {"pagination": "cursor", "sort": sort, "page_size": page_size}
+    while True:
+        resp = client.get(LISTINGS_PATH, params=params)
+        assert resp.status_code == status.HTTP_200_OK, resp.text
+        body = resp.json()
+        assert len(body["items"]) <= page_size
+        seen.extend(body["items"])
+        if body["next_cursor"] is None:
+            return seen
+        params["cursor"] = body["next_cursor"]
+
+
+@pytest.mark.parametrize("sort", ["newest", "price_asc", "price_desc"])
+def test_cursor_pagination_matches_offset_order(
+    client: TestClient,
+    many_listings: list[Listing],
+    sort: str,
+):
+    offset_resp = client.get(
+        LISTINGS_PATH, params={"sort": sort, "page_size": len(many_listings)}
+    )
+    assert offset_resp.status_code == status.HTTP_200_OK, offset_resp.text
+    expected = [it["id"] for it in offset_resp.json()]
+
+    walked = _walk(client, sort, page_size=2)
+
+    assert [it["id"] for it in walked] == expected
+    assert len(expected) == len(many_listings)
+
+
+def test_cursor_from_other_sort_is_rejected(
+    client: TestClient,
+    many_listings: list[Listing],
+):
+    resp = client.get(
+        LISTINGS_PATH,
+        params={"pagination": "cursor", "sort": "newest", "page_size": 2},
+    )
+    cursor = resp.json()["next_cursor"]
+    assert cursor
+
+    resp = client.get(LISTINGS_PATH, params={"sort": "price_asc", "cursor": cursor})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    resp = client.get(LISTINGS_PATH, params={"cursor": "no-es-un-cursor"})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
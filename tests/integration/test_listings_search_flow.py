@@ -0,0 +1,106 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.agency import Agency
+from app.models.car_model import CarModel
+from app.models.listing import Listing
+from app.services.car_models import search_car_models
+
+LISTINGS_PATH = "/api/v1/listings"
+
+
+@pytest.fixture()
+def catalog(db: Session, agency: Agency) -> dict[str, Listing]:
+    cars = [("Fiat", "Cronos"), ("Peugeot", "208"), ("Toyota", "Corolla Cross")]
+    listings: dict[str, Listing] = {}
+    for brand, model in cars:
+        car_model = CarModel(brand=brand, model=model)
+        db.add(car_model)
+        db.commit()
+        db.refresh(car_model)
+
+        listing = Listing(
+            agency_id=agency.id,
+            car_model_id=car_model.id,
+            brand=brand,
+            model=model,
+            current_price_amount=10000.0,
+            current_price_currency="USD",
+            stock=1,
+        )
+        db.add(listing)
+        db.commit()
+        db.refresh(listing)
+        listings[model] = listing
+    return listings
+
+
+def _ids(client: TestClient, **params) -> set[int]:
+    resp = client.get(LISTINGS_PATH, params=params)
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    return {it["id"] for it in resp.json()}
+
+
+def test_q_matches_substrings_in_brand_or_model(
+    client: TestClient,
+    catalog: dict[str, Listing],
+):
+    assert _ids(client, q="ron") == {catalog["Cronos"].id}
+    assert _ids(client, q="PEUGEOT") == {catalog["208"].id}
+    assert _ids(client, q="toyota cross") == {catalog["Corolla Cross"].id}
+    # términos cortos caen al ILIKE de siempre
+    assert _ids(client, q="20") == {catalog["208"].id}
+    assert _ids(client, q="renault") == set()
+
+
+def test_brand_filter_does_not_match_model_column(
+    client: TestClient,
+    catalog: dict[str, Listing],
+):
+    assert _ids(client, brand="cor") == set()
+    assert _ids(client, model="cor") == {catalog["Corolla Cross"].id}
+
+
+def test_search_index_follows_updates_and_deletes(
+    client: TestClient,
+    db: Session,
+    catalog: dict[str, Listing],
+):
+    cronos = catalog["Cronos"]
+    cronos.model = "Pulse"
+    db.commit()
+
+    assert _ids(client, q="cronos") == set()
+    assert _ids(client, q="pulse") == {cronos.id}
+
+    db.delete(cronos)
+    db.commit()
+    assert _ids(client, q="pulse") == set()
+
+
+def test_relevance_sort_and_cursor_incompatibility(
+    client: TestClient,
+    catalog: dict[str, Listing],
+):
+    resp = client.get(LISTINGS_PATH, params={"q": "cro", "sort": "relevance"})
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    assert {it["id"] for it in resp.json()} == {
+        catalog["Cronos"].id,
+        catalog["Corolla Cross"].id,
+    }
+
+    resp = client.get(
+        LISTINGS_PATH,
+        params={"q": "cro", "sort": "relevance", "pagination": "cursor"},
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_search_car_models_uses_shared_search(
+    db: Session,
+    catalog: dict[str, Listing],
+):
+    found = search_car_models(db, q="olla")
+    assert [(cm.brand, cm.model) for cm in found] == [("Toyota", "Corolla Cross")]
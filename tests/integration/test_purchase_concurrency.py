@@ -0,0 +1,133 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterator
+
+from fastapi import HTTPException
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.security import hash_password
+from app.db.base import Base
+from app.models.agency import Agency
+from app.models.car_model import CarModel
+from app.models.listing import Listing
+from app.models.purchase import Purchase, PurchaseStatus
+from app.models.user import User, UserRole
+from app.schemas.purchase import PurchaseCreate
+from app.services import purchases as purchases_service
+
+THREADS = 16
+ATTEMPTS = 48
+INITIAL_STOCK = 10
+
+
+@pytest.fixture()
+def file_sessionmaker(tmp_path) -> Iterator[sessionmaker]:
+    """
+    La BD en memoria de conftest comparte una sola conexión (StaticPool);
+    para concurrencia real cada hilo necesita su propia conexión.
+    """
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'concurrency.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture()
+def contended_listing(file_sessionmaker: sessionmaker) -> tuple[int, int]:
+    with file_sessionmaker() as s:
+        agency = Agency(name="Concurrencia")
+        car_model = CarModel(brand="Fiat", model="Cronos")
+        buyer = User(
+            email="buyer-concurrency@example.com",
+            password_hash=hash_password("secret"),
+            role=UserRole.buyer,
+            is_active=True,
+        )
+        s.add_all([agency, car_model, buyer])
+        s.commit()
+
+        listing = Listing(
+            agency_id=agency.id,
+            car_model_id=car_model.id,
+            brand="Fiat",
+            model="Cronos",
+            current_price_amount=10000.0,
+            current_price_currency="USD",
+            stock=INITIAL_STOCK,
+        )
+        s.add(listing)
+        s.commit()
+        return listing.id, buyer.id
+
+
+def test_concurrent_purchases_never_oversell(
+    file_sessionmaker: sessionmaker,
+    contended_listing: tuple[int, int],
+):
+    listing_id, buyer_id = contended_listing
+
+    def _attempt(_: int) -> bool:
+        with file_sessionmaker() as s:
+            buyer = s.get(User, buyer_id)
+            try:
+                purchases_service.create_purchase_for_buyer(
+                    db=s,
+                    buyer=buyer,
+                    payload=PurchaseCreate(listing_id=listing_id, quantity=1),
+                )
+                return True
+            except HTTPException as e:
+                assert e.status_code == 400
+                return False
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(_attempt, range(ATTEMPTS)))
+
+    with file_sessionmaker() as s:
+        listing = s.get(Listing, listing_id)
+        purchases = s.query(Purchase).filter_by(listing_id=listing_id).count()
+
+    assert sum(results) == INITIAL_STOCK
+    assert purchases == INITIAL_STOCK
+    assert listing.stock == 0
+
+
+def test_cancel_and_reactivate_move_stock_once(
+    db: Session,
+    buyer_user: User,
+    sample_listing: Listing,
+):
+    purchase = purchases_service.create_purchase_for_buyer(
+        db=db,
+        buyer=buyer_user,
+        payload=PurchaseCreate(listing_id=sample_listing.id, quantity=1),
+    )
+    db.refresh(sample_listing)
+    assert sample_listing.stock == 0
+
+    cancelled = purchases_service.cancel_purchase_for_buyer(
+        db=db, buyer=buyer_user, purchase_id=purchase.id
+    )
+    assert cancelled.status == PurchaseStatus.CANCELLED
+
+    # una segunda cancelación no devuelve stock de nuevo
+    with pytest.raises(HTTPException) as exc:
+        purchases_service.cancel_purchase_for_buyer(
+            db=db, buyer=buyer_user, purchase_id=purchase.id
+        )
+    assert exc.value.status_code == 400
+    db.refresh(sample_listing)
+    assert sample_listing.stock == 1
+
+    reactivated = purchases_service.reactivate_purchase_for_buyer(
+        db=db, buyer=buyer_user, purchase_id=purchase.id
+    )
+    assert reactivated.status == PurchaseStatus.COMPLETED
+    db.refresh(sample_listing)
+    assert sample_listing.stock == 0
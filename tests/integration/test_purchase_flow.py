@@ -1,11 +1,15 @@
+from datetime import datetime, timedelta, timezone
+
 from fastapi.testclient import TestClient
 import pytest
 from sqlalchemy.orm import Session
 from fastapi import status
 
+from app.models.idempotency_key import IdempotencyKey
 from app.models.purchase import Purchase
 from app.models.listing import Listing
 from app.models.user import User
+from app.services.purchases import purge_expired_idempotency_keys
 
 PURCHASE_PATH = "/api/v1/purchases"
 AGENCY_CUSTOMERS_PATH = "/api/v1/agencies/my-customers"
@@ -129,3 +133,167 @@ def test_buyer_purchases_listing_and_agency_sees_customer(
     assert buyer_entry["total_spent"] == pytest.approx(
         float(sample_listing.current_price_amount)
     )
+
+
+def test_buyer_checks_out_cart_in_one_batch(
+    client: TestClient,
+    db: Session,
+    buyer_user: User,
+    sample_listing: Listing,
+):
+    other = Listing(
+        agency_id=sample_listing.agency_id,
+        car_model_id=sample_listing.car_model_id,
+        brand="Fiat",
+        model="Cronos",
+        current_price_amount=12000.0,
+        current_price_currency="USD",
+        stock=3,
+    )
+    db.add(other)
+    db.commit()
+    db.refresh(other)
+
+    buyer_token = _login(client, buyer_user.email)
+    headers = {"Authorization": f"Bearer {buyer_token}"}
+
+    # Sin stock suficiente en una oferta → no se compra nada
+    resp = client.post(
+        f"{PURCHASE_PATH}/batch",
+        json={
+            "items": [
+                {"listing_id": other.id, "quantity": 1},
+                {"listing_id": sample_listing.id, "quantity": 2},
+            ]
+        },
+        headers=headers,
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST, resp.text
+    db.refresh(other)
+    db.refresh(sample_listing)
+    assert other.stock == 3
+    assert sample_listing.stock == 1
+    assert db.query(Purchase).count() == 0
+
+    resp = client.post(
+        f"{PURCHASE_PATH}/batch",
+        json={
+            "items": [
+                {"listing_id": other.id, "quantity": 1},
+                {"listing_id": sample_listing.id, "quantity": 1},
+                {"listing_id": other.id, "quantity": 2},
+            ]
+        },
+        headers=headers,
+    )
+    assert resp.status_code == status.HTTP_201_CREATED, resp.text
+    body = resp.json()
+    assert [p["listing_id"] for p in body] == [other.id, sample_listing.id, other.id]
+    assert body[0]["unit_price_amount"] == pytest.approx(12000.0)
+
+    db.refresh(other)
+    db.refresh(sample_listing)
+    assert other.stock == 0
+    assert sample_listing.stock == 0
+    assert db.query(Purchase).filter(Purchase.buyer_id == buyer_user.id).count() == 3
+
+
+def test_purchase_retry_with_idempotency_key_is_replayed(
+    client: TestClient,
+    db: Session,
+    buyer_user: User,
+    sample_listing: Listing,
+):
+    sample_listing.stock = 5
+    db.commit()
+
+    buyer_token = _login(client, buyer_user.email)
+    headers = {
+        "Authorization": f"Bearer {buyer_token}",
+        "Idempotency-Key": "checkout-123",
+    }
+    body = {"listing_id": sample_listing.id, "quantity": 2}
+
+    first = client.post(PURCHASE_PATH, json=body, headers=headers)
+    retry = client.post(PURCHASE_PATH, json=body, headers=headers)
+
+    assert first.status_code == status.HTTP_201_CREATED, first.text
+    assert retry.status_code == status.HTTP_201_CREATED, retry.text
+    assert retry.json() == first.json()
+
+    db.refresh(sample_listing)
+    assert sample_listing.stock == 3
+    assert db.query(Purchase).count() == 1
+
+    # misma key con otro payload → conflicto, sin tocar stock
+    resp = client.post(
+        PURCHASE_PATH,
+        json={"listing_id": sample_listing.id, "quantity": 1},
+        headers=headers,
+    )
+    assert resp.status_code == status.HTTP_409_CONFLICT, resp.text
+    db.refresh(sample_listing)
+    assert sample_listing.stock == 3
+
+
+def _age_idempotency_key(db: Session, key: str, hours: int) -> None:
+    record = db.query(IdempotencyKey).filter(IdempotencyKey.key == key).one()
+    record.created_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+        hours=hours
+    )
+    db.commit()
+
+
+def test_expired_idempotency_key_is_not_replayed(
+    client: TestClient,
+    db: Session,
+    buyer_user: User,
+    sample_listing: Listing,
+):
+    sample_listing.stock = 5
+    db.commit()
+
+    buyer_token = _login(client, buyer_user.email)
+    headers = {
+        "Authorization": f"Bearer {buyer_token}",
+        "Idempotency-Key": "checkout-old",
+    }
+    body = {"listing_id": sample_listing.id, "quantity": 1}
+
+    first = client.post(PURCHASE_PATH, json=body, headers=headers)
+    assert first.status_code == status.HTTP_201_CREATED, first.text
+    _age_idempotency_key(db, "checkout-old", hours=25)
+
+    # pasada la retención, la key vale para una compra nueva
+    again = client.post(PURCHASE_PATH, json=body, headers=headers)
+    assert again.status_code == status.HTTP_201_CREATED, again.text
+    assert again.json()["id"] != first.json()["id"]
+    assert db.query(Purchase).count() == 2
+    assert (
+        db.query(IdempotencyKey).filter(IdempotencyKey.key == "checkout-old").count()
+        == 1
+    )
+
+
+def test_purge_deletes_only_expired_idempotency_keys(
+    client: TestClient,
+    db: Session,
+    buyer_user: User,
+    sample_listing: Listing,
+):
+    sample_listing.stock = 5
+    db.commit()
+
+    buyer_token = _login(client, buyer_user.email)
+    for key in ("k-old-1", "k-old-2", "k-fresh"):
+        resp = client.post(
+            PURCHASE_PATH,
+            json={"listing_id": sample_listing.id, "quantity": 1},
+            headers={"Authorization": f"Bearer {buyer_token}", "Idempotency-Key": key},
+        )
+        assert resp.status_code == status.HTTP_201_CREATED, resp.text
+    _age_idempotency_key(db, "k-old-1", hours=48)
+    _age_idempotency_key(db, "k-old-2", hours=25)
+
+    assert purge_expired_idempotency_keys(db, batch_size=1) == 2
+    assert [k for (k,) in db.query(IdempotencyKey.key).all()] == ["k-fresh"]
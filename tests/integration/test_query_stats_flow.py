@@ -0,0 +1,64 @@
+import re
+
+import pytest
+from fastapi import Depends, FastAPI, status
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.db.query_stats import (
+    QueryBudgetExceeded,
+    query_budget,
+    query_stats_middleware,
+)
+from app.models.listing import Listing
+
+LISTINGS_PATH = "/api/v1/listings"
+
+SERVER_TIMING = re.compile(r'^db;dur=\d+\.\d;desc="(\d+) queries"$')
+
+
+def _samples(route: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "http_request_db_queries_count",
+        {"method": "GET", "route": route},
+    )
+    return value or 0.0
+
+
+def test_server_timing_and_histogram_per_route(
+    client: TestClient,
+    sample_listing: Listing,
+) -> None:
+    """
+    Cada request devuelve la cantidad de SQL y el tiempo de base en
+    Server-Timing y suma una muestra al histograma de su ruta.
+    """
+    before = _samples(LISTINGS_PATH)
+
+    resp = client.get(LISTINGS_PATH)
+
+    assert resp.status_code == status.HTTP_200_OK, resp.text
+    match = SERVER_TIMING.match(resp.headers["Server-Timing"])
+    assert match, resp.headers["Server-Timing"]
+    assert 1 <= int(match.group(1)) <= 3
+    assert _samples(LISTINGS_PATH) == before + 1
+
+
+def test_query_budget_exceeded_fails_in_strict_mode(db: Session) -> None:
+    """Con QUERY_BUDGET_STRICT (activo en tests) pasarse del presupuesto falla."""
+    app = FastAPI()
+    app.middleware("http")(query_stats_middleware)
+    app.dependency_overrides[get_db] = lambda: db
+
+    @app.get("/chatty", dependencies=[Depends(query_budget(1))])
+    def chatty(session: Session = Depends(get_db)):
+        for _ in range(3):
+            session.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    with TestClient(app) as test_client:
+        with pytest.raises(QueryBudgetExceeded, match="3 queries"):
+            test_client.get("/chatty")
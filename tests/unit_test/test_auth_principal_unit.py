@@ -0,0 +1,87 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.core.security import create_access_token
+from app.models.user import User
+from app.services import auth_service
+from app.services.auth_service import Principal, principal_cache
+
+
+def _creds(user: User) -> HTTPAuthorizationCredentials:
+    token = create_access_token(sub=str(user.id), role=user.role.value)
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_current_user_served_from_cache(
+    db: Session, buyer_user: User, count_statements
+) -> None:
+    """
+    El primer request lee el principal con un SELECT; los siguientes
+    autorizan sólo con el JWT + cache, sin consultas.
+    """
+    with count_statements(db) as statements:
+        first = get_current_user(creds=_creds(buyer_user), db=db)
+    assert len(statements) == 1
+    assert "agencies" not in statements[0]
+
+    with count_statements(db) as statements:
+        second = get_current_user(creds=_creds(buyer_user), db=db)
+    assert statements == []
+
+    assert (
+        first
+        == second
+        == Principal(
+            id=buyer_user.id,
+            role=buyer_user.role,
+            agency_id=None,
+            is_active=True,
+            version=1,
+        )
+    )
+
+
+def test_deactivated_user_invalidated_on_commit(db: Session, buyer_user: User) -> None:
+    get_current_user(creds=_creds(buyer_user), db=db)
+    assert principal_cache.get(buyer_user.id) is not None
+
+    buyer_user.is_active = False
+    db.commit()
+
+    assert principal_cache.get(buyer_user.id) is None
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(creds=_creds(buyer_user), db=db)
+    assert exc.value.status_code == 401
+    assert buyer_user.version == 2
+
+
+def test_rollback_keeps_cached_principal(db: Session, buyer_user: User) -> None:
+    cached = get_current_user(creds=_creds(buyer_user), db=db)
+
+    buyer_user.is_active = False
+    db.flush()
+    db.rollback()
+
+    assert principal_cache.get(buyer_user.id) == cached
+
+
+def test_stale_read_is_not_cached_after_commit(db: Session, buyer_user: User) -> None:
+    """
+    Un SELECT que leyó la versión anterior a un commit y termina después de
+    la invalidación no vuelve a dejar el principal viejo en el cache.
+    """
+    stale = auth_service.get_principal(db, buyer_user.id)
+    principal_cache.delete(buyer_user.id)
+
+    buyer_user.is_active = False
+    db.commit()
+
+    auth_service._cache_principal(stale)
+    assert principal_cache.get(buyer_user.id) is None
+
+    fresh = auth_service.get_principal(db, buyer_user.id)
+    assert fresh.version == 2 and not fresh.is_active
+    assert principal_cache.get(buyer_user.id) == fresh
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+from app.core.cache import TTLCache
+
+
+def test_get_or_set_expires_after_ttl() -> None:
+    cache = TTLCache("test_ttl", ttl=0.05)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_set("k", compute) == 1
+    assert cache.get_or_set("k", compute) == 1
+    time.sleep(0.06)
+    assert cache.get_or_set("k", compute) == 2
+
+
+def test_disabled_cache_always_computes() -> None:
+    cache = TTLCache("test_disabled", ttl=0)
+    assert cache.get_or_set("k", lambda: 1) == 1
+    assert cache.get_or_set("k", lambda: 2) == 2
+    assert len(cache) == 0
+
+
+def test_maxsize_evicts_least_recently_used() -> None:
+    cache = TTLCache("test_lru", ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_single_flight_runs_compute_once() -> None:
+    cache = TTLCache("test_single_flight", ttl=60)
+    calls = []
+    release = threading.Event()
+
+    def slow_compute():
+        calls.append(1)
+        release.wait(timeout=2)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_set("k", slow_compute))
+        )
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == [1]
+    assert results == ["value"] * 8
+
+
+def test_async_single_flight_yields_the_loop() -> None:
+    """Los que esperan la misma key ceden el loop al que está calculando."""
+    cache = TTLCache("test_single_flight_async", ttl=60)
+    calls = []
+
+    async def slow_compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(
+            *(cache.get_or_set_async("k", slow_compute) for _ in range(8))
+        )
+
+    assert asyncio.run(asyncio.wait_for(main(), timeout=2)) == ["value"] * 8
+    assert calls == [1]
+
+
+def test_clear_during_compute_does_not_store_stale_value() -> None:
+    cache = TTLCache("test_generation", ttl=60)
+
+    def compute():
+        cache.clear()  # invalidación concurrente mientras se calcula
+        return "stale"
+
+    assert cache.get_or_set("k", compute) == "stale"
+    assert cache.get("k") is None
@@ -0,0 +1,78 @@
+from sqlalchemy import create_engine, func, select, text
+
+from app.models.car_model import CarModel
+from app.models.report_rollup import DailyCarModelSales
+from app.scripts.generate_perf_data import Volumes, generate
+
+TINY = Volumes(
+    agencies=5,
+    buyers=40,
+    car_models=30,
+    listings=120,
+    purchases=400,
+    favorites=150,
+    reviews=60,
+)
+
+TABLES = (
+    "agencies",
+    "users",
+    "car_models",
+    "inventory",
+    "listings",
+    "purchases",
+    "favorites",
+    "reviews",
+)
+
+
+def _dump(engine) -> dict[str, list]:
+    with engine.connect() as conn:
+        dump = {
+            t: conn.execute(text(f"SELECT * FROM {t} ORDER BY id")).all()
+            for t in TABLES
+        }
+    # el hash bcrypt lleva salt aleatorio: se compara el resto de la fila
+    dump["users"] = [row[:2] + row[3:] for row in dump["users"]]
+    return dump
+
+
+def _generate(path, seed: int):
+    engine = create_engine(f"sqlite:///{path}")
+    counts = generate(engine, TINY, seed=seed, batch_size=50)
+    return engine, counts
+
+
+def test_same_seed_generates_same_rows(tmp_path) -> None:
+    """
+    Mismo seed => mismas filas; otro seed => otros datos. Los agregados y
+    rollups quedan calculados sobre lo generado.
+    """
+    first, counts = _generate(tmp_path / "a.db", seed=7)
+    second, _ = _generate(tmp_path / "b.db", seed=7)
+    other, _ = _generate(tmp_path / "c.db", seed=8)
+
+    assert counts == {
+        "agencies": 5,
+        "users": 1 + 5 + 40,
+        "car_models": 30,
+        "inventory": counts["inventory"],
+        "listings": 120,
+        "purchases": 400,
+        "favorites": 150,
+        "reviews": 60,
+    }
+    assert _dump(first) == _dump(second)
+    assert _dump(first)["purchases"] != _dump(other)["purchases"]
+
+    with first.connect() as conn:
+        reviews_count = conn.execute(select(func.sum(CarModel.reviews_count))).scalar()
+        units = conn.execute(select(func.sum(DailyCarModelSales.units_sold))).scalar()
+        completed_units = conn.execute(
+            text("SELECT SUM(quantity) FROM purchases WHERE status = 'COMPLETED'")
+        ).scalar()
+    assert reviews_count == 60
+    assert units == completed_units
+
+    for engine in (first, second, other):
+        engine.dispose()
@@ -0,0 +1,25 @@
+import pytest
+
+from app.core.http_cache import etag_matches, weak_etag
+
+
+def test_weak_etag_depends_on_every_part() -> None:
+    assert weak_etag("a", "b") == weak_etag(b"a", b"b")
+    assert weak_etag("a", "b") != weak_etag("ab")
+    assert weak_etag("a").startswith('W/"')
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ("*", True),
+        ('W/"abc"', True),
+        ('"abc"', True),  # comparación débil: ignora W/
+        ('"x", W/"abc"', True),
+        ('W/"abcd"', False),
+    ],
+)
+def test_etag_matches(header, expected) -> None:
+    assert etag_matches(header, 'W/"abc"') is expected
@@ -0,0 +1,70 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.favorite import Favorite
+from app.models.listing import Listing
+from app.models.user import User
+from app.schemas.listing import ListingOut
+from app.schemas.review import ReviewCreate
+from app.services import listings as listings_service
+from app.services.listings import get_listing_for_buyer
+from app.services.reviews import create_review_for_buyer
+
+
+def test_get_listing_for_buyer_is_a_single_round_trip(
+    db: Session,
+    buyer_user: User,
+    sample_listing: Listing,
+    count_statements,
+) -> None:
+    """
+    get_listing_for_buyer:
+      - Resuelve listing + favorito + rating en un solo SELECT (antes eran 3).
+    """
+    create_review_for_buyer(
+        db=db,
+        buyer=buyer_user,
+        payload=ReviewCreate(listing_id=sample_listing.id, rating=4, comment="OK"),
+    )
+    db.add(Favorite(customer_id=buyer_user.id, listing_id=sample_listing.id))
+    db.commit()
+    buyer_id, listing_id = buyer_user.id, sample_listing.id
+    db.expire_all()
+    buyer = db.get(User, buyer_id)
+
+    with count_statements(db) as statements:
+        out = get_listing_for_buyer(db=db, buyer=buyer, listing_id=listing_id)
+
+    assert len(statements) == 1
+    assert isinstance(out, ListingOut)
+    assert out.id == listing_id
+    assert out.is_favorite is True
+    assert out.avg_rating == 4.0
+    assert out.reviews_count == 1
+
+
+def test_get_listing_for_buyer_not_found(db: Session, buyer_user: User) -> None:
+    with pytest.raises(HTTPException) as exc:
+        get_listing_for_buyer(db=db, buyer=buyer_user, listing_id=999_999)
+    assert exc.value.status_code == 404
+
+
+def test_rolled_back_change_does_not_invalidate_on_next_commit(db: Session) -> None:
+    """
+    Un cambio marcado en una transacción que hace rollback no invalida el
+    browse en el próximo commit de la sesión; el de un SAVEPOINT sí cuenta.
+    """
+    # como en un UPDATE en bloque: el flag se marca dentro de la transacción
+    db.execute(select(Listing.id))
+    listings_service.mark_listings_changed(db)
+    db.rollback()
+    version = listings_service._browse_version
+    db.commit()
+    assert listings_service._browse_version == version
+
+    listings_service.mark_listings_changed(db)
+    db.begin_nested().rollback()
+    db.commit()
+    assert listings_service._browse_version == version + 1
@@ -0,0 +1,280 @@
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+
+from app.db.base import Base
+from app.db.migrate import (
+    BASELINE_REVISION,
+    alembic_config,
+    reset_schema,
+    run_migrations,
+)
+
+PERF_INDEXES = {
+    "purchases": {"ix_purchases_status_created", "ix_purchases_listing_status"},
+    "favorites": {"ix_favorites_customer_created"},
+    "reviews": {"ix_reviews_car_model_created"},
+    "listings": {"ix_listings_active_id", "ix_listings_agency_created"},
+    "inventory": {"ix_inventory_agency_car_model"},
+}
+
+# Esquema que dejaba create_all con los modelos de antes de Alembic y de las
+# columnas / tablas / índices que se sumaron después (SQLite). Literal a
+# propósito: si 0001 cambia, la base "vieja" no cambia con ella.
+LEGACY_SCHEMA = [
+    """CREATE TABLE agencies (
+        id INTEGER NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (name)
+    )""",
+    """CREATE TABLE car_models (
+        id INTEGER NOT NULL,
+        brand VARCHAR(100) NOT NULL,
+        model VARCHAR(100) NOT NULL,
+        year INTEGER,
+        PRIMARY KEY (id)
+    )""",
+    """CREATE TABLE users (
+        id INTEGER NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        role VARCHAR(6) NOT NULL,
+        is_active BOOLEAN DEFAULT '1' NOT NULL,
+        agency_id INTEGER,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_user_agency_role UNIQUE (agency_id, role),
+        FOREIGN KEY(agency_id) REFERENCES agencies (id)
+    )""",
+    "CREATE INDEX ix_users_role ON users (role)",
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    """CREATE TABLE listings (
+        id INTEGER NOT NULL,
+        agency_id INTEGER NOT NULL,
+        car_model_id INTEGER NOT NULL,
+        brand VARCHAR(80) NOT NULL,
+        model VARCHAR(80) NOT NULL,
+        current_price_amount NUMERIC(12, 2) NOT NULL,
+        current_price_currency VARCHAR(3) NOT NULL,
+        stock INTEGER NOT NULL,
+        seller_notes TEXT,
+        expires_on DATETIME,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        is_active BOOLEAN DEFAULT '1' NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(agency_id) REFERENCES agencies (id) ON DELETE CASCADE,
+        FOREIGN KEY(car_model_id) REFERENCES car_models (id) ON DELETE RESTRICT
+    )""",
+    "CREATE INDEX ix_listings_brand ON listings (brand)",
+    "CREATE INDEX ix_listings_brand_model ON listings (brand, model)",
+    "CREATE INDEX ix_listings_car_model_id ON listings (car_model_id)",
+    "CREATE INDEX ix_listings_agency_id ON listings (agency_id)",
+    "CREATE INDEX ix_listings_model ON listings (model)",
+    """CREATE TABLE inventory (
+        id INTEGER NOT NULL,
+        agency_id INTEGER NOT NULL,
+        car_model_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL,
+        is_used BOOLEAN NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(agency_id) REFERENCES agencies (id) ON DELETE CASCADE,
+        FOREIGN KEY(car_model_id) REFERENCES car_models (id) ON DELETE CASCADE
+    )""",
+    "CREATE INDEX ix_inventory_id ON inventory (id)",
+    """CREATE TABLE favorites (
+        id INTEGER NOT NULL,
+        customer_id INTEGER NOT NULL,
+        listing_id INTEGER NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_favorite_customer_listing UNIQUE (customer_id, listing_id),
+        FOREIGN KEY(customer_id) REFERENCES users (id) ON DELETE CASCADE,
+        FOREIGN KEY(listing_id) REFERENCES listings (id) ON DELETE CASCADE
+    )""",
+    "CREATE INDEX ix_favorites_customer_id ON favorites (customer_id)",
+    "CREATE INDEX ix_favorites_listing_id ON favorites (listing_id)",
+    """CREATE TABLE purchases (
+        id INTEGER NOT NULL,
+        buyer_id INTEGER NOT NULL,
+        listing_id INTEGER NOT NULL,
+        unit_price_amount NUMERIC(12, 2) NOT NULL,
+        unit_price_currency VARCHAR(3) NOT NULL,
+        quantity INTEGER NOT NULL,
+        status VARCHAR(9) NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(buyer_id) REFERENCES users (id) ON DELETE CASCADE,
+        FOREIGN KEY(listing_id) REFERENCES listings (id) ON DELETE CASCADE
+    )""",
+    "CREATE INDEX ix_purchases_listing_id ON purchases (listing_id)",
+    "CREATE INDEX ix_purchases_buyer_id ON purchases (buyer_id)",
+    """CREATE TABLE reviews (
+        id INTEGER NOT NULL,
+        car_model_id INTEGER NOT NULL,
+        author_id INTEGER NOT NULL,
+        rating SMALLINT NOT NULL,
+        comment VARCHAR(1000),
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(car_model_id) REFERENCES car_models (id) ON DELETE CASCADE,
+        FOREIGN KEY(author_id) REFERENCES users (id) ON DELETE CASCADE
+    )""",
+    "CREATE INDEX ix_reviews_author_id ON reviews (author_id)",
+    "CREATE INDEX ix_reviews_car_model_id ON reviews (car_model_id)",
+]
+
+LEGACY_DATA = [
+    "INSERT INTO agencies (id, name) VALUES (1, 'Vieja')",
+    "INSERT INTO car_models (id, brand, model) VALUES (1, 'Fiat', 'Cronos')",
+    "INSERT INTO users (id, email, password_hash, role) "
+    "VALUES (1, 'b@x.com', 'x', 'buyer')",
+    "INSERT INTO listings (id, agency_id, car_model_id, brand, model, "
+    "current_price_amount, current_price_currency, stock) "
+    "VALUES (1, 1, 1, 'Fiat', 'Cronos', 10000, 'USD', 5)",
+    "INSERT INTO purchases (buyer_id, listing_id, unit_price_amount, "
+    "unit_price_currency, quantity, status) "
+    "VALUES (1, 1, 10000, 'USD', 2, 'COMPLETED')",
+    "INSERT INTO favorites (customer_id, listing_id) VALUES (1, 1)",
+    "INSERT INTO reviews (car_model_id, author_id, rating) VALUES (1, 1, 4)",
+]
+
+
+def _head() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def _current(engine) -> str | None:
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+
+def _assert_matches_models(engine) -> None:
+    with engine.connect() as conn:
+        ctx = MigrationContext.configure(
+            conn,
+            opts={"include_name": lambda name, type_, _: "_fts" not in (name or "")},
+        )
+        assert compare_metadata(ctx, Base.metadata) == []
+
+    inspector = inspect(engine)
+    for table, names in PERF_INDEXES.items():
+        existing = {ix["name"] for ix in inspector.get_indexes(table)}
+        assert names <= existing, table
+
+
+def test_migrations_build_model_schema_from_empty_db(tmp_path) -> None:
+    """upgrade head sobre una BD vacía deja el mismo esquema que los modelos."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+
+    run_migrations(engine)
+
+    assert _current(engine) == _head()
+    _assert_matches_models(engine)
+    # los índices de texto completo de la baseline funcionan
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO car_models (brand, model) VALUES ('Fiat', 'Cronos')")
+        )
+        hits = conn.execute(
+            text("SELECT rowid FROM car_models_fts WHERE car_models_fts MATCH 'ron'")
+        ).all()
+    assert len(hits) == 1
+    engine.dispose()
+
+
+def _schema(engine) -> dict:
+    inspector = inspect(engine)
+    return {
+        table: (
+            {c["name"] for c in inspector.get_columns(table)},
+            {ix["name"] for ix in inspector.get_indexes(table)},
+        )
+        for table in inspector.get_table_names()
+        if table != "alembic_version"
+    }
+
+
+def _legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for stmt in LEGACY_SCHEMA + LEGACY_DATA:
+            conn.execute(text(stmt))
+    return engine
+
+
+def test_baseline_is_the_pre_alembic_schema(tmp_path) -> None:
+    """0001 crea exactamente el esquema viejo: nada de lo que vino después."""
+    legacy = _legacy_engine(tmp_path)
+    baseline = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    cfg = alembic_config()
+    with baseline.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, BASELINE_REVISION)
+
+    assert _schema(baseline) == _schema(legacy)
+    legacy.dispose()
+    baseline.dispose()
+
+
+def test_pre_alembic_db_is_stamped_and_upgraded(tmp_path) -> None:
+    """
+    Una BD creada antes de Alembic (tablas sin alembic_version) se marca con
+    la baseline y recibe el resto: columnas, tablas e índices nuevos, con
+    los agregados y rollups cargados desde sus datos.
+    """
+    engine = _legacy_engine(tmp_path)
+
+    run_migrations(engine)
+
+    assert _current(engine) == _head()
+    _assert_matches_models(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT name FROM agencies")).scalar() == "Vieja"
+        assert conn.execute(
+            text("SELECT reviews_count, rating_sum FROM car_models")
+        ).one() == (1, 4)
+        assert (
+            conn.execute(text("SELECT units_sold FROM daily_car_model_sales")).scalar()
+            == 2
+        )
+        assert conn.execute(
+            text("SELECT listing_id, favorites_count FROM daily_favorites")
+        ).one() == (1, 1)
+        hits = conn.execute(
+            text("SELECT rowid FROM listings_fts WHERE listings_fts MATCH 'ron'")
+        ).all()
+    assert len(hits) == 1
+    engine.dispose()
+
+
+def test_create_all_db_is_stamped_at_head(tmp_path) -> None:
+    """
+    Una BD armada con create_all sobre los modelos actuales ya tiene los
+    índices de 0003: se marca con head en vez de volver a crearlos.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'create_all.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    run_migrations(engine)
+
+    assert _current(engine) == _head()
+    _assert_matches_models(engine)
+    engine.dispose()
+
+
+def test_reset_schema_then_startup(tmp_path) -> None:
+    """seed_perf resetea por migraciones: el startup siguiente no hace nada."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'perf.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    reset_schema(engine)
+    run_migrations(engine)
+
+    assert _current(engine) == _head()
+    _assert_matches_models(engine)
+    engine.dispose()
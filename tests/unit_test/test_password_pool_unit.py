@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.config import settings
+
+
+def test_password_ops_run_on_dedicated_pool() -> None:
+    async def scenario():
+        hashed = await security.hash_password_async("secret-123")
+        ok = await security.verify_password_async("secret-123", hashed)
+        bad = await security.verify_password_async("otra", hashed)
+        return ok, bad
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert security.PASSWORD_QUEUE_DEPTH._value.get() == 0
+    assert security.PASSWORD_IN_PROGRESS._value.get() == 0
+
+
+def test_queue_cap_rejects_with_503(monkeypatch) -> None:
+    """
+    Con todos los workers ocupados y la cola llena, la operación siguiente
+    se rechaza en vez de encolarse sin límite.
+    """
+    workers = settings.PASSWORD_HASH_WORKERS
+    # workers ocupados + 1 esperando = cola llena
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_QUEUE", 1)
+    release = threading.Event()
+
+    def blocked(_):
+        release.wait(timeout=5)
+        return True
+
+    async def wait_for(gauge, value):
+        for _ in range(200):
+            if gauge._value.get() == value:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"{gauge} no llegó a {value}")
+
+    async def scenario():
+        running = [
+            asyncio.ensure_future(security._run_password_op(blocked, i))
+            for i in range(workers)
+        ]
+        await wait_for(security.PASSWORD_IN_PROGRESS, workers)
+        queued = asyncio.ensure_future(security._run_password_op(blocked, "queued"))
+        await wait_for(security.PASSWORD_QUEUE_DEPTH, 1)
+        try:
+            with pytest.raises(HTTPException) as exc:
+                await security._run_password_op(blocked, "extra")
+        finally:
+            release.set()
+        await asyncio.gather(*running, queued)
+        return exc.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert security.PASSWORD_QUEUE_DEPTH._value.get() == 0
@@ -0,0 +1,39 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc
+
+from app.db.pool_metrics import InstrumentedQueuePool, register_pool_metrics
+
+
+def _sample(name: str, pool: str) -> float:
+    return REGISTRY.get_sample_value(name, {"pool": pool}) or 0.0
+
+
+def test_pool_metrics_track_checkouts_and_timeouts(tmp_path) -> None:
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+        pool_logging_name="unit",
+    )
+    register_pool_metrics(engine, "unit")
+    waits_before = _sample("db_pool_checkout_wait_seconds_count", "unit")
+    timeouts_before = _sample("db_pool_checkout_timeouts_total", "unit")
+
+    try:
+        conn = engine.connect()
+        assert _sample("db_pool_checked_out", "unit") == 1
+        assert _sample("db_pool_size", "unit") == 1
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+        conn.close()
+        assert _sample("db_pool_checked_out", "unit") == 0
+    finally:
+        engine.dispose()
+
+    assert _sample("db_pool_checkout_timeouts_total", "unit") == timeouts_before + 1
+    assert _sample("db_pool_checkout_wait_seconds_count", "unit") == waits_before + 2
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import session as db_session
+
+
+@pytest.fixture()
+def replica_urls(tmp_path, monkeypatch):
+    """Dos réplicas SQLite en archivo + una caída (directorio inexistente)."""
+    urls = [
+        f"sqlite+pysqlite:///{tmp_path / 'r1.db'}",
+        f"sqlite+pysqlite:///{tmp_path / 'missing' / 'r2.db'}",
+        f"sqlite+pysqlite:///{tmp_path / 'r3.db'}",
+    ]
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", urls)
+    monkeypatch.setattr(db_session, "_replicas", None)
+    primary = sessionmaker()
+    monkeypatch.setattr(db_session, "_SessionLocal", primary)
+    yield primary
+    db_session.dispose_replicas()
+
+
+def test_round_robin_skips_unhealthy_replica(replica_urls) -> None:
+    picked = [db_session._pick_replica().name for _ in range(4)]
+
+    assert "replica2" not in picked
+    assert set(picked) == {"replica1", "replica3"}
+    assert not db_session._get_replicas()[1].healthy
+
+
+def test_falls_back_to_primary_when_no_replica_is_healthy(
+    replica_urls, monkeypatch
+) -> None:
+    for replica in db_session._get_replicas():
+        monkeypatch.setattr(replica, "healthy", False)
+        monkeypatch.setattr(replica, "next_check", float("inf"))
+
+    assert db_session.get_read_sessionmaker() is replica_urls
+
+
+def test_without_replicas_reads_go_to_primary(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", [])
+    monkeypatch.setattr(db_session, "_replicas", None)
+    primary = sessionmaker()
+    monkeypatch.setattr(db_session, "_SessionLocal", primary)
+
+    assert db_session.get_read_sessionmaker() is primary
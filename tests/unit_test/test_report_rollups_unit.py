@@ -0,0 +1,181 @@
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.agency import Agency
+from app.models.listing import Listing
+from app.models.user import User
+from app.schemas.purchase import PurchaseCreate
+from app.services import admin_reports
+from app.services import favorites as favorites_service
+from app.services import purchases as purchases_service
+from app.services.report_rollups import (
+    rebuild_report_rollups,
+    record_listing_favorites_removed,
+    reports_cache,
+)
+
+
+def _snapshot(db: Session) -> dict:
+    return {
+        "cars": admin_reports.top_sold_cars(db, None, None, limit=10),
+        "buyers": [
+            b.model_dump(exclude={"last_purchase_at"})
+            for b in admin_reports.get_top_buyers(db, None, None, limit=10)
+        ],
+        "agencies": [
+            a.model_dump() for a in admin_reports.get_top_agencies(db, None, None)
+        ],
+        "favorites": [
+            f.model_dump() for f in admin_reports.get_top_favorites(db, None, None)
+        ],
+    }
+
+
+def test_incremental_rollups_match_full_rebuild(
+    db: Session,
+    buyer_user: User,
+    second_buyer_user: User,
+    agency: Agency,
+    sample_listing: Listing,
+) -> None:
+    """
+    Compras, cancelaciones y favoritos actualizan los rollups diarios;
+    el rebuild desde las tablas crudas llega exactamente al mismo resultado.
+    """
+    sample_listing.stock = 10
+    db.commit()
+
+    kept = purchases_service.create_purchase_for_buyer(
+        db, buyer_user, PurchaseCreate(listing_id=sample_listing.id, quantity=2)
+    )
+    cancelled = purchases_service.create_purchase_for_buyer(
+        db,
+        second_buyer_user,
+        PurchaseCreate(listing_id=sample_listing.id, quantity=3),
+    )
+    purchases_service.cancel_purchase_for_buyer(db, second_buyer_user, cancelled.id)
+
+    favorites_service.add_favorite(db, buyer_user.id, sample_listing.id)
+    favorites_service.add_favorite(db, second_buyer_user.id, sample_listing.id)
+    favorites_service.remove_favorite(db, second_buyer_user.id, sample_listing.id)
+
+    incremental = _snapshot(db)
+
+    assert incremental["cars"] == [
+        {"brand": "Fiat", "model": "Cronos", "units_sold": 2, "total_amount": 20000.0}
+    ]
+    assert incremental["buyers"] == [
+        {
+            "buyer_id": buyer_user.id,
+            "email": buyer_user.email,
+            "purchases_count": 1,
+            "total_spent": 20000.0,
+        }
+    ]
+    assert incremental["agencies"] == [
+        {
+            "agency_id": agency.id,
+            "agency_name": agency.name,
+            "sales_count": 1,
+            "total_amount": 20000.0,
+        }
+    ]
+    assert incremental["favorites"] == [
+        {"brand": "Fiat", "model": "Cronos", "favorites_count": 1}
+    ]
+    assert kept.status.value == "COMPLETED"
+
+    rebuild_report_rollups(db)
+
+    assert _snapshot(db) == incremental
+
+
+def test_report_cache_invalidated_on_commit(
+    db: Session,
+    buyer_user: User,
+    sample_listing: Listing,
+) -> None:
+    """
+    El reporte queda cacheado entre llamadas y se invalida cuando una
+    compra commitea.
+    """
+    sample_listing.stock = 10
+    db.commit()
+
+    assert admin_reports.top_sold_cars(db, None, None) == []
+    assert len(reports_cache) == 1
+
+    purchases_service.create_purchase_for_buyer(
+        db, buyer_user, PurchaseCreate(listing_id=sample_listing.id, quantity=2)
+    )
+
+    assert len(reports_cache) == 0
+    assert admin_reports.top_sold_cars(db, None, None)[0]["units_sold"] == 2
+
+
+def test_favorites_follow_listing_brand_model_changes(
+    db: Session,
+    buyer_user: User,
+    second_buyer_user: User,
+    sample_listing: Listing,
+) -> None:
+    """
+    Un PATCH de brand/model no deja conteos en la clave vieja: el favorito
+    quitado después del cambio descuenta del mismo rollup que lo sumó.
+    """
+    favorites_service.add_favorite(db, buyer_user.id, sample_listing.id)
+    favorites_service.add_favorite(db, second_buyer_user.id, sample_listing.id)
+    assert _snapshot(db)["favorites"] == [
+        {"brand": "Fiat", "model": "Cronos", "favorites_count": 2}
+    ]
+
+    sample_listing.model = "Cronos Drive"
+    db.commit()
+    favorites_service.remove_favorite(db, second_buyer_user.id, sample_listing.id)
+
+    expected = [{"brand": "Fiat", "model": "Cronos Drive", "favorites_count": 1}]
+    assert _snapshot(db)["favorites"] == expected
+
+    rebuild_report_rollups(db)
+    assert _snapshot(db)["favorites"] == expected
+
+
+def test_report_miss_after_commit_is_read_from_the_primary(
+    monkeypatch,
+    db: Session,
+    lagging_replica: Session,
+    buyer_user: User,
+    sample_listing: Listing,
+) -> None:
+    """
+    Recién invalidado el cache, el reporte pedido sobre una réplica atrasada
+    sale del primario: si no, el de antes de la compra quedaría todo el TTL.
+    """
+    primary = sessionmaker(bind=db.get_bind())
+    monkeypatch.setattr(admin_reports, "get_sessionmaker", lambda: primary)
+    sample_listing.stock = 10
+    db.commit()
+    purchases_service.create_purchase_for_buyer(
+        db, buyer_user, PurchaseCreate(listing_id=sample_listing.id, quantity=2)
+    )
+
+    report = admin_reports.top_sold_cars(lagging_replica, None, None)
+    assert report[0]["units_sold"] == 2
+    assert admin_reports.top_sold_cars(lagging_replica, None, None) == report
+
+    # pasado el lag tolerado se vuelve a leer de la réplica
+    reports_cache.clear()
+    monkeypatch.setattr(reports_cache, "invalidated_at", float("-inf"))
+    assert admin_reports.top_sold_cars(lagging_replica, None, None) == []
+
+
+def test_rolled_back_rollup_change_keeps_the_cache(
+    db: Session, sample_listing: Listing
+) -> None:
+    """El flag de una transacción deshecha no vacía el cache en el commit siguiente."""
+    assert admin_reports.top_sold_cars(db, None, None) == []
+
+    record_listing_favorites_removed(db, sample_listing.id)
+    db.rollback()
+    db.commit()
+
+    assert len(reports_cache) == 1
@@ -0,0 +1,65 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.core.responses import FastJSONResponse, render_json
+from app.models.purchase import PurchaseStatus
+from app.schemas.listing import CursorListingsOut, ListingOut
+from app.schemas.purchase import AgencySaleOut
+
+SALE = dict(
+    id=1,
+    listing_id=2,
+    buyer_id=3,
+    buyer_email="b@x.com",
+    brand="Fiat",
+    model="Cronos",
+    unit_price_amount=10000.5,
+    unit_price_currency="USD",
+    quantity=2,
+    total_amount=20001.0,
+    status=PurchaseStatus.COMPLETED,
+    created_at=datetime(2024, 5, 1, 10, 30, 0, 123456),
+)
+
+
+def test_constructed_schemas_render_like_pydantic() -> None:
+    """
+    Un schema armado con model_construct y serializado con orjson da el
+    mismo JSON que el camino de FastAPI (validar + model_dump mode=json).
+    """
+    fast = [AgencySaleOut.model_construct(**SALE)]
+    validated = [AgencySaleOut(**SALE)]
+
+    assert json.loads(render_json(fast)) == [
+        m.model_dump(mode="json") for m in validated
+    ]
+
+
+def test_nested_models_and_decimal() -> None:
+    item = ListingOut.model_construct(
+        id=1,
+        agency_id=1,
+        brand="Fiat",
+        model="Cronos",
+        current_price_amount=Decimal("9500.50"),
+        current_price_currency="USD",
+        stock=1,
+        seller_notes=None,
+        is_favorite=False,
+        avg_rating=None,
+        reviews_count=0,
+    )
+    page = CursorListingsOut.model_construct(items=[item], next_cursor=None)
+
+    body = json.loads(FastJSONResponse(page).body)
+
+    assert body["items"][0]["current_price_amount"] == 9500.5
+    assert body["next_cursor"] is None
+
+
+def test_unknown_types_fail() -> None:
+    with pytest.raises(TypeError):
+        render_json({"x": object()})
@@ -7,6 +7,7 @@ from app.models.review import Review
 from app.schemas.review import ReviewCreate, ReviewUpdate, BuyerReviewOut
 from app.services.reviews import (
     create_review_for_buyer,
+    rebuild_rating_stats,
     update_review_for_buyer,
     list_reviews_for_buyer,
 )
@@ -209,3 +210,48 @@ def test_list_reviews_for_buyer_filters_and_orders(
     assert high.rating == 5
     assert high.brand == "Toyota"
     assert high.model == "Yaris"
+
+
+def test_rating_stats_follow_create_and_update(
+    db: Session,
+    buyer_user: User,
+    agency: Agency,
+) -> None:
+    """
+    create/update_review_for_buyer mantienen reviews_count y rating_sum
+    del CarModel; rebuild_rating_stats llega al mismo resultado desde cero.
+    """
+    listing = _create_listing(db, agency, brand="Fiat", model="Cronos")
+
+    first = create_review_for_buyer(
+        db=db,
+        buyer=buyer_user,
+        payload=ReviewCreate(listing_id=listing.id, rating=2, comment="Meh"),
+    )
+    create_review_for_buyer(
+        db=db,
+        buyer=buyer_user,
+        payload=ReviewCreate(listing_id=listing.id, rating=4, comment="Bien"),
+    )
+    update_review_for_buyer(
+        db=db,
+        buyer=buyer_user,
+        review_id=first.id,
+        payload=ReviewUpdate(rating=5),
+    )
+
+    car_model = db.get(CarModel, listing.car_model_id)
+    assert car_model.reviews_count == 2
+    assert car_model.rating_sum == 9
+    assert car_model.avg_rating == 4.5
+
+    # desincronizamos a mano y reparamos
+    car_model.reviews_count = 0
+    car_model.rating_sum = 0
+    db.commit()
+
+    rebuild_rating_stats(db)
+
+    db.refresh(car_model)
+    assert car_model.reviews_count == 2
+    assert car_model.rating_sum == 9
@@ -0,0 +1,86 @@
+import logging
+import time
+
+from sqlalchemy import create_engine, event, text
+
+from app.db.slow_queries import (
+    normalize_sql,
+    parameter_shape,
+    register_slow_query_log,
+)
+
+
+def _engine_with_sleep():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+
+    @event.listens_for(engine, "connect")
+    def _add_sleep(dbapi_conn, _record):
+        # sleep_ms(n): query artificialmente lenta
+        dbapi_conn.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+    return engine
+
+
+def test_normalize_sql_and_parameter_shape() -> None:
+    sql = normalize_sql(
+        "SELECT * FROM listings\n  WHERE brand = 'Fiat' AND id IN (?, ?, ?)"
+        " AND price > 1500.5 LIMIT %(limit)s"
+    )
+    assert (
+        sql
+        == "SELECT * FROM listings WHERE brand = ? AND id IN (?+) AND price > ? LIMIT ?"
+    )
+    assert parameter_shape({"brand": "Fiat", "limit": 20}) == "{brand: str, limit: int}"
+    assert parameter_shape((1, None)) == "[int, null]"
+    assert parameter_shape([(1,), (2,)], executemany=True) == "2x[int]"
+
+
+def test_slow_statement_logged_with_explain_once(caplog) -> None:
+    """
+    Sobre el umbral se loguea SQL normalizado, forma de parámetros y
+    duración; el EXPLAIN se captura sólo la primera vez por fingerprint.
+    """
+    engine = _engine_with_sleep()
+    register_slow_query_log(engine, threshold_ms=5, explain=True)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_queries"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))  # rápida: no se loguea
+            for value in (1, 2):
+                conn.execute(text("SELECT sleep_ms(20) + :v AS x"), {"v": value})
+
+    messages = [r.getMessage() for r in caplog.records]
+    slow = [m for m in messages if "query lenta" in m]
+    explains = [m for m in messages if m.startswith("[DB] EXPLAIN")]
+
+    assert len(slow) == 2
+    assert "route=-" in slow[0]
+    assert "params=[int]" in slow[0]
+    assert "sql=SELECT sleep_ms(?) + ? AS x" in slow[0]
+    assert len(explains) == 1
+    assert "SCAN CONSTANT ROW" in explains[0]
+
+
+def test_streamed_results_are_not_explained(caplog) -> None:
+    """
+    Con stream_results el resultado sigue pendiente en la conexión: se
+    loguea la query lenta pero no se corre el EXPLAIN, y se leen todas las
+    filas.
+    """
+    engine = _engine_with_sleep()
+    register_slow_query_log(engine, threshold_ms=5, explain=True)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_queries"):
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(
+                text(
+                    "SELECT sleep_ms(20) + value AS x FROM "
+                    "(SELECT 1 AS value UNION ALL SELECT 2 UNION ALL SELECT 3)"
+                )
+            )
+            rows = result.fetchall()
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert len(rows) == 3
+    assert any("query lenta" in m for m in messages)
+    assert not any(m.startswith("[DB] EXPLAIN") for m in messages)